@@ -0,0 +1,123 @@
+"""
+Concurrency benchmark of the dynamic API tool path against a local stub OpenAPI endpoint that answers every
+request after a fixed latency.
+
+    python benchmarks/async_concurrency.py
+    python benchmarks/async_concurrency.py --latency 200 --requests 400 --concurrency 1,10,100,400
+
+For each concurrency level the calls are issued from one event loop:
+
+- sync: the blocking ``client.call_api`` running on the event loop, which is what a synchronous tool does
+  in the HTTP transports, so calls are served one after another whatever the concurrency (fewer calls are
+  made, see --sync-requests);
+- async: the async tool path (``api_tools._tools_api_call``), awaiting ``client.call_api_async``.
+"""
+import asyncio
+import statistics
+import threading
+import time
+
+import click
+from aiohttp import web
+from alibabacloud_openapi_util.client import Client as OpenApiUtilClient
+from alibabacloud_tea_openapi import models as open_api_models
+from alibabacloud_tea_openapi.client import Client as OpenApiClient
+from alibabacloud_tea_util import models as util_models
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import client_pool
+from alibaba_cloud_ops_mcp_server.tools import api_tools
+
+SERVICE, API, REGION = 'ecs', 'DescribeInstances', 'cn-hangzhou'
+
+
+def start_stub_server(latency):
+    """Serve the stub endpoint on a background event loop, return its port."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    port = []
+
+    async def handle(request):
+        await asyncio.sleep(latency)
+        return web.json_response({'RequestId': 'stub', 'Instances': {'Instance': []}})
+
+    async def serve():
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port.append(site._server.sockets[0].getsockname()[1])
+        started.set()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve())
+        loop.run_forever()
+
+    threading.Thread(target=run, name='stub-endpoint', daemon=True).start()
+    started.wait(10)
+    return port[0]
+
+
+def prepare_client(port):
+    """Register a plan and a pooled client for the benchmarked API that point at the stub endpoint."""
+    plan = api_tools.ApiCallPlan(SERVICE, API, '2014-05-26', 'POST', '/', 'RPC',
+                                 frozenset(api_tools.ECS_LIST_PARAMETERS))
+    api_tools._call_plans.set((SERVICE, API), plan)
+    config = open_api_models.Config(access_key_id='benchmark', access_key_secret='benchmark', protocol='http',
+                                    endpoint=f'127.0.0.1:{port}', read_timeout=60000, connect_timeout=10000)
+    client = OpenApiClient(config)
+    client_pool.get('openapi', plan.endpoint(REGION), lambda: client)
+    return client, plan
+
+
+async def run_level(mode, requests, concurrency, client, plan):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    parameters = {'RegionId': REGION, 'PageSize': 10}
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            if mode == 'async':
+                await api_tools._tools_api_call(SERVICE, API, parameters, None)
+            else:
+                req = open_api_models.OpenApiRequest(query=OpenApiUtilClient.query(plan.serialize(parameters)))
+                client.call_api(plan.build_params(), req, util_models.RuntimeOptions())
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'seconds': elapsed,
+        'rps': requests / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+@click.command()
+@click.option('--latency', type=int, default=100, help='Stub endpoint latency in milliseconds')
+@click.option('--requests', 'requests', type=int, default=200, help='Calls per concurrency level')
+@click.option('--concurrency', type=str, default='1,10,50,100,200', help='Comma-separated concurrency levels')
+@click.option('--sync-requests', type=int, default=20,
+              help='Calls per level for the sync mode, which runs them one after another')
+def main(latency, requests, concurrency, sync_requests):
+    port = start_stub_server(latency / 1000)
+    client, plan = prepare_client(port)
+    levels = [int(level) for level in concurrency.split(',') if level.strip()]
+    click.echo(f'stub endpoint 127.0.0.1:{port}, latency {latency} ms')
+    click.echo(f'{"mode":<6} {"concurrency":>11} {"requests":>8} {"seconds":>8} {"req/s":>8} {"p50 ms":>8} '
+               f'{"p99 ms":>8}')
+    for mode, count in (('sync', sync_requests), ('async', requests)):
+        for level in levels:
+            result = asyncio.run(run_level(mode, count, level, client, plan))
+            click.echo(f'{mode:<6} {level:>11} {count:>8} {result["seconds"]:>8.2f} {result["rps"]:>8.1f} '
+                       f'{result["p50"] * 1000:>8.1f} {result["p99"] * 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
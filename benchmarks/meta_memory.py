@@ -0,0 +1,128 @@
+"""
+Memory benchmark of the API meta cache: plain dict-of-dict documents versus the compact representation
+used by ApiMetaClient (settings.meta_compact).
+
+    python benchmarks/meta_memory.py                       # synthetic metadata
+    python benchmarks/meta_memory.py --services 20 --apis 300
+    python benchmarks/meta_memory.py --snapshot src/alibaba_cloud_ops_mcp_server/alibabacloud/static/meta_snapshot.json.gz
+
+Documents are parsed from JSON text in both cases, as they are when fetched from the meta endpoint. The
+retained size is measured with tracemalloc, the load time in a separate untraced run.
+"""
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+import click
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.alibabacloud.snapshot import read_snapshot
+
+TYPES = ['string', 'integer', 'boolean', 'array', 'object']
+
+
+def _parameter(rng, index):
+    schema = {
+        'type': rng.choice(TYPES),
+        'description': f'参数说明 {index}：' + '这是用于演示的参数描述。' * rng.randint(1, 6),
+        'required': rng.random() < 0.2,
+        'example': f'example-{index}',
+        'docRequired': False,
+    }
+    if schema['type'] == 'array':
+        schema['items'] = {'type': 'string', 'description': '列表元素', 'example': 'item'}
+        schema['maxItems'] = 100
+    return {'name': f'Param{index}', 'in': 'query', 'style': 'flat', 'schema': schema}
+
+
+def synthetic_documents(services, apis, parameters, seed=0):
+    """Relative meta path -> JSON text, shaped like the documents served by the meta endpoint."""
+    rng = random.Random(seed)
+    documents = {}
+    products = []
+    for s in range(services):
+        code, version = f'Service{s}', '2014-05-26'
+        products.append({'code': code, 'name': f'Service {s}', 'defaultVersion': version, 'style': 'RPC',
+                         'description': '产品描述' * 10, 'versions': [version]})
+        api_names = [f'DescribeResource{a}' for a in range(apis)]
+        overview = {
+            'apis': {name: {'title': f'查询资源 {name}', 'summary': f'查询资源的详细信息 {name}', 'deprecated': False}
+                     for name in api_names},
+            'components': {'schemas': {'Tag': {'type': 'object', 'properties': {
+                'Key': {'type': 'string', 'description': '标签键'},
+                'Value': {'type': 'string', 'description': '标签值'}}}}},
+        }
+        api_docs = {'apis': {name: {
+            'summary': f'查询资源的详细信息 {name}',
+            'methods': ['post', 'get'],
+            'path': '/',
+            'schemes': ['http', 'https'],
+            'parameters': [_parameter(rng, p) for p in range(parameters)],
+            'responses': {'200': {'schema': {'type': 'object', 'properties': {
+                'RequestId': {'type': 'string', 'description': '请求ID'},
+                'TotalCount': {'type': 'integer', 'description': '总数'}}}}},
+        } for name in api_names}}
+        documents[f'products/{code}/versions/{version}/overview.json'] = json.dumps(overview, ensure_ascii=False)
+        documents[f'products/{code}/versions/{version}/api-docs.json'] = json.dumps(api_docs, ensure_ascii=False)
+    documents['products.json'] = json.dumps(products, ensure_ascii=False)
+    return documents
+
+
+def _pop_api_name(path):
+    if path == 'products.json':
+        return ApiMetaClient.GET_PRODUCT_LIST
+    if path.endswith('overview.json'):
+        return ApiMetaClient.GET_API_OVERVIEW
+    if path.endswith('api-docs.json'):
+        return ApiMetaClient.GET_APIDOCS
+    return ApiMetaClient.GET_API_INFO
+
+
+def load(documents, compact):
+    loaded = {}
+    for path, text in documents.items():
+        data = json.loads(text)
+        if compact:
+            data = ApiMetaClient.compactors[_pop_api_name(path)](data)
+        loaded[path] = data
+    return loaded
+
+
+def measure(documents, compact):
+    """Retained bytes (measured under tracemalloc) and load time (measured without it)."""
+    start = time.perf_counter()
+    load(documents, compact)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    loaded = load(documents, compact)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, seconds, loaded
+
+
+@click.command()
+@click.option("--services", type=int, default=10, help="Number of synthetic services")
+@click.option("--apis", type=int, default=200, help="Number of synthetic APIs per service")
+@click.option("--parameters", type=int, default=15, help="Number of synthetic parameters per API")
+@click.option("--snapshot", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Measure the documents of a meta snapshot instead of synthetic ones")
+def main(services, apis, parameters, snapshot):
+    if snapshot:
+        documents = {path: json.dumps(data, ensure_ascii=False) for path, data in read_snapshot(snapshot).items()}
+    else:
+        documents = synthetic_documents(services, apis, parameters)
+    click.echo(f'{len(documents)} documents, {sum(map(len, documents.values())) / 2 ** 20:.1f} MiB of JSON text')
+    results = {}
+    for name, compact in (('dict-of-dict', False), ('compact', True)):
+        size, seconds, _ = measure(documents, compact)
+        results[name] = size
+        click.echo(f'{name:>12}: {size / 2 ** 20:8.1f} MiB retained, loaded in {seconds:.2f}s')
+    click.echo(f'{"ratio":>12}: {results["dict-of-dict"] / max(results["compact"], 1):8.1f}x')
+
+
+if __name__ == "__main__":
+    main()
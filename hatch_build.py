@@ -0,0 +1,60 @@
+"""
+Wheel build hook that generates the offline API meta snapshot and the tool schema index bundled with the
+package (``alibabacloud/static/meta_snapshot.json.gz`` and ``alibabacloud/static/tool_schema_index.json``,
+see alibabacloud/snapshot.py).
+
+The documents are fetched from the meta endpoint, or read from the mirror directory given in
+``ALIBABA_CLOUD_OPS_MCP_META_SOURCE``. ``ALIBABA_CLOUD_OPS_MCP_BUNDLE_SNAPSHOT`` selects what happens:
+
+* ``auto`` (default): regenerate the files; when that fails keep the existing ones, if any, and warn
+* ``require``: fail the build when the files cannot be regenerated
+* ``skip``: build with the existing files, if any, without regenerating them
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+STATIC_DIR = os.path.join('src', 'alibaba_cloud_ops_mcp_server', 'alibabacloud', 'static')
+SNAPSHOT_FILE = 'meta_snapshot.json.gz'
+SCHEMA_INDEX_FILE = 'tool_schema_index.json'
+MODES = (AUTO, REQUIRE, SKIP) = ('auto', 'require', 'skip')
+
+
+class MetaSnapshotBuildHook(BuildHookInterface):
+    PLUGIN_NAME = 'custom'
+
+    def initialize(self, version, build_data):
+        mode = os.environ.get('ALIBABA_CLOUD_OPS_MCP_BUNDLE_SNAPSHOT', AUTO).lower()
+        if mode not in MODES:
+            raise ValueError(f'ALIBABA_CLOUD_OPS_MCP_BUNDLE_SNAPSHOT must be one of {", ".join(MODES)}: {mode}')
+        if mode == SKIP:
+            return
+        static_dir = os.path.join(self.root, STATIC_DIR)
+        with tempfile.TemporaryDirectory(prefix='meta-snapshot-') as tmp_dir:
+            command = [
+                sys.executable, '-c', 'from alibaba_cloud_ops_mcp_server.alibabacloud.snapshot import main; main()',
+                '--output', os.path.join(tmp_dir, SNAPSHOT_FILE),
+                '--schema-index', os.path.join(tmp_dir, SCHEMA_INDEX_FILE),
+            ]
+            source = os.environ.get('ALIBABA_CLOUD_OPS_MCP_META_SOURCE')
+            if source:
+                command += ['--source', source]
+            env = dict(os.environ)
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.join(self.root, 'src'),
+                                                              env.get('PYTHONPATH')]))
+            self.app.display_info('Generating the bundled API meta snapshot')
+            result = subprocess.run(command, cwd=self.root, env=env)
+            if result.returncode != 0:
+                message = f'Failed to generate the bundled API meta snapshot (exit code {result.returncode})'
+                if mode == REQUIRE:
+                    raise RuntimeError(message)
+                self.app.display_warning(f'{message}, the package resolves the API meta from the meta '
+                                         f'endpoint at runtime unless a previously generated snapshot exists')
+                return
+            # Replace the existing files only once both were generated
+            for name in (SNAPSHOT_FILE, SCHEMA_INDEX_FILE):
+                shutil.move(os.path.join(tmp_dir, name), os.path.join(static_dir, name))
@@ -0,0 +1,101 @@
+import json
+import re
+
+# 依次尝试的压缩级别：(描述最大长度, 展开嵌套字段的深度, 嵌套字段是否保留描述)
+COMPACT_LEVELS = ((160, 3, True), (80, 2, False), (40, 1, False), (0, 1, False), (0, 0, False))
+ELLIPSIS = '…'
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_MARKDOWN_RE = re.compile(r'[`*#>|]+|\[([^\]]*)\]\([^)]*\)')
+_SPACE_RE = re.compile(r'\s+')
+_SENTENCE_RE = re.compile(r'(?<=[。；;])|(?<=\.)\s')
+
+
+def short_description(text, max_length):
+    """
+    去掉 HTML/Markdown 标记，只保留第一句话，并截断到 max_length 个字符；max_length 为 0 时返回空字符串
+    """
+    if not text or max_length <= 0:
+        return ''
+    text = _TAG_RE.sub(' ', text)
+    text = _MARKDOWN_RE.sub(lambda match: match.group(1) or ' ', text)
+    text = _SPACE_RE.sub(' ', text.split('\n\n', 1)[0]).strip()
+    text = _SENTENCE_RE.split(text, 1)[0].strip()
+    if len(text) > max_length:
+        text = text[:max_length - 1].rstrip() + ELLIPSIS
+    return text
+
+
+def _compact_schema(name, schema, required, max_description, depth, nested_description):
+    # 循环引用处保留的 $ref 视为对象
+    entry = {'name': name, 'type': schema.get('type') or ('object' if '$ref' in schema else 'string')}
+    if required:
+        entry['required'] = True
+    if schema.get('enum'):
+        entry['enum'] = schema['enum']
+    description = short_description(schema.get('description') or schema.get('title'), max_description)
+    if description:
+        entry['description'] = description
+    if depth <= 0:
+        return entry
+    child_description = max_description if nested_description else 0
+    items = schema.get('items')
+    if isinstance(items, dict):
+        if items.get('properties'):
+            entry['items'] = _compact_fields(items, max_description=child_description, depth=depth - 1,
+                                             nested_description=nested_description)
+        elif items.get('type'):
+            entry['itemType'] = items['type']
+    if schema.get('properties'):
+        entry['fields'] = _compact_fields(schema, max_description=child_description, depth=depth - 1,
+                                          nested_description=nested_description)
+    return entry
+
+
+def _compact_fields(schema, max_description, depth, nested_description):
+    required = set(schema.get('required') or []) if isinstance(schema.get('required'), list) else set()
+    return [
+        _compact_schema(name, prop if isinstance(prop, dict) else {}, name in required or
+                        (isinstance(prop, dict) and prop.get('required') is True),
+                        max_description, depth, nested_description)
+        for name, prop in schema.get('properties', {}).items()
+    ]
+
+
+def compact_parameters(parameters, resolve, max_chars):
+    """
+    将 API META 中的 parameters 投影为精简结构：名称、类型、是否必填、枚举值、简短描述及展开 $ref 后的嵌套字段。
+    resolve 用于展开 schema 中的 $ref。结果的 JSON 长度超过 max_chars 时逐级压缩描述与嵌套层级，
+    仍然超出时必填参数优先，其余参数只保留名称。
+    """
+    resolved = []
+    for parameter in parameters or []:
+        name = parameter.get('name')
+        if not name:
+            continue
+        schema = resolve(parameter.get('schema') or {})
+        resolved.append((name, schema if isinstance(schema, dict) else {}))
+
+    def project(level):
+        max_description, depth, nested_description = level
+        return [_compact_schema(name, schema, schema.get('required') is True,
+                                max_description, depth, nested_description)
+                for name, schema in resolved]
+
+    def size(data):
+        return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+    for level in COMPACT_LEVELS:
+        compact = project(level)
+        if max_chars <= 0 or size(compact) <= max_chars:
+            return compact
+
+    # 最紧凑的级别仍超出预算：按必填优先的顺序保留完整条目，剩余参数仅保留名称
+    ordered = sorted(compact, key=lambda entry: not entry.get('required'))
+    kept = []
+    for position, entry in enumerate(ordered):
+        rest = [{'name': other['name']} for other in ordered[position + 1:]]
+        if size(kept + [entry] + rest) > max_chars:
+            return kept + [{'name': other['name']} for other in ordered[position:]]
+        kept.append(entry)
+    return kept
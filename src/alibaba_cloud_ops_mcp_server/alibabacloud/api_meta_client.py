@@ -5,12 +5,42 @@
 # use it only in accordance with the terms of the license agreement you entered
 # into with Aliyun.com .
 # -------------------------------------------------------------------------------
+import logging
+import os
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_compact import compact_parameters
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_search import ApiSearchIndex, directory_tags
+from alibaba_cloud_ops_mcp_server.alibabacloud.cache import TTLCache, SingleFlight
+from alibaba_cloud_ops_mcp_server.alibabacloud.compact_meta import (
+    ProductRecord, compact_products, compact_overview, compact_api_docs, intern_keys
+)
+from alibaba_cloud_ops_mcp_server.alibabacloud.meta_store import MetaDiskStore
+from alibaba_cloud_ops_mcp_server.alibabacloud.metrics import LatencyStats
+from alibaba_cloud_ops_mcp_server.alibabacloud.schema_graph import SchemaGraph
+from alibaba_cloud_ops_mcp_server.alibabacloud.shared_snapshot import get_shared_documents
+from alibaba_cloud_ops_mcp_server.alibabacloud.snapshot import bundled_snapshot_expired, get_bundled_documents
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# 每个进程从共享快照解码后保留的文档数
+SHARED_DECODED_MAXSIZE = 64
+
+# 按 service 建立的 API 索引项：标准 API 名称、版本、风格
+ApiIndexEntry = namedtuple('ApiIndexEntry', ['name', 'version', 'style'])
 
 API_META_KEYS = (VERSION, RESPONSES, SCHEMA, PROPERTIES, HTTP_SUCCESS_CODE, DEFAULT_VERSION, CODE, REF, APIS,
-                 SERVICE_KEY, NAME, IN, PARAMETERS, STYLE, BODY) \
+                 SERVICE_KEY, NAME, IN, PARAMETERS, STYLE, BODY, DIRECTORIES) \
     = ('version', 'responses', 'schema', 'properties', '200', 'defaultVersion', 'code', '$ref', 'apis', 'service',
-       'name', 'in', 'parameters', 'style', 'body')
+       'name', 'in', 'parameters', 'style', 'body', 'directories')
 
 
 
@@ -28,52 +58,284 @@ class ApiMetaClient:
         'GetAPIDocs': {'path': 'products/{service}/versions/{version}/api-docs.json'},
     }
 
+    # 写入缓存前将元数据文档转换为节省内存的表示
+    compactors = {
+        'GetProductList': compact_products,
+        'GetApiOverview': compact_overview,
+        'GetApiInfo': intern_keys,
+        'GetAPIDocs': compact_api_docs,
+    }
+
+    # 缓存 key 为 (pop_api_name, service, version, api)
+    _cache = TTLCache(maxsize=settings.meta_cache_maxsize, ttl=settings.meta_cache_ttl)
+    # 共享快照中文档的解码结果，容量有限，完整的文档只保存在各进程共享的 mmap 中
+    _shared_decoded = TTLCache(maxsize=SHARED_DECODED_MAXSIZE, ttl=0)
+    # 并发请求同一份元数据时只发起一次获取，其余调用方等待并共享结果
+    _inflight = SingleFlight()
+    _disk_store = None
+    _session = None
+    _session_lock = threading.Lock()
+    _http_stats = LatencyStats()
+    # 索引 key -> (构建索引所用的元数据文档, 索引)，元数据文档被重新加载后自动重建
+    _indexes = {}
+    _index_lock = threading.Lock()
+    # (service, version) -> SchemaGraph，每个 $ref 组件只解析一次
+    _schema_graphs = TTLCache(maxsize=settings.meta_cache_maxsize, ttl=settings.meta_cache_ttl)
+    # GetAPIDocs 不可用的 (service, version)，避免每次调用都重试
+    _api_docs_unavailable = TTLCache(maxsize=settings.meta_cache_maxsize, ttl=settings.meta_cache_ttl)
+    # (service, api, version, max_chars) -> 精简后的参数列表
+    _compact_parameters = TTLCache(maxsize=settings.meta_cache_maxsize, ttl=settings.meta_cache_ttl)
+
     @classmethod
     def get_response_from_pop_api(cls, pop_api_name, service=None, api=None, version=None):
-        url = None  # 提前定义，防止 except 中引用未定义变量
+        cache_key = (pop_api_name, service, version, api)
+        data = cls._cache.get(cache_key)
+        if data is not None:
+            return data
+        data = cls._get_shared_document(cache_key)
+        if data is not None:
+            return data
+        return cls._inflight.do(cache_key, cls._fetch_and_cache, cache_key)
+
+    @classmethod
+    def _get_shared_document(cls, cache_key):
+        """
+        多进程模式下从共享快照读取文档，不写入进程私有的 _cache；快照中没有该文档时返回 None
+        """
+        shared = get_shared_documents()
+        if shared is None:
+            return None
+        pop_api_name, service, version, api = cache_key
+        formatted_path = cls._format_path(pop_api_name, service=service, api=api, version=version)
+        if formatted_path not in shared:
+            return None
+        data = cls._shared_decoded.get(cache_key)
+        if data is None:
+            data = shared[formatted_path]
+            if settings.meta_compact:
+                data = cls.compactors[pop_api_name](data)
+            cls._shared_decoded.set(cache_key, data)
+        return data
+
+    @classmethod
+    def _fetch_and_cache(cls, cache_key):
+        # 未命中缓存到成为 leader 之间，上一个 leader 可能已经写入了缓存
+        data = cls._cache.peek(cache_key)
+        if data is not None:
+            return data
+        pop_api_name, service, version, api = cache_key
+        data = cls._fetch_from_pop_api(pop_api_name, service=service, api=api, version=version)
+        if settings.meta_compact:
+            data = cls.compactors[pop_api_name](data)
+        cls._cache.set(cache_key, data)
+        return data
+
+    @classmethod
+    def get_session(cls):
+        """
+        进程内共享的 HTTP 连接池，复用 keep-alive 连接，并对连接错误和 5xx 进行有限次数的退避重试
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry = Retry(
+                        total=settings.meta_http_max_retries,
+                        backoff_factor=settings.meta_http_backoff_factor,
+                        status_forcelist=RETRY_STATUS_CODES,
+                        allowed_methods=frozenset(['GET']),
+                        raise_on_status=False,
+                    )
+                    adapter = HTTPAdapter(pool_connections=settings.meta_http_pool_size,
+                                          pool_maxsize=settings.meta_http_pool_size,
+                                          max_retries=retry)
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers['User-Agent'] = 'alibaba-cloud-ops-mcp-server'
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def reset_session(cls):
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = None
+
+    @classmethod
+    def http_get(cls, url, headers=None):
+        timeout = (settings.meta_http_connect_timeout, settings.meta_http_read_timeout)
+        with cls._http_stats.time():
+            response = cls.get_session().get(url, headers=headers or {}, timeout=timeout)
+            # 限流、鉴权失败等错误响应体不能作为元数据文档返回并缓存
+            if response.status_code not in (200, 304):
+                response.raise_for_status()
+                raise Exception(f'Meta endpoint returned HTTP {response.status_code}')
+        return response
+
+    @classmethod
+    def get_http_stats(cls):
+        return cls._http_stats.snapshot()
+
+    @classmethod
+    def _get_disk_store(cls):
+        cache_dir = settings.meta_cache_dir
+        if not cache_dir:
+            return None
+        if cls._disk_store is None or cls._disk_store.root != os.path.abspath(os.path.expanduser(cache_dir)):
+            cls._disk_store = MetaDiskStore(cache_dir)
+        return cls._disk_store
+
+    @classmethod
+    def _format_path(cls, pop_api_name, service=None, api=None, version=None):
+        api_config = cls.config.get(pop_api_name) or {}
+        try:
+            return api_config[cls.PATH].format(service=service, api=api, version=version)
+        except KeyError as e:
+            raise Exception(f'Failed to get response from pop api, url: None, error: '
+                            f'Failed to format path, path: {api_config.get(cls.PATH)}, error: {e}')
+
+    @classmethod
+    def _fetch_from_pop_api(cls, pop_api_name, service=None, api=None, version=None):
+        return cls.fetch_document(cls._format_path(pop_api_name, service=service, api=api, version=version))
+
+    @classmethod
+    def fetch_document(cls, formatted_path):
+        """
+        按相对路径获取一份元数据文档，依次尝试随包快照、磁盘缓存，最后请求元数据服务；
+        随包快照超过 meta_snapshot_max_age 后改为优先使用磁盘缓存和元数据服务，两者都不可用时才使用快照
+        """
+        url = f'{cls.BASE_URL}/{formatted_path}'
+        entry = None
+        bundled = None
         try:
-            api_config = cls.config.get(pop_api_name)
-            try:
-                formatted_path = api_config[cls.PATH].format(service=service, api=api, version=version)
-            except KeyError as e:
-                raise Exception(f'Failed to format path, path: {api_config.get(cls.PATH)}, error: {e}')
-
-            url = f'{cls.BASE_URL}/{formatted_path}'
-            response = requests.get(url)
-            return response.json()
+            # 优先使用随包发布的离线快照，无需任何网络请求
+            if settings.meta_use_snapshot:
+                documents = get_bundled_documents()
+                if formatted_path in documents:
+                    bundled = documents[formatted_path]
+                    if not bundled_snapshot_expired(settings.meta_snapshot_max_age):
+                        return bundled
+            # 磁盘缓存未过期时直接使用，过期后通过 ETag/Last-Modified 进行条件请求
+            store = cls._get_disk_store()
+            if store:
+                entry = store.load(formatted_path)
+                if entry is not None and entry.age() < settings.meta_cache_ttl:
+                    return entry.body
+            headers = entry.conditional_headers() if entry is not None else {}
+            response = cls.http_get(url, headers=headers)
+            if entry is not None and response.status_code == 304:
+                store.touch(formatted_path, entry)
+                return entry.body
+            data = response.json()
+            if store and response.status_code == 200:
+                store.save(formatted_path, data,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+            return data
         except Exception as e:
+            if entry is not None:
+                # 元数据服务不可用时，退化为使用最近一次成功获取的快照
+                logger.warning(f'Failed to refresh meta from {url}, serving cached copy, error: {e}')
+                return entry.body
+            if bundled is not None:
+                logger.warning(f'Failed to refresh meta from {url}, serving bundled snapshot, error: {e}')
+                return bundled
             raise Exception(f'Failed to get response from pop api, url: {url}, error: {e}')
 
     @classmethod
-    def get_service_version(cls, service):
+    def invalidate_cache(cls, pop_api_name=None, service=None, version=None, api=None):
+        """
+        清理元数据缓存，参数为空的维度视为通配，全部为空时清空整个缓存。返回被清理的条目数
+        """
+        expected = (pop_api_name, service, version, api)
+
+        def matches(key):
+            return all(want is None or want == got for want, got in zip(expected, key))
+
+        with cls._index_lock:
+            cls._indexes.clear()
+        cls._schema_graphs.invalidate()
+        cls._api_docs_unavailable.invalidate()
+        cls._compact_parameters.invalidate()
+        cls._shared_decoded.invalidate(matches)
+        return cls._cache.invalidate(matches)
+
+    @classmethod
+    def get_cache_stats(cls):
+        stats = cls._cache.stats()
+        stats['coalesced'] = cls._inflight.shared
+        return stats
+
+    @classmethod
+    def _get_index(cls, key, document, builder):
+        cached = cls._indexes.get(key)
+        if cached is not None and cached[0] is document:
+            return cached[1]
+        index = builder(document)
+        with cls._index_lock:
+            cls._indexes[key] = (document, index)
+        return index
+
+    @classmethod
+    def get_product_index(cls):
+        """
+        小写 service code -> 产品记录
+        """
+        def build(data):
+            index = {}
+            for item in data:
+                product = ProductRecord.of(item)
+                if product.code:
+                    index.setdefault(product.code.lower(), product)
+            return index
+
         data = cls.get_response_from_pop_api(cls.GET_PRODUCT_LIST)
-        version = next((item.get(DEFAULT_VERSION) for item in data if item.get(CODE).lower() == service.lower()), None)
-        return version
+        return cls._get_index((cls.GET_PRODUCT_LIST,), data, build)
+
+    @classmethod
+    def get_api_index(cls, service, version=None):
+        """
+        小写 API 名称 -> ApiIndexEntry，version 为空时使用 service 的默认版本；service 不存在时返回空字典
+        """
+        product = cls.get_product_index().get(service.lower())
+        if product is None:
+            return {}
+        service_standard = product.code
+        version = version or product.default_version
+        style = product.style or 'RPC'
+
+        def build(data):
+            return {api_name.lower(): ApiIndexEntry(api_name, version, style) for api_name in data.get(APIS, {})}
+
+        data = cls.get_response_from_pop_api(cls.GET_API_OVERVIEW, service=service_standard, version=version)
+        return cls._get_index((cls.GET_API_OVERVIEW, service_standard, version), data, build)
+
+    @classmethod
+    def get_service_version(cls, service):
+        product = cls.get_product_index().get(service.lower())
+        return product.default_version if product is not None else None
 
     @classmethod
     def get_all_service_info(cls):
         data = cls.get_response_from_pop_api(cls.GET_PRODUCT_LIST)
-        filtered_data = [{"code": item["code"], "name": item["name"]} for item in data]
+        filtered_data = [{"code": item["code"], "name": item["name"]} for item in map(ProductRecord.of, data)]
 
         return filtered_data
 
     @classmethod
     def get_service_style(cls, service):
-        data = cls.get_response_from_pop_api(cls.GET_PRODUCT_LIST)
-        style = next((item.get(STYLE) for item in data if item.get(CODE).lower() == service), 'RPC')
-        return style
+        product = cls.get_product_index().get(service.lower())
+        return product.style if product is not None else 'RPC'
 
     @classmethod
     def get_standard_service_and_api(cls, service, api=None, version=None):
-        data = cls.get_response_from_pop_api(cls.GET_PRODUCT_LIST)
-        service_standard = (next((item.get(CODE) for item in data if item.get(CODE).lower() == service), None))
+        product = cls.get_product_index().get(service.lower())
+        service_standard = product.code if product is not None else None
         api_standard = None
-        if api:
-            apis = cls.get_response_from_pop_api(cls.GET_API_OVERVIEW, service=service_standard,
-                                                 version=version).get(APIS, {})
-            for api_name in apis:
-                if api_name.lower() == api.lower():
-                    api_standard = api_name
+        if api and service_standard:
+            entry = cls.get_api_index(service, version).get(api.lower())
+            api_standard = entry.name if entry is not None else None
         return service_standard, api_standard
 
     @classmethod
@@ -87,9 +349,34 @@ class ApiMetaClient:
             raise Exception(f'InvalidServiceName: Please check the Service ({service}) you provide.')
         if api_standard is None:
             raise Exception(f'InvalidAPIName: Please check the Service ({service}) and the API ({api}) you provide.')
-        data = cls.get_response_from_pop_api(cls.GET_API_INFO, service_standard, api_standard, version)
+        data = cls.get_api_docs(service_standard, version).get(api_standard)
+        if data is None:
+            data = cls.get_response_from_pop_api(cls.GET_API_INFO, service_standard, api_standard, version)
         return data, version
 
+    @classmethod
+    def get_api_docs(cls, service_standard, version):
+        """
+        通过 GetAPIDocs 一次性获取整个 service 的 API 文档，返回 API 名称 -> API META；
+        未开启或文档不可用时返回空字典，由调用方退化为逐个 API 调用 GetApiInfo
+        """
+        if not settings.meta_use_api_docs:
+            return {}
+        key = (service_standard, version)
+        if key in cls._api_docs_unavailable:
+            return {}
+        try:
+            data = cls.get_response_from_pop_api(cls.GET_APIDOCS, service=service_standard, version=version)
+        except Exception as e:
+            logger.warning(f'GetAPIDocs unavailable for {service_standard} {version}, fall back to GetApiInfo: {e}')
+            cls._api_docs_unavailable.set(key, True)
+            return {}
+        apis = data.get(APIS) if isinstance(data, dict) else None
+        if not isinstance(apis, Mapping):
+            cls._api_docs_unavailable.set(key, True)
+            return {}
+        return apis
+
     @classmethod
     def get_response_from_api_meta(cls, service, api):
         api_meta, version = cls.get_api_meta(service, api)
@@ -115,32 +402,13 @@ class ApiMetaClient:
         """
         params_in: 过滤参数位置，取值：'host', 'query', 'body', 'header'，若为空，则返回所有参数
         """
-        api_meta, _ = cls.get_api_meta(service, api)
+        api_meta, version = cls.get_api_meta(service, api)
         parameters = api_meta.get(PARAMETERS)
+        graph = cls.get_schema_graph(service, version)
         param_names = []
         additional_props = []
-        # 避免循环引用
+        # 同一次调用的所有参数共用已访问的引用，每个组件的字段只列出一次，也避免循环引用
         visited_refs = set()
-
-        def get_ref(data, _):
-            props = []
-            if not isinstance(data, dict):
-                return props
-            if REF in data:
-                ref_path = data.get(REF)
-                if ref_path in visited_refs:
-                    return props
-                visited_refs.add(ref_path)
-                referenced_schema = cls.get_ref_api_meta(data, service, _)
-                props.extend(get_ref(referenced_schema, _))
-                return props
-            if PROPERTIES in data:
-                for prop_name, prop_details in data.get(PROPERTIES, {}).items():
-                    props.append(prop_name)
-                    if isinstance(prop_details, dict) and REF in prop_details:
-                        props.extend(get_ref(prop_details, _))
-            return props
-
         for param in parameters:
             if params_in and param.get(IN) != params_in:
                 continue
@@ -148,17 +416,71 @@ class ApiMetaClient:
             if param_name:
                 param_names.append(param_name)
             schema = param.get(SCHEMA, {})
-            extracted_props = get_ref(schema, _)
-            additional_props.extend(extracted_props)
+            additional_props.extend(graph.property_names(schema, visited_refs))
         combined_params = param_names + additional_props
         return combined_params
 
+    @classmethod
+    def get_compact_api_parameters(cls, service, api, max_chars=None):
+        """
+        API 参数的精简投影（名称、类型、必填、枚举、简短描述、展开后的嵌套字段），JSON 长度不超过 max_chars，
+        按 API 缓存
+        """
+        if max_chars is None:
+            max_chars = settings.api_info_max_chars
+        api_meta, version = cls.get_api_meta(service, api)
+        key = (service.lower(), api.lower(), version, max_chars)
+        compact = cls._compact_parameters.get(key)
+        if compact is None:
+            graph = cls.get_schema_graph(service, version)
+            compact = compact_parameters(api_meta.get(PARAMETERS), graph.resolve, max_chars)
+            cls._compact_parameters.set(key, compact)
+        return compact
+
+    @classmethod
+    def get_schema_graph(cls, service, version):
+        """
+        获取 service 某个版本的 $ref 解析图，被引用的组件只获取和展开一次，并处理循环引用
+        """
+        key = (service.lower(), version)
+        graph = cls._schema_graphs.get(key)
+        if graph is None:
+            with cls._index_lock:
+                graph = cls._schema_graphs.get(key)
+                if graph is None:
+                    graph = SchemaGraph(lambda ref_path: cls.get_ref_api_meta({REF: ref_path}, service, version))
+                    cls._schema_graphs.set(key, graph)
+        return graph
+
     @classmethod
     def get_apis_in_service(cls, service):
-        version = cls.get_service_version(service)
-        data = cls.get_response_from_pop_api(cls.GET_API_OVERVIEW, service=service, version=version)
-        apis = list(data[APIS].keys())
-        return apis
+        """
+        service 默认版本的全部 API 名称，overview 按规范的 service code 加载，与 get_api_meta 共用缓存
+        """
+        if service.lower() not in cls.get_product_index():
+            raise Exception(f'InvalidServiceName: Please check the Service ({service}) you provide.')
+        return [entry.name for entry in cls.get_api_index(service).values()]
+
+    @classmethod
+    def get_api_search_index(cls, service):
+        """
+        service 默认版本的 API 检索索引，基于 overview 及（可用时）GetAPIDocs 文档构建，overview 重新加载后自动重建
+        """
+        product = cls.get_product_index().get(service.lower())
+        if product is None:
+            raise Exception(f'InvalidServiceName: Please check the Service ({service}) you provide.')
+        service_standard, version = product.code, product.default_version
+
+        def build(data):
+            api_docs = cls.get_api_docs(service_standard, version)
+            return ApiSearchIndex(data.get(APIS, {}), api_docs, directory_tags(data.get(DIRECTORIES)))
+
+        data = cls.get_response_from_pop_api(cls.GET_API_OVERVIEW, service=service_standard, version=version)
+        return cls._get_index(('search', service_standard, version), data, build)
+
+    @classmethod
+    def search_apis(cls, service, query, limit=20, offset=0):
+        return cls.get_api_search_index(service).search(query, limit, offset)
 
     @classmethod
     def get_api_field(cls, field_type, service, api, default=None):
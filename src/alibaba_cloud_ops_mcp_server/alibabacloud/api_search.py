@@ -0,0 +1,151 @@
+import difflib
+import math
+import re
+from collections import defaultdict
+
+# 各字段命中时的权重，API 名称最重要
+FIELD_WEIGHTS = (NAME_WEIGHT, TITLE_WEIGHT, TAG_WEIGHT, PARAMETER_WEIGHT) = (3.0, 1.5, 1.0, 0.5)
+# 模糊匹配（前缀/近似拼写）命中的得分折扣
+PREFIX_DISCOUNT = 0.6
+FUZZY_DISCOUNT = 0.4
+FUZZY_CUTOFF = 0.8
+EXACT_NAME_BONUS = 10.0
+
+_CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+_CJK_RE = re.compile(r'[一-鿿]+')
+_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+
+
+def _normalize(word):
+    word = word.lower()
+    # 简单的复数归一：Instances -> instance
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """
+    拆分英文驼峰与单词，中文按相邻两字切分（单字时保留单字），返回归一化后的 token 列表
+    """
+    if not text:
+        return []
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        parts = _CAMEL_RE.findall(word) or [word]
+        tokens.extend(_normalize(part) for part in parts)
+    for chunk in _CJK_RE.findall(text):
+        if len(chunk) == 1:
+            tokens.append(chunk)
+        else:
+            tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+    return tokens
+
+
+def _texts(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [text for key in ('name', 'title') for text in _texts(value.get(key))]
+    if isinstance(value, (list, tuple)):
+        return [text for item in value for text in _texts(item)]
+    return []
+
+
+def directory_tags(directories):
+    """
+    overview 中的目录树 -> API 名称 -> 所属目录标题列表
+    """
+    tags = defaultdict(list)
+
+    def walk(nodes, path):
+        for node in nodes or []:
+            if isinstance(node, str):
+                tags[node].extend(path)
+            elif isinstance(node, dict):
+                title = node.get('title')
+                walk(node.get('children'), path + [title] if title else path)
+
+    walk(directories, [])
+    return tags
+
+
+class ApiSearchIndex:
+    """
+    单个 service 的 API 倒排索引，索引 API 名称、标题/摘要、标签及参数名，按字段加权的 TF-IDF 排序，
+    未精确命中的查询词退化为前缀与近似拼写匹配
+    """
+
+    def __init__(self, apis, api_docs=None, tags=None):
+        api_docs = api_docs or {}
+        tags = tags or {}
+        # 逐个读取全部 API 文档时不经过解码缓存，避免挤掉正在使用的 API
+        lookup = getattr(api_docs, 'peek', api_docs.get)
+        self._names = []
+        self._summaries = []
+        self._postings = defaultdict(dict)
+        for name, entry in apis.items():
+            doc_id = len(self._names)
+            entry = entry if hasattr(entry, 'get') else {}
+            meta = lookup(name) or {}
+            summary = entry.get('summary') or meta.get('summary') or entry.get('title') or meta.get('title') or ''
+            self._names.append(name)
+            self._summaries.append(summary)
+            self._add(doc_id, tokenize(name), NAME_WEIGHT)
+            for source in (entry, meta):
+                for key in ('title', 'summary'):
+                    self._add(doc_id, tokenize(source.get(key) or ''), TITLE_WEIGHT)
+                for text in _texts(source.get('tags')):
+                    self._add(doc_id, tokenize(text), TAG_WEIGHT)
+            for text in tags.get(name, []):
+                self._add(doc_id, tokenize(text), TAG_WEIGHT)
+            for parameter in meta.get('parameters') or []:
+                if isinstance(parameter, dict):
+                    self._add(doc_id, tokenize(parameter.get('name') or ''), PARAMETER_WEIGHT)
+        self._vocabulary = sorted(self._postings)
+        self._lower_names = {name.lower(): doc_id for doc_id, name in enumerate(self._names)}
+
+    def _add(self, doc_id, tokens, weight):
+        for token in tokens:
+            postings = self._postings[token]
+            # 同一字段重复出现只计一次，不同字段取最大权重
+            postings[doc_id] = max(postings.get(doc_id, 0.0), weight)
+
+    def _idf(self, token):
+        return math.log(1 + len(self._names) / (1 + len(self._postings[token])))
+
+    def _expand(self, token):
+        """查询词 -> [(索引词, 折扣)]，优先精确命中，其次前缀，最后近似拼写"""
+        if token in self._postings:
+            return [(token, 1.0)]
+        if len(token) >= 3:
+            prefixed = [(word, PREFIX_DISCOUNT) for word in self._vocabulary if word.startswith(token)]
+            if prefixed:
+                return prefixed
+        return [(word, FUZZY_DISCOUNT)
+                for word in difflib.get_close_matches(token, self._vocabulary, n=3, cutoff=FUZZY_CUTOFF)]
+
+    def search(self, query, limit=20, offset=0):
+        """
+        返回 {'total': 命中总数, 'apis': [{'name', 'summary', 'score'}]}，按得分降序、名称升序分页
+        """
+        scores = defaultdict(float)
+        for token in dict.fromkeys(tokenize(query)):
+            for word, discount in self._expand(token):
+                idf = self._idf(word)
+                for doc_id, weight in self._postings[word].items():
+                    scores[doc_id] += weight * idf * discount
+        exact = self._lower_names.get(query.strip().lower())
+        if exact is not None:
+            scores[exact] += EXACT_NAME_BONUS
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._names[item[0]]))
+        offset = max(offset, 0)
+        page = ranked[offset:offset + max(limit, 0)]
+        return {
+            'total': len(ranked),
+            'apis': [{'name': self._names[doc_id], 'summary': self._summaries[doc_id], 'score': round(score, 3)}
+                     for doc_id, score in page],
+        }
+
+    def __len__(self):
+        return len(self._names)
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire ``ttl`` seconds after being stored.
+    ``ttl`` <= 0 disables expiry, ``maxsize`` <= 0 disables caching entirely.
+    ``on_evict(key, value)`` is called, outside the lock, for every entry dropped by the LRU policy, by expiry
+    or by invalidate(); not for an entry replaced by set().
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, timer=time.monotonic, on_evict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._on_evict = on_evict
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, stored_at):
+        return self.ttl > 0 and self._timer() - stored_at >= self.ttl
+
+    def _evicted(self, entries):
+        if self._on_evict is not None:
+            for key, value in entries:
+                self._on_evict(key, value)
+
+    def get(self, key, default=None):
+        evicted = []
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                stored_at, value = entry
+                if not self._expired(stored_at):
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                evicted.append((key, value))
+            self.misses += 1
+        self._evicted(evicted)
+        return default
+
+    def peek(self, key, default=None):
+        """Return the live value of ``key`` without counting a hit or miss or refreshing its LRU position."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or self._expired(entry[0]):
+                return default
+            return entry[1]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        evicted = []
+        with self._lock:
+            self._data[key] = (self._timer(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted_key, (_, evicted_value) = self._data.popitem(last=False)
+                evicted.append((evicted_key, evicted_value))
+                self.evictions += 1
+        self._evicted(evicted)
+
+    def invalidate(self, predicate=None):
+        """
+        Remove every entry whose key satisfies ``predicate``, or all entries if it is None.
+        Returns the number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate is None or predicate(key)]
+            evicted = [(key, self._data.pop(key)[1]) for key in keys]
+        self._evicted(evicted)
+        return len(evicted)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and not self._expired(entry[0])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls: while a call for ``key`` is in flight, other callers asking for the
+    same key wait for it and share its result (or exception) instead of running ``fn`` themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
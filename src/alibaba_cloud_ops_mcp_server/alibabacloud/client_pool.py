@@ -0,0 +1,145 @@
+import contextlib
+import hashlib
+import logging
+import threading
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.cache import TTLCache, SingleFlight
+from alibaba_cloud_ops_mcp_server.alibabacloud.utils import get_credentials_from_header
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def credential_fingerprint(credentials=None):
+    """
+    Identify the credential a client is created with, without keeping the secret itself in the pool key:
+    a digest of the AccessKey pair and token passed in the request headers, or the name of the shared
+    credential source.
+    """
+    if credentials:
+        material = '\n'.join(credentials.get(key) or '' for key in ('AccessKeyId', 'AccessKeySecret', 'SecurityToken'))
+        return 'header:' + hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+    if settings.headers_credential_only:
+        return 'anonymous'
+    return 'default'
+
+
+class ClientPool:
+    """
+    LRU pool of SDK clients keyed by (kind, endpoint, credential fingerprint). An entry expires after
+    ``idle_ttl`` seconds without being used; ``maxsize`` <= 0 disables pooling. Clients that hold resources
+    are given a ``close(client)`` callback, called when they leave the pool; such clients are used through
+    lease(), and one that leaves the pool while leased is closed only once its last lease is released.
+    """
+
+    def __init__(self, maxsize=None, idle_ttl=None):
+        self._clients = TTLCache(
+            maxsize=settings.client_pool_maxsize if maxsize is None else maxsize,
+            ttl=settings.client_pool_idle_ttl if idle_ttl is None else idle_ttl,
+            on_evict=self._close,
+        )
+        self._inflight = SingleFlight()
+        self._lock = threading.RLock()
+        # 以下三个字典均以 id(client) 为键
+        self._closers = {}
+        self._leases = {}
+        self._retired = {}
+        self.created = 0
+        self.closed = 0
+
+    def _close(self, key, client):
+        with self._lock:
+            close = self._closers.pop(id(client), None)
+            if close is None:
+                return
+            if self._leases.get(id(client)):
+                # 仍有请求在使用，最后一个使用者归还后再关闭
+                self._retired[id(client)] = (key, client, close)
+                return
+        self._close_now(key, client, close)
+
+    def _close_now(self, key, client, close):
+        self.closed += 1
+        try:
+            close(client)
+        except Exception as e:
+            logger.warning(f'Failed to close pooled {key[0]} client of {key[1]}: {e}')
+
+    def get(self, kind, endpoint, factory, close=None):
+        key = (kind, endpoint, credential_fingerprint(get_credentials_from_header()))
+        client = self._clients.get(key)
+        if client is not None:
+            # 重新写入以刷新空闲过期时间
+            self._clients.set(key, client)
+            return client
+        return self._inflight.do(key, self._create, key, factory, close)
+
+    def _create(self, key, factory, close=None):
+        client = factory()
+        self.created += 1
+        if close is not None and self._clients.maxsize > 0:
+            with self._lock:
+                self._closers[id(client)] = close
+        self._clients.set(key, client)
+        return client
+
+    @contextlib.contextmanager
+    def lease(self, kind, endpoint, factory, close=None):
+        """
+        Like get(), for the duration of the ``with`` block: the client is not closed before the block exits, even
+        when it leaves the pool meanwhile.
+        """
+        while True:
+            client = self.get(kind, endpoint, factory, close)
+            with self._lock:
+                # 取得客户端与登记使用之间它可能已被淘汰并关闭，此时重新获取
+                if close is not None and self._clients.maxsize > 0 and id(client) not in self._closers:
+                    continue
+                self._leases[id(client)] = self._leases.get(id(client), 0) + 1
+                break
+        try:
+            yield client
+        finally:
+            self._release(client)
+
+    def _release(self, client):
+        with self._lock:
+            remaining = self._leases.get(id(client), 0) - 1
+            if remaining > 0:
+                self._leases[id(client)] = remaining
+                return
+            self._leases.pop(id(client), None)
+            retired = self._retired.pop(id(client), None)
+        if retired is not None:
+            self._close_now(*retired)
+
+    def clear(self):
+        self._clients.invalidate()
+        self._clients.reset_stats()
+        self.created = 0
+        self.closed = 0
+
+    def stats(self):
+        stats = self._clients.stats()
+        stats['created'] = self.created
+        stats['closed'] = self.closed
+        return stats
+
+
+client_pool = ClientPool()
+
+
+def get_client(kind, endpoint, factory, close=None):
+    """
+    Return the pooled client of ``kind`` for ``endpoint`` and the caller's credential, built by ``factory``;
+    ``close(client)`` is called once the client leaves the pool.
+    """
+    return client_pool.get(kind, endpoint, factory, close)
+
+
+def lease_client(kind, endpoint, factory, close=None):
+    """
+    Context manager of the pooled client of ``kind`` for ``endpoint``, see get_client(); a client that leaves
+    the pool is closed only once every ``with`` block using it has exited.
+    """
+    return client_pool.lease(kind, endpoint, factory, close)
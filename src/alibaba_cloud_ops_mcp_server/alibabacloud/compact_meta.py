@@ -0,0 +1,163 @@
+"""
+Memory-compact representation of the API meta documents kept in ApiMetaClient's cache.
+
+- every dict key and every short string value is interned, so the thousands of repeated ``type``/``schema``/
+  ``string`` strings across documents share one object;
+- products and overview API entries are stored as ``__slots__`` records instead of dicts;
+- the per-API meta of a GetAPIDocs document is kept as a zlib compressed JSON blob per API, decoded on
+  access (the most recently used ones stay decoded).
+"""
+import json
+import sys
+import zlib
+from collections.abc import Mapping
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.cache import TTLCache
+
+# 只驻留较短的字符串值，长描述文本几乎不会重复
+INTERN_MAX_LENGTH = 64
+DECODED_APIS_MAXSIZE = 32
+
+
+def intern_keys(data):
+    """Return a copy of the JSON value ``data`` with interned dict keys and short string values."""
+    if isinstance(data, dict):
+        return {sys.intern(key) if isinstance(key, str) else key: intern_keys(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [intern_keys(item) for item in data]
+    if isinstance(data, str) and len(data) <= INTERN_MAX_LENGTH:
+        return sys.intern(data)
+    return data
+
+
+def _intern_pairs(pairs):
+    return {sys.intern(key): sys.intern(value) if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH
+            else value for key, value in pairs}
+
+
+class _Record:
+    """
+    ``__slots__`` record that can still be read like the dict it replaces: ``record.get('defaultVersion')``.
+    ``FIELDS`` maps the JSON keys to the slot names.
+    """
+    __slots__ = ()
+    FIELDS = {}
+
+    def __init__(self, **kwargs):
+        for slot in self.__slots__:
+            setattr(self, slot, kwargs.get(slot))
+
+    @classmethod
+    def of(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(**{slot: intern_keys(data.get(key)) for key, slot in cls.FIELDS.items()})
+
+    def get(self, key, default=None):
+        slot = self.FIELDS.get(key)
+        value = getattr(self, slot) if slot is not None else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self):
+        return {key: getattr(self, slot) for key, slot in self.FIELDS.items() if getattr(self, slot) is not None}
+
+    def __eq__(self, other):
+        if isinstance(other, _Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ', '.join(f'{slot}={getattr(self, slot)!r}' for slot in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class ProductRecord(_Record):
+    __slots__ = ('code', 'name', 'default_version', 'style')
+    FIELDS = {'code': 'code', 'name': 'name', 'defaultVersion': 'default_version', 'style': 'style'}
+
+
+class ApiRecord(_Record):
+    __slots__ = ('title', 'summary', 'tags', 'deprecated')
+    FIELDS = {'title': 'title', 'summary': 'summary', 'tags': 'tags', 'deprecated': 'deprecated'}
+
+
+class LazyApiDocs(Mapping):
+    """API name -> API meta, each API kept as a compressed JSON blob and decoded on access."""
+
+    def __init__(self, apis):
+        self._blobs = {
+            sys.intern(name): zlib.compress(json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 1)
+            for name, meta in apis.items()
+        }
+        self._decoded = TTLCache(maxsize=DECODED_APIS_MAXSIZE, ttl=0)
+
+    def __getitem__(self, name):
+        meta = self._decoded.get(name)
+        if meta is None:
+            meta = self._decode(name)
+            self._decoded.set(name, meta)
+        return meta
+
+    def peek(self, name, default=None):
+        """
+        The meta of ``name`` without adding it to or refreshing it in the decoded LRU, for one-off passes over
+        every API that would otherwise evict the APIs in use.
+        """
+        meta = self._decoded.peek(name)
+        if meta is None:
+            if name not in self._blobs:
+                return default
+            meta = self._decode(name)
+        return meta
+
+    def _decode(self, name):
+        return json.loads(zlib.decompress(self._blobs[name]).decode('utf-8'), object_pairs_hook=_intern_pairs)
+
+    def __contains__(self, name):
+        return name in self._blobs
+
+    def __iter__(self):
+        return iter(self._blobs)
+
+    def __len__(self):
+        return len(self._blobs)
+
+    def encoded_size(self):
+        return sum(len(blob) for blob in self._blobs.values())
+
+
+def compact_products(data):
+    return [ProductRecord.of(item) for item in data] if isinstance(data, list) else data
+
+
+def compact_overview(data):
+    if not isinstance(data, dict):
+        return data
+    compact = intern_keys({key: value for key, value in data.items() if key != 'apis'})
+    apis = data.get('apis')
+    if isinstance(apis, dict):
+        compact['apis'] = {sys.intern(name): ApiRecord.of(entry if isinstance(entry, dict) else {})
+                           for name, entry in apis.items()}
+    elif 'apis' in data:
+        compact['apis'] = intern_keys(apis)
+    return compact
+
+
+def compact_api_docs(data):
+    if not isinstance(data, dict):
+        return data
+    compact = intern_keys({key: value for key, value in data.items() if key != 'apis'})
+    apis = data.get('apis')
+    if isinstance(apis, dict):
+        compact['apis'] = LazyApiDocs(apis)
+    elif 'apis' in data:
+        compact['apis'] = intern_keys(apis)
+    return compact
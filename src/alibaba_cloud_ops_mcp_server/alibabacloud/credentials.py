@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import threading
+import time
+
+from alibabacloud_credentials.provider import DefaultCredentialsProvider
+from alibabacloud_credentials.provider.refreshable import Credentials
+from alibabacloud_credentials_api import ICredentialsProvider
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.cache import SingleFlight
+from alibaba_cloud_ops_mcp_server.alibabacloud.metrics import LatencyStats
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCredentialsProvider(ICredentialsProvider):
+    """
+    Process-wide cache in front of a credentials provider (by default the SDK's provider chain: environment,
+    profile files, ECS RAM role, ...), so the chain is resolved once instead of on every client creation.
+
+    Credentials with a security token are temporary: they are refreshed on a background thread once they are
+    older than ``refresh_ahead`` seconds before their expiry, and synchronously once expired. The expiry is the
+    one reported by the provider, or ``sts_ttl`` seconds after resolution when the provider does not report it.
+    A failed background refresh keeps serving the cached credentials until they expire. Long-term AccessKeys
+    never expire.
+    """
+
+    def __init__(self, provider: ICredentialsProvider = None, sts_ttl=None, refresh_ahead=None, timer=time.time):
+        self._provider = provider
+        self._sts_ttl = settings.credential_sts_ttl if sts_ttl is None else sts_ttl
+        self._refresh_ahead = settings.credential_refresh_ahead if refresh_ahead is None else refresh_ahead
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._expires_at = None
+        self._refreshing = False
+        self._inflight = SingleFlight()
+        self.resolve_stats = LatencyStats()
+        self.background_refreshes = 0
+        self.failed_refreshes = 0
+
+    def get_provider_name(self) -> str:
+        return 'cached'
+
+    def _resolve(self):
+        with self.resolve_stats.time():
+            if self._provider is None:
+                self._provider = DefaultCredentialsProvider()
+            credentials = self._provider.get_credentials()
+        expires_at = None
+        expiration = credentials.get_expiration() if hasattr(credentials, 'get_expiration') else None
+        if expiration:
+            expires_at = float(expiration)
+        elif credentials.get_security_token():
+            expires_at = self._timer() + self._sts_ttl
+        with self._lock:
+            self._credentials = credentials
+            self._expires_at = expires_at
+        return credentials
+
+    def _refresh_in_background(self):
+        try:
+            self._resolve()
+            self.background_refreshes += 1
+        except Exception as e:
+            self.failed_refreshes += 1
+            logger.warning(f'Failed to refresh credentials ahead of expiry, keep using the cached ones: {e}')
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _cached(self):
+        """The cached credentials when no synchronous resolution is needed, starting a background refresh when due."""
+        with self._lock:
+            credentials, expires_at = self._credentials, self._expires_at
+            if credentials is None:
+                return None
+            now = self._timer()
+            if expires_at is None or now < expires_at - self._refresh_ahead:
+                return credentials
+            if now >= expires_at:
+                return None
+            if not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, name='credentials-refresh', daemon=True).start()
+            return credentials
+
+    def get_credentials(self) -> Credentials:
+        credentials = self._cached()
+        if credentials is not None:
+            return credentials
+        return self._inflight.do('resolve', self._resolve)
+
+    async def get_credentials_async(self) -> Credentials:
+        credentials = self._cached()
+        if credentials is not None:
+            return credentials
+        # 首次解析或凭证已过期时才需要同步请求凭证链，交给线程池以免阻塞事件循环
+        return await asyncio.to_thread(self.get_credentials)
+
+    def invalidate(self):
+        with self._lock:
+            self._credentials = None
+            self._expires_at = None
+
+    def stats(self):
+        stats = self.resolve_stats.snapshot()
+        with self._lock:
+            stats['expires_in'] = self._expires_at - self._timer() if self._expires_at is not None else None
+        stats['background_refreshes'] = self.background_refreshes
+        stats['failed_refreshes'] = self.failed_refreshes
+        return stats
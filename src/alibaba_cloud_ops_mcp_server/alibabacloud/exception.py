@@ -44,3 +44,15 @@ class OOSExecutionFailed(AcsException):
     msg_fmt = 'OOS Execution Failed, reason: {reason}.'
     status = 400
     code = 'Execution.Failed'
+
+
+class OOSExecutionTimeout(AcsException):
+    msg_fmt = 'OOS Execution {execution_id} did not finish within {timeout} seconds, it keeps running in the background.'
+    status = 504
+    code = 'Execution.Timeout'
+
+
+class ToolConcurrencyLimitExceeded(AcsException):
+    msg_fmt = 'Too many concurrent tool calls, {reason}, please retry later.'
+    status = 429
+    code = 'Throttling.ConcurrencyLimitExceeded'
@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import inspect
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import exception
+from alibaba_cloud_ops_mcp_server.alibabacloud.utils import get_credentials_from_header, request_credentials
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+DEFAULT_TENANT = 'default'
+
+
+def current_tenant():
+    """The AccessKeyId passed in the request headers, or DEFAULT_TENANT for the server's own credentials."""
+    credentials = get_credentials_from_header()
+    return (credentials or {}).get('AccessKeyId') or DEFAULT_TENANT
+
+
+class ConcurrencyLimiter:
+    """
+    Admission control of tool calls on the event loop: at most ``max_concurrency`` calls run at once and at most
+    ``max_per_tenant`` for one tenant; a limit <= 0 is disabled. Calls over the limits wait in a FIFO queue of
+    ``max_queue`` entries, where a call whose tenant is at its own limit does not hold back the calls of other
+    tenants. A call is rejected with ToolConcurrencyLimitExceeded when the queue is full or after waiting
+    ``queue_timeout`` seconds.
+    """
+
+    def __init__(self, max_concurrency=None, max_per_tenant=None, max_queue=None, queue_timeout=None):
+        self.max_concurrency = settings.tool_max_concurrency if max_concurrency is None else max_concurrency
+        self.max_per_tenant = settings.tool_max_concurrency_per_tenant if max_per_tenant is None else max_per_tenant
+        self.max_queue = settings.tool_max_queue if max_queue is None else max_queue
+        self.queue_timeout = settings.tool_queue_timeout if queue_timeout is None else queue_timeout
+        self._active = 0
+        self._by_tenant = {}
+        self._waiters = deque()
+        self.rejected = 0
+        self.queued = 0
+
+    def _can_run(self, tenant):
+        if 0 < self.max_concurrency <= self._active:
+            return False
+        return not (0 < self.max_per_tenant <= self._by_tenant.get(tenant, 0))
+
+    def _grant(self, tenant):
+        self._active += 1
+        self._by_tenant[tenant] = self._by_tenant.get(tenant, 0) + 1
+
+    def _wake(self):
+        for entry in list(self._waiters):
+            if 0 < self.max_concurrency <= self._active:
+                break
+            tenant, future = entry
+            if future.done():
+                self._waiters.remove(entry)
+            elif self._can_run(tenant):
+                self._waiters.remove(entry)
+                self._grant(tenant)
+                future.set_result(None)
+
+    def _reject(self, reason):
+        self.rejected += 1
+        raise exception.ToolConcurrencyLimitExceeded(reason=reason)
+
+    async def acquire(self, tenant=DEFAULT_TENANT):
+        # 队列中剩下的调用都在等待各自的限额，新调用只要有空位即可直接执行
+        if self._can_run(tenant):
+            self._grant(tenant)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject(f'the wait queue of {self.max_queue} calls is full')
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        entry = (tenant, future)
+        self._waiters.append(entry)
+        self.queued += 1
+        timer = None
+        if self.queue_timeout and self.queue_timeout > 0:
+            timer = loop.call_later(self.queue_timeout, self._expire, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # 已分配到执行名额后才被取消，归还名额
+                self.release(tenant)
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def _expire(self, entry):
+        tenant, future = entry
+        if future.done():
+            return
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+        self.rejected += 1
+        future.set_exception(exception.ToolConcurrencyLimitExceeded(
+            reason=f'waited more than {self.queue_timeout} seconds in the queue'))
+
+    def release(self, tenant=DEFAULT_TENANT):
+        self._active -= 1
+        remaining = self._by_tenant.get(tenant, 0) - 1
+        if remaining > 0:
+            self._by_tenant[tenant] = remaining
+        else:
+            self._by_tenant.pop(tenant, None)
+        self._wake()
+
+    def stats(self):
+        return {
+            'active': self._active,
+            'waiting': len(self._waiters),
+            'tenants': len(self._by_tenant),
+            'queued': self.queued,
+            'rejected': self.rejected,
+        }
+
+
+tool_limiter = ConcurrencyLimiter()
+
+
+def reset_tool_limiter():
+    """Replace tool_limiter by one built from the current settings."""
+    global tool_limiter
+    tool_limiter = ConcurrencyLimiter()
+    return tool_limiter
+
+
+_loop_executors = weakref.WeakKeyDictionary()
+
+
+def install_executor(loop=None):
+    """Give the event loop a default executor of settings.tool_executor_workers threads, once per loop."""
+    loop = loop or asyncio.get_running_loop()
+    if loop not in _loop_executors:
+        executor = ThreadPoolExecutor(max_workers=settings.tool_executor_workers, thread_name_prefix='tool-executor')
+        loop.set_default_executor(executor)
+        _loop_executors[loop] = executor
+    return _loop_executors[loop]
+
+
+def limited(fn):
+    """
+    Wrap a tool function so that each call is admitted by ``tool_limiter`` for the tenant of the request.
+    The credentials of the request headers are resolved once per call and reused by the tool function.
+    Synchronous functions run on the loop's bounded default executor instead of blocking the event loop.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        install_executor()
+        with request_credentials(get_credentials_from_header()):
+            tenant = current_tenant()
+            await tool_limiter.acquire(tenant)
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    return await fn(*args, **kwargs)
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            finally:
+                tool_limiter.release(tenant)
+
+    return wrapper
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ETAG, LAST_MODIFIED, FETCHED_AT = ('etag', 'last_modified', 'fetched_at')
+
+
+class MetaStoreEntry:
+    __slots__ = ('body', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, body, etag=None, last_modified=None, fetched_at=0.0):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class MetaDiskStore:
+    """
+    Disk-backed store for API meta documents. Documents are kept under ``root`` using the same
+    relative paths as the meta endpoint (e.g. ``products/Ecs/versions/2014-05-26/overview.json``),
+    with a ``.meta.json`` sidecar holding the validators used for conditional revalidation.
+    """
+    SIDECAR_SUFFIX = '.meta.json'
+
+    def __init__(self, root):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self._lock = threading.Lock()
+
+    def _path(self, relative_path):
+        path = os.path.normpath(os.path.join(self.root, relative_path))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f'Invalid meta path: {relative_path}')
+        return path
+
+    def load(self, relative_path):
+        path = self._path(relative_path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                body = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f'Failed to load cached meta document {path}: {e}')
+            return None
+        validators = {}
+        try:
+            with open(path + self.SIDECAR_SUFFIX, 'r', encoding='utf-8') as f:
+                validators = json.load(f)
+        except (OSError, ValueError):
+            pass
+        return MetaStoreEntry(
+            body,
+            etag=validators.get(ETAG),
+            last_modified=validators.get(LAST_MODIFIED),
+            fetched_at=validators.get(FETCHED_AT, 0.0),
+        )
+
+    def save(self, relative_path, body, etag=None, last_modified=None):
+        path = self._path(relative_path)
+        validators = {ETAG: etag, LAST_MODIFIED: last_modified, FETCHED_AT: time.time()}
+        with self._lock:
+            self._atomic_write(path, body)
+            self._atomic_write(path + self.SIDECAR_SUFFIX, validators)
+
+    def touch(self, relative_path, entry):
+        """Record a successful revalidation (HTTP 304) of ``entry``."""
+        entry.fetched_at = time.time()
+        validators = {ETAG: entry.etag, LAST_MODIFIED: entry.last_modified, FETCHED_AT: entry.fetched_at}
+        with self._lock:
+            self._atomic_write(self._path(relative_path) + self.SIDECAR_SUFFIX, validators)
+
+    @staticmethod
+    def _atomic_write(path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,46 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class LatencyStats:
+    """Thread-safe call counter and latency accumulator."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.errors = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.count += 1
+            if error:
+                self.errors += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(time.perf_counter() - start, error=True)
+            raise
+        self.record(time.perf_counter() - start)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'total_seconds': self.total_seconds,
+                'avg_seconds': self.total_seconds / self.count if self.count else 0.0,
+                'max_seconds': self.max_seconds,
+            }
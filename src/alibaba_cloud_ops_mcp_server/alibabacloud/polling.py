@@ -0,0 +1,233 @@
+import asyncio
+import random
+import time
+
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+
+class PollStrategy:
+    """
+    Intervals between the status polls of a long running operation: ``fast_polls`` polls ``initial_interval``
+    seconds apart so that short operations return quickly, then intervals growing by ``multiplier`` up to
+    ``max_interval``. Every interval is randomized by +/- ``jitter`` (a fraction of it) so that many callers do not
+    poll in lockstep. Polling stops after ``timeout`` seconds in total; a timeout <= 0 polls forever.
+    """
+
+    def __init__(self, initial_interval=None, fast_polls=None, multiplier=None, max_interval=None, jitter=None,
+                 timeout=None, timer=time.monotonic, rand=random.random):
+        self.initial_interval = settings.oos_poll_initial_interval if initial_interval is None else initial_interval
+        self.fast_polls = settings.oos_poll_fast_polls if fast_polls is None else fast_polls
+        self.multiplier = settings.oos_poll_multiplier if multiplier is None else multiplier
+        self.max_interval = settings.oos_poll_max_interval if max_interval is None else max_interval
+        self.jitter = settings.oos_poll_jitter if jitter is None else jitter
+        self.timeout = settings.oos_poll_timeout if timeout is None else timeout
+        self._timer = timer
+        self._rand = rand
+
+    def interval(self, attempt):
+        """The interval after the ``attempt``-th poll (0 based), before jitter."""
+        if attempt < self.fast_polls:
+            return min(self.initial_interval, self.max_interval)
+        exponent = attempt - self.fast_polls + 1
+        return min(self.initial_interval * self.multiplier ** exponent, self.max_interval)
+
+    def delays(self):
+        """Yield the time to sleep before each next poll, ending once the overall timeout is reached."""
+        deadline = self._timer() + self.timeout if self.timeout > 0 else None
+        attempt = 0
+        while True:
+            delay = self.interval(attempt)
+            if self.jitter > 0:
+                delay *= 1 + self.jitter * (2 * self._rand() - 1)
+            if deadline is not None:
+                remaining = deadline - self._timer()
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            yield max(delay, 0)
+            attempt += 1
+
+
+class _Waiter:
+    __slots__ = ('key', 'future', 'strategy', 'delays', 'on_update', 'registered_at', 'due_at', 'interval',
+                 'polls')
+
+    def __init__(self, key, future, strategy, on_update, registered_at, due_at):
+        self.key = key
+        self.future = future
+        self.strategy = strategy
+        self.delays = strategy.delays()
+        self.on_update = on_update
+        self.registered_at = registered_at
+        self.due_at = due_at
+        self.interval = 0
+        self.polls = 0
+
+
+class _Group:
+    __slots__ = ('waiters', 'task', 'sleeper', 'failed_rounds', 'elapsed')
+
+    def __init__(self):
+        self.waiters = {}
+        self.task = None
+        self.sleeper = None
+        self.failed_rounds = 0
+        # 轮询循环已等待的时间，各操作的下次查询时间以此计
+        self.elapsed = 0.0
+
+
+class BatchPoller:
+    """
+    Waits for many long running operations with one polling loop per group (e.g. a region and its client)
+    instead of one loop per operation: each round refreshes the keys whose next poll is due with a single
+    ``fetch(group, keys, since)`` call, which returns the current state of the keys it found, ``since`` being the
+    wall-clock time the earliest of those keys was registered.
+
+    A waiter is resolved with the state of its key once ``is_done(state)``; until then ``on_update(state, polls)``
+    is awaited after every round it was due in. Each waiter keeps its own PollStrategy, whose next delay is drawn
+    only when the waiter was polled, the group sleeps until the earliest next poll of its waiters (those due
+    within the jitter of their interval are polled in the same round), and a waiter whose strategy runs out fails
+    with ``timeout_error(key, strategy)``. A new waiter interrupts that sleep (``timer`` measures how long it
+    lasted) for a round that polls it without advancing the schedule of the others. A group whose fetch fails
+    ``max_failed_rounds`` rounds in a row fails all its waiters with the last error. Must be used from a single
+    event loop.
+    """
+
+    def __init__(self, fetch, is_done, timeout_error, strategy_factory=PollStrategy, max_failed_rounds=3,
+                 clock=time.time, timer=time.monotonic):
+        self._fetch = fetch
+        self._is_done = is_done
+        self._timeout_error = timeout_error
+        self._strategy_factory = strategy_factory
+        self._max_failed_rounds = max_failed_rounds
+        self._clock = clock
+        self._timer = timer
+        self._groups = {}
+        self.rounds = 0
+
+    async def wait(self, group, key, on_update=None):
+        loop = asyncio.get_running_loop()
+        state = self._groups.get(group)
+        if state is None:
+            state = self._groups[group] = _Group()
+        waiter = _Waiter(key, loop.create_future(), self._strategy_factory(), on_update, self._clock(),
+                         state.elapsed)
+        state.waiters.setdefault(key, []).append(waiter)
+        if state.task is None or state.task.done():
+            state.task = loop.create_task(self._run(group, state))
+        elif state.sleeper is not None:
+            # 新加入的操作需要尽快完成首次查询
+            state.sleeper.cancel()
+        try:
+            return await waiter.future
+        finally:
+            self._discard(state, waiter)
+
+    def _discard(self, state, waiter):
+        waiters = state.waiters.get(waiter.key)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del state.waiters[waiter.key]
+
+    def _fail_all(self, state, error):
+        for waiters in list(state.waiters.values()):
+            for waiter in list(waiters):
+                if not waiter.future.done():
+                    waiter.future.set_exception(error)
+                self._discard(state, waiter)
+
+    async def _run(self, group, state):
+        try:
+            while state.waiters:
+                await self._round(group, state)
+                delay = self._next_delay(state)
+                if delay is None:
+                    continue
+                started = self._timer()
+                state.sleeper = asyncio.ensure_future(asyncio.sleep(delay))
+                try:
+                    await asyncio.wait([state.sleeper])
+                finally:
+                    if not state.sleeper.cancelled():
+                        state.elapsed += delay
+                    else:
+                        # 被新加入的操作打断，只计入实际等待的时间
+                        state.elapsed += min(max(self._timer() - started, 0), delay)
+                    state.sleeper.cancel()
+                    state.sleeper = None
+        except Exception as e:
+            self._fail_all(state, e)
+        finally:
+            if self._groups.get(group) is state and not state.waiters:
+                del self._groups[group]
+
+    @staticmethod
+    def _due_waiters(state):
+        # 下次查询落在自身随机抖动范围内的操作一并查询，避免抖动把同一批操作拆成多轮
+        return [waiter for waiters in state.waiters.values() for waiter in waiters
+                if not waiter.future.done()
+                and waiter.due_at - state.elapsed <= 2 * waiter.strategy.jitter * waiter.interval]
+
+    async def _round(self, group, state):
+        due = self._due_waiters(state)
+        if not due:
+            return
+        self.rounds += 1
+        polled = set(due)
+        keys = list(dict.fromkeys(waiter.key for waiter in due))
+        since = min(waiter.registered_at for waiter in due)
+        try:
+            found = await self._fetch(group, keys, since)
+            state.failed_rounds = 0
+        except Exception as e:
+            state.failed_rounds += 1
+            if state.failed_rounds >= self._max_failed_rounds:
+                self._fail_all(state, e)
+                return
+            found = {}
+        for key in keys:
+            result = found.get(key)
+            if result is None:
+                continue
+            for waiter in list(state.waiters.get(key, ())):
+                if waiter.future.done():
+                    continue
+                if self._is_done(result):
+                    waiter.future.set_result(result)
+                    self._discard(state, waiter)
+                elif waiter in polled:
+                    waiter.polls += 1
+                    if waiter.on_update is not None:
+                        await waiter.on_update(result, waiter.polls)
+        # 只推进本轮到期的操作的轮询间隔，其他操作保持各自的节奏
+        for waiter in due:
+            if waiter.future.done():
+                continue
+            delay = next(waiter.delays, None)
+            if delay is None:
+                waiter.future.set_exception(self._timeout_error(waiter.key, waiter.strategy))
+                self._discard(state, waiter)
+            else:
+                waiter.due_at = state.elapsed + delay
+                waiter.interval = delay
+
+    def _next_delay(self, state):
+        """Discard the resolved waiters, return the time until the earliest next poll of the others."""
+        due_at = []
+        for waiters in list(state.waiters.values()):
+            for waiter in list(waiters):
+                if waiter.future.done():
+                    self._discard(state, waiter)
+                else:
+                    due_at.append(waiter.due_at)
+        if not due_at:
+            return None
+        return max(min(due_at) - state.elapsed, 0)
+
+    def stats(self):
+        return {
+            'groups': len(self._groups),
+            'waiting': sum(len(waiters) for state in self._groups.values() for waiters in state.waiters.values()),
+            'rounds': self.rounds,
+        }
@@ -0,0 +1,100 @@
+import threading
+
+REF, PROPERTIES = ('$ref', 'properties')
+
+
+class SchemaGraph:
+    """
+    Memoized ``$ref`` resolution for the schemas of one (service, version).
+
+    Every referenced component is fetched through ``resolver`` at most once; the resolver is called without
+    holding the graph's lock, concurrent first fetches of a component are expected to be coalesced by the
+    resolver itself. Expansions by ``resolve`` are memoized per reference together with the set of references
+    they reach; a reference that leads back to one of its ancestors is cut at that point, and a memoized
+    expansion is only reused where it cannot close such a cycle, so the outcome never depends on the order in
+    which references were first visited (concurrent callers may expand the same reference twice, to equal
+    results). Resolved schemas are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, resolver):
+        self._resolver = resolver
+        self._components = {}
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def component(self, ref_path):
+        with self._lock:
+            if ref_path in self._components:
+                return self._components[ref_path]
+        component = self._resolver(ref_path)
+        with self._lock:
+            return self._components.setdefault(ref_path, component)
+
+    def property_names(self, schema, visited_refs=None):
+        """
+        Property names declared by ``schema``, following ``$ref`` of the schema itself and of its direct properties.
+        A reference in ``visited_refs`` is not followed again and every followed reference is added to it, so the
+        names of a component are listed once across all the schemas sharing the same set.
+        """
+        if visited_refs is None:
+            visited_refs = set()
+        names = []
+        self._collect_names(schema, visited_refs, names)
+        return names
+
+    def resolve(self, schema):
+        """
+        Return a copy of ``schema`` with every ``$ref`` replaced by the referenced component. References that
+        would recurse into themselves are left as ``{'$ref': ...}``.
+        """
+        resolved, _, _ = self._resolve(schema, ())
+        return resolved
+
+    def _collect_names(self, data, visited_refs, names):
+        if not isinstance(data, dict):
+            return
+        if REF in data:
+            ref_path = data[REF]
+            if ref_path not in visited_refs:
+                visited_refs.add(ref_path)
+                self._collect_names(self.component(ref_path), visited_refs, names)
+            return
+        for prop_name, prop_details in data.get(PROPERTIES, {}).items():
+            names.append(prop_name)
+            if isinstance(prop_details, dict) and REF in prop_details:
+                self._collect_names(prop_details, visited_refs, names)
+
+    def _resolve(self, data, stack):
+        if isinstance(data, list):
+            items = []
+            cut = reach = frozenset()
+            for item in data:
+                resolved, item_cut, item_reach = self._resolve(item, stack)
+                items.append(resolved)
+                cut |= item_cut
+                reach |= item_reach
+            return items, cut, reach
+        if not isinstance(data, dict):
+            return data, frozenset(), frozenset()
+        if REF in data:
+            return self._resolve_ref(data[REF], stack)
+        resolved = {}
+        cut = reach = frozenset()
+        for key, value in data.items():
+            resolved[key], value_cut, value_reach = self._resolve(value, stack)
+            cut |= value_cut
+            reach |= value_reach
+        return resolved, cut, reach
+
+    def _resolve_ref(self, ref_path, stack):
+        memo = self._resolved.get(ref_path)
+        if memo is not None and not memo[1].intersection(stack):
+            return memo[0], frozenset(), memo[1]
+        if ref_path in stack:
+            return {REF: ref_path}, frozenset([ref_path]), frozenset()
+        resolved, cut, reach = self._resolve(self.component(ref_path), stack + (ref_path,))
+        cut = cut - {ref_path}
+        reach = reach | {ref_path}
+        if not cut:
+            self._resolved[ref_path] = (resolved, reach)
+        return resolved, cut, reach
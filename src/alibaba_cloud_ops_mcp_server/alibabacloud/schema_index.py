@@ -0,0 +1,138 @@
+"""
+Compact index of the tool schemas of the dynamic API tools.
+
+For every (service, api) the index keeps only what is needed to declare the tool: the summary and the
+name, type, description, example and required flag of each top-level parameter. The server can register
+the tools from the index without downloading any API meta; the full meta is loaded on first invocation.
+
+The index is read from the copy bundled with the package and from ``<meta_cache_dir>/tool_schema_index.json``,
+which is updated with the APIs resolved at runtime together with per-tool call counts.
+"""
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from importlib import resources
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.meta_store import MetaDiskStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_INDEX_FILE = 'tool_schema_index.json'
+SCHEMA_INDEX_FORMAT = 1
+SCHEMA_INDEX_KEYS = (FORMAT, APIS, USAGE) = ('format', 'apis', 'usage')
+PARAMETER_SCHEMA_KEYS = ('type', 'description', 'example', 'required')
+
+
+def compact_api_meta(api_meta: dict) -> dict:
+    """Strip ``api_meta`` down to the fields read by the tool schema builder."""
+    parameters = []
+    for parameter in api_meta.get('parameters', []):
+        name = parameter.get('name')
+        # 带'.'的参数不会生成工具参数
+        if not name or '.' in name:
+            continue
+        schema = parameter.get('schema') or {}
+        parameters.append({
+            'name': name,
+            'schema': {key: schema[key] for key in PARAMETER_SCHEMA_KEYS if key in schema},
+        })
+    return {'summary': api_meta.get('summary', ''), 'parameters': parameters}
+
+
+def _key(service: str, api: str) -> str:
+    return f'{service.lower()}/{api}'
+
+
+class ToolSchemaIndex:
+    """Thread-safe mapping of ``service/api`` to compact API meta, plus per-tool call counts."""
+
+    def __init__(self, apis=None, usage=None):
+        self._apis = dict(apis or {})
+        self._usage = Counter(usage or {})
+        self._lock = threading.Lock()
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            logger.warning(f'Failed to load tool schema index {path}: {e}')
+            return cls()
+        if data.get(FORMAT) != SCHEMA_INDEX_FORMAT:
+            logger.warning(f'Unsupported tool schema index format in {path}: {data.get(FORMAT)}')
+            return cls()
+        return cls(data.get(APIS), data.get(USAGE))
+
+    def save(self, path):
+        with self._lock:
+            data = {FORMAT: SCHEMA_INDEX_FORMAT, APIS: dict(self._apis), USAGE: dict(self._usage)}
+            self.dirty = False
+        MetaDiskStore._atomic_write(os.path.abspath(os.path.expanduser(path)), data)
+
+    def merge(self, other):
+        with self._lock:
+            self._apis.update(other._apis)
+            self._usage.update(other._usage)
+
+    def get(self, service: str, api: str):
+        return self._apis.get(_key(service, api))
+
+    def put(self, service: str, api: str, api_meta: dict):
+        compact = compact_api_meta(api_meta)
+        with self._lock:
+            self._apis[_key(service, api)] = compact
+            self.dirty = True
+        return compact
+
+    def record_call(self, service: str, api: str):
+        with self._lock:
+            self._usage[_key(service, api)] += 1
+            self.dirty = True
+
+    def most_used(self, api_list, limit: int):
+        """The ``limit`` most called APIs of ``api_list`` ((service, api) pairs), most called first."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            ranked = [(self._usage[_key(service, api)], (service, api)) for service, api in api_list]
+        ranked = [item for item in ranked if item[0] > 0]
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [item for _, item in ranked[:limit]]
+
+    def __len__(self):
+        return len(self._apis)
+
+    def __contains__(self, item):
+        service, api = item
+        return _key(service, api) in self._apis
+
+
+def cache_index_path(cache_dir):
+    return os.path.join(os.path.expanduser(cache_dir), SCHEMA_INDEX_FILE) if cache_dir else None
+
+
+def load_schema_index(cache_dir=None) -> ToolSchemaIndex:
+    """Load the bundled index, overlaid with the one kept in ``cache_dir`` if any."""
+    index = ToolSchemaIndex()
+    try:
+        with resources.as_file(resources.files('alibaba_cloud_ops_mcp_server.alibabacloud.static')
+                               .joinpath(SCHEMA_INDEX_FILE)) as path:
+            if os.path.exists(path):
+                index = ToolSchemaIndex.load(path)
+            else:
+                # The index is generated together with the meta snapshot when the wheel is built (hatch_build.py)
+                logger.warning('No bundled tool schema index, the package was built without access to the meta '
+                               'API: the API meta of the tools missing from the cache directory index is fetched '
+                               'at startup')
+    except Exception as e:
+        logger.warning(f'Failed to load bundled tool schema index: {e}')
+    path = cache_index_path(cache_dir)
+    if path and os.path.exists(path):
+        index.merge(ToolSchemaIndex.load(path))
+    return index
@@ -0,0 +1,146 @@
+"""
+Read-only API meta snapshot shared by the worker processes of the multi-worker server mode.
+
+The parent process resolves the documents once and writes them to an uncompressed file::
+
+    MAGIC | index length (8 bytes, big endian) | index JSON {path: [offset, length]} | document JSON ...
+
+Each worker memory-maps the file and decodes a document only when ApiMetaClient asks for it, so the pages
+of the file are shared through the OS page cache instead of every worker keeping a private decoded copy,
+and only the parent talks to the meta endpoint.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Mapping
+
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'OPSMETA1'
+_LENGTH = struct.Struct('>Q')
+
+_shared = None
+# 映射失败的快照路径，不再重试
+_failed_path = None
+_shared_lock = threading.Lock()
+
+
+def write_shared_snapshot(path, documents):
+    """Write ``documents`` (relative meta path -> document) to ``path``, atomically."""
+    blobs = [(relative_path, json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+             for relative_path, document in sorted(documents.items())]
+    index, offset = {}, 0
+    for relative_path, blob in blobs:
+        index[relative_path] = [offset, len(blob)]
+        offset += len(blob)
+    index_blob = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(index_blob)))
+            f.write(index_blob)
+            for _, blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+class SharedSnapshot(Mapping):
+    """Relative meta path -> document, decoded on access from a read-only memory map of the snapshot file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f'Not a shared meta snapshot: {path}')
+            start = len(MAGIC) + _LENGTH.size
+            (index_length,) = _LENGTH.unpack(self._map[len(MAGIC):start])
+            self._index = json.loads(self._map[start:start + index_length].decode('utf-8'))
+            self._base = start + index_length
+        except BaseException:
+            self._map.close()
+            raise
+
+    def __getitem__(self, relative_path):
+        offset, length = self._index[relative_path]
+        start = self._base + offset
+        return json.loads(self._map[start:start + length].decode('utf-8'))
+
+    def __contains__(self, relative_path):
+        return relative_path in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def size(self):
+        return len(self._map)
+
+    def close(self):
+        self._map.close()
+
+
+def get_shared_documents():
+    """The shared snapshot of settings.meta_shared_snapshot, or None when there is none."""
+    global _shared, _failed_path
+    path = settings.meta_shared_snapshot
+    if not path or path == _failed_path:
+        return None
+    if _shared is None or _shared.path != path:
+        with _shared_lock:
+            if path == _failed_path:
+                return None
+            if _shared is None or _shared.path != path:
+                try:
+                    _shared = SharedSnapshot(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f'Failed to map shared meta snapshot {path}, '
+                                   f'resolving the API meta without it: {e}')
+                    _failed_path = path
+                    return None
+    return _shared
+
+
+def reset_shared_documents():
+    global _shared, _failed_path
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = None
+        _failed_path = None
+
+
+class _ApiMetaSource:
+    """Resolves meta paths the way ApiMetaClient does: snapshots, the persistent cache, then the meta endpoint."""
+
+    def get(self, relative_path):
+        from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+        return ApiMetaClient.fetch_document(relative_path)
+
+
+def build_shared_snapshot(path, services, apis_by_service):
+    """Resolve the documents needed for ``services`` and ``apis_by_service`` and write them to ``path``."""
+    from alibaba_cloud_ops_mcp_server.alibabacloud.snapshot import build_snapshot_documents
+    documents = build_snapshot_documents(services, apis_by_service, _ApiMetaSource())
+    write_shared_snapshot(path, documents)
+    return len(documents)
@@ -0,0 +1,268 @@
+"""
+Offline snapshot of the API meta documents.
+
+The snapshot is a gzip compressed JSON file that maps the relative paths used by the meta endpoint
+(e.g. ``products/Ecs/versions/2014-05-26/overview.json``) to the documents themselves, so that
+ApiMetaClient can resolve the bundled services without any network access.
+
+Regenerate it with::
+
+    alibaba-cloud-ops-mcp-snapshot                      # from https://api.aliyun.com/meta/v1
+    alibaba-cloud-ops-mcp-snapshot --source ./mirror    # from a local mirror / meta cache directory
+
+Unless ``--output`` points elsewhere, the tool schema index used by the lazy tool registration mode is
+regenerated from the new snapshot as well.
+"""
+import gzip
+import json
+import logging
+import os
+import threading
+import calendar
+import time
+from importlib import resources
+
+import click
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = 'meta_snapshot.json.gz'
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_KEYS = (FORMAT, CREATED_AT, DOCUMENTS) = ('format', 'created_at', 'documents')
+
+_bundled_documents = None
+# Wall-clock creation time of the bundled snapshot, None when unknown
+_bundled_created_at = None
+_bundled_lock = threading.Lock()
+
+
+def _bundled_snapshot_path():
+    return resources.files('alibaba_cloud_ops_mcp_server.alibabacloud.static').joinpath(SNAPSHOT_FILE)
+
+
+def _load_snapshot(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get(FORMAT) != SNAPSHOT_FORMAT:
+        raise ValueError(f'Unsupported meta snapshot format: {snapshot.get(FORMAT)}')
+    return snapshot
+
+
+def read_snapshot(path):
+    return _load_snapshot(path).get(DOCUMENTS, {})
+
+
+def _parse_created_at(value):
+    try:
+        return calendar.timegm(time.strptime(value, '%Y-%m-%dT%H:%M:%SZ'))
+    except (TypeError, ValueError):
+        return None
+
+
+def write_snapshot(path, documents):
+    snapshot = {
+        FORMAT: SNAPSHOT_FORMAT,
+        CREATED_AT: time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        DOCUMENTS: documents,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # mtime=0 keeps the output byte-for-byte reproducible for identical documents
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(json.dumps(snapshot, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+
+
+def get_bundled_documents():
+    """Return the documents of the snapshot shipped with the package, or an empty dict if there is none."""
+    global _bundled_documents, _bundled_created_at
+    if _bundled_documents is None:
+        with _bundled_lock:
+            if _bundled_documents is None:
+                documents, created_at = {}, None
+                try:
+                    with resources.as_file(_bundled_snapshot_path()) as path:
+                        if os.path.exists(path):
+                            snapshot = _load_snapshot(path)
+                            documents = snapshot.get(DOCUMENTS, {})
+                            created_at = _parse_created_at(snapshot.get(CREATED_AT))
+                except Exception as e:
+                    logger.warning(f'Failed to load bundled meta snapshot: {e}')
+                _bundled_created_at = created_at
+                _bundled_documents = documents
+    return _bundled_documents
+
+
+def bundled_snapshot_expired(max_age):
+    """
+    Whether the bundled snapshot is older than ``max_age`` seconds, in which case its documents are only used
+    when the persistent cache and the meta endpoint cannot provide a newer copy. A ``max_age`` of 0, or a
+    snapshot without a creation time, never expires.
+    """
+    if not max_age:
+        return False
+    get_bundled_documents()
+    created_at = _bundled_created_at
+    return created_at is not None and time.time() - created_at >= max_age
+
+
+def reset_bundled_documents():
+    global _bundled_documents, _bundled_created_at
+    with _bundled_lock:
+        _bundled_documents = None
+        _bundled_created_at = None
+
+
+class _MetaSource:
+    """Reads meta documents either from the live meta endpoint or from a local mirror directory."""
+
+    def __init__(self, mirror_dir=None):
+        self.mirror_dir = mirror_dir
+
+    def get(self, relative_path):
+        if self.mirror_dir:
+            with open(os.path.join(self.mirror_dir, relative_path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+        response = ApiMetaClient.http_get(f'{ApiMetaClient.BASE_URL}/{relative_path}')
+        response.raise_for_status()
+        return response.json()
+
+
+def build_snapshot_documents(services, apis_by_service, source):
+    """
+    Collect the documents ApiMetaClient needs for ``services``: the product list, plus the overview and the
+    GetAPIDocs document of each service's default version. For services without an API docs document the
+    api.json of every API listed in ``apis_by_service`` is collected instead.
+    """
+    from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient, CODE, DEFAULT_VERSION, APIS
+
+    def path_of(pop_api_name, **kwargs):
+        return ApiMetaClient.config[pop_api_name][ApiMetaClient.PATH].format(**kwargs)
+
+    documents = {}
+    products_path = path_of(ApiMetaClient.GET_PRODUCT_LIST)
+    products = source.get(products_path)
+    documents[products_path] = products
+    products_by_code = {item.get(CODE).lower(): item for item in products if item.get(CODE)}
+
+    wanted = {service.lower(): set() for service in services}
+    for service, apis in apis_by_service.items():
+        wanted.setdefault(service.lower(), set()).update(apis)
+
+    for service, apis in sorted(wanted.items()):
+        product = products_by_code.get(service)
+        if product is None:
+            logger.warning(f'Service {service} not found in product list, skipped')
+            continue
+        code, version = product.get(CODE), product.get(DEFAULT_VERSION)
+        overview_path = path_of(ApiMetaClient.GET_API_OVERVIEW, service=code, version=version)
+        overview = source.get(overview_path)
+        documents[overview_path] = overview
+
+        api_docs_path = path_of(ApiMetaClient.GET_APIDOCS, service=code, version=version)
+        try:
+            api_docs = source.get(api_docs_path)
+        except Exception as e:
+            logger.warning(f'API docs of {code} unavailable, collecting api.json per API: {e}')
+            api_docs = {}
+        if isinstance(api_docs.get(APIS), dict):
+            documents[api_docs_path] = api_docs
+            continue
+        # An empty document tells ApiMetaClient that GetAPIDocs is unavailable without asking the network
+        documents[api_docs_path] = {}
+
+        api_names = {name.lower(): name for name in overview.get(APIS, {})}
+        for api in sorted(apis):
+            api_standard = api_names.get(api.lower())
+            if api_standard is None:
+                logger.warning(f'API {api} not found in service {code}, skipped')
+                continue
+            api_path = path_of(ApiMetaClient.GET_API_INFO, service=code, version=version, api=api_standard)
+            documents[api_path] = source.get(api_path)
+    return documents
+
+
+def build_schema_index(apis_by_service, documents):
+    """
+    Resolve the compact tool schemas of ``apis_by_service`` from ``documents`` through ApiMetaClient, as if
+    ``documents`` were the bundled snapshot.
+    """
+    global _bundled_documents, _bundled_created_at
+    from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+    from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import ToolSchemaIndex
+
+    index = ToolSchemaIndex()
+    with _bundled_lock:
+        previous = _bundled_documents, _bundled_created_at
+        _bundled_documents, _bundled_created_at = documents, time.time()
+    try:
+        ApiMetaClient.invalidate_cache()
+        for service, apis in apis_by_service.items():
+            for api in apis:
+                try:
+                    api_meta, _ = ApiMetaClient.get_api_meta(service, api)
+                except Exception as e:
+                    logger.warning(f'Tool schema of {service} {api} unavailable, skipped: {e}')
+                    continue
+                index.put(service, api, api_meta)
+    finally:
+        with _bundled_lock:
+            _bundled_documents, _bundled_created_at = previous
+        ApiMetaClient.invalidate_cache()
+    return index
+
+
+@click.command()
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Snapshot file to write (default: the snapshot bundled with the package)",
+)
+@click.option(
+    "--source",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Local mirror directory laid out like the meta endpoint (default: fetch from the live meta API)",
+)
+@click.option(
+    "--services",
+    type=str,
+    default=None,
+    help="Comma-separated list of services to include (default: all supported services)",
+)
+@click.option(
+    "--schema-index",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Tool schema index file to write (default: the bundled index when --output is not given)",
+)
+def main(output: str, source: str, services: str, schema_index: str):
+    """Build the offline API meta snapshot."""
+    from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import SCHEMA_INDEX_FILE
+    from alibaba_cloud_ops_mcp_server.config import config
+    from alibaba_cloud_ops_mcp_server.server import SUPPORTED_SERVICES_MAP
+
+    if services:
+        service_list = [s.strip().lower() for s in services.split(",") if s.strip()]
+    else:
+        service_list = list(SUPPORTED_SERVICES_MAP)
+    if output is None:
+        with resources.as_file(_bundled_snapshot_path()) as path:
+            output = str(path)
+        if schema_index is None:
+            schema_index = os.path.join(os.path.dirname(output), SCHEMA_INDEX_FILE)
+
+    start = time.perf_counter()
+    documents = build_snapshot_documents(service_list, config, _MetaSource(source))
+    write_snapshot(output, documents)
+    click.echo(f'Wrote {len(documents)} documents to {output} '
+               f'({os.path.getsize(output)} bytes) in {time.perf_counter() - start:.2f}s')
+    if schema_index:
+        apis_by_service = {service: apis for service, apis in config.items() if service.lower() in service_list}
+        index = build_schema_index(apis_by_service, documents)
+        index.save(schema_index)
+        click.echo(f'Wrote {len(index)} tool schemas to {schema_index}')
+
+
+if __name__ == "__main__":
+    main()
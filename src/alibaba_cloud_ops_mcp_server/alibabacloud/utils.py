@@ -1,14 +1,62 @@
+import contextlib
+import contextvars
 import logging
+import threading
 
 from alibabacloud_credentials.client import Client as CredClient
 from alibabacloud_tea_openapi.models import Config
 from fastmcp.server.dependencies import get_http_request
+from alibaba_cloud_ops_mcp_server.alibabacloud.credentials import CachedCredentialsProvider
 from alibaba_cloud_ops_mcp_server.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_credential_client = None
+_credential_lock = threading.Lock()
+# 当前工具调用已解析的请求头凭证，避免同一次调用重复解析请求头
+_request_credentials = contextvars.ContextVar('request_credentials')
+
+
+def get_credential_client() -> CredClient:
+    """
+    Process-wide credentials client of the default credential chain, resolved once and refreshed ahead of expiry.
+    """
+    global _credential_client
+    if _credential_client is None:
+        with _credential_lock:
+            if _credential_client is None:
+                _credential_client = CredClient(provider=CachedCredentialsProvider())
+    return _credential_client
+
+
+def get_credential_stats():
+    client = _credential_client
+    if client is None:
+        return None
+    return client.cloud_credential.provider.stats()
+
+
+def reset_credential_client():
+    global _credential_client
+    with _credential_lock:
+        _credential_client = None
+
+
+@contextlib.contextmanager
+def request_credentials(credentials):
+    """Use ``credentials`` as the credentials of the request headers for the rest of the current call."""
+    token = _request_credentials.set(credentials)
+    try:
+        yield credentials
+    finally:
+        _request_credentials.reset(token)
+
 
 def get_credentials_from_header():
+    try:
+        return _request_credentials.get()
+    except LookupError:
+        pass
     credentials = None
     try:
         request = get_http_request()
@@ -24,6 +72,9 @@ def get_credentials_from_header():
                 'SecurityToken': token
             }
 
+    except RuntimeError:
+        # 没有 HTTP 请求（如 stdio 模式），使用服务自身的凭证
+        pass
     except Exception as e:
         logger.info(f'get_credentials_from_header error: {e}')
     return credentials
@@ -44,8 +95,7 @@ def create_config():
     elif settings.headers_credential_only:
         config = Config()
     else:
-        credentials_client = CredClient()
-        config = Config(credential=credentials_client)
+        config = Config(credential=get_credential_client())
 
     config.user_agent = 'alibaba-cloud-ops-mcp-server'
     return config
@@ -0,0 +1,157 @@
+"""
+Preload the API meta cache: the product list, the overview of every service and the API meta of every API
+in ``config.py``. With a meta cache directory the documents are written to disk as well, so that later
+processes start warm.
+
+Run it standalone with::
+
+    alibaba-cloud-ops-mcp-warm-cache --cache-dir ~/.cache/alibaba-cloud-ops-mcp --services ecs,vpc
+
+or pass ``--warm-cache true`` to the server.
+"""
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _run_all(fn, items, concurrency):
+    """Call ``fn`` on every item of ``items`` concurrently, returning the items that failed."""
+
+    def run(item):
+        try:
+            fn(*item)
+            return None
+        except Exception as e:
+            logger.warning(f'Failed to warm up API meta of {" ".join(item)}: {e}')
+            return '.'.join(item)
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items))),
+                            thread_name_prefix='api-meta-warmup') as executor:
+        return [failed for failed in executor.map(run, items) if failed is not None]
+
+
+def warm_up_meta_cache(services, apis_by_service, concurrency: int = None) -> dict:
+    """
+    Load the product list, the overviews of ``services`` and of the services of ``apis_by_service``, and the
+    API meta of every API in ``apis_by_service`` through ApiMetaClient, so that they end up in its caches.
+    Failures are logged and reported, never raised.
+    """
+    if concurrency is None:
+        concurrency = settings.meta_warmup_concurrency
+    start = time.perf_counter()
+    report = {'services': 0, 'apis': 0, 'failed': []}
+
+    stage = time.perf_counter()
+    try:
+        product_index = ApiMetaClient.get_product_index()
+    except Exception as e:
+        logger.warning(f'Failed to warm up product list: {e}')
+        report['failed'].append('products')
+        product_index = {}
+    report['products_seconds'] = time.perf_counter() - stage
+
+    service_list = sorted({service.lower() for service in services} |
+                          {service.lower() for service in apis_by_service})
+    known = [(service,) for service in service_list if service in product_index]
+    report['failed'].extend(service for service in service_list if service not in product_index)
+    stage = time.perf_counter()
+    # get_api_index loads the overview under the canonical service code, the key the runtime lookups use
+    report['failed'].extend(_run_all(ApiMetaClient.get_api_index, known, concurrency))
+    report['overviews_seconds'] = time.perf_counter() - stage
+    report['services'] = len(known)
+
+    api_list = [(service, api) for service, apis in apis_by_service.items()
+                if service.lower() in product_index for api in apis]
+    stage = time.perf_counter()
+    report['failed'].extend(_run_all(ApiMetaClient.get_api_meta, api_list, concurrency))
+    report['apis_seconds'] = time.perf_counter() - stage
+    report['apis'] = len(api_list)
+
+    report['seconds'] = time.perf_counter() - start
+    return report
+
+
+class Readiness:
+    """Readiness of the server, reported as not ready until the meta cache warmup has finished."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.report = None
+
+    def set_ready(self, report=None):
+        self.report = report
+        self._event.set()
+
+    def is_ready(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        return self._event.wait(timeout)
+
+    def warm_up_in_background(self, services, apis_by_service, build_tools=None):
+        """
+        Warm up the meta cache on a background thread, then call ``build_tools`` (e.g. to register the API tools
+        and warm their call plans) and report ready. A failed warmup is not fatal, a failed ``build_tools`` keeps
+        the server not ready.
+        """
+        def run():
+            report = None
+            try:
+                report = warm_up_meta_cache(services, apis_by_service)
+                logger.info(f'API meta cache warmup: {report}')
+            except Exception as e:
+                logger.error(f'API meta cache warmup failed: {e}')
+            if build_tools is not None:
+                try:
+                    tools_report = build_tools()
+                except Exception as e:
+                    logger.error(f'Failed to build the API tools, the server stays not ready: {e}')
+                    return
+                if report is not None:
+                    report['tools'] = tools_report
+            self.set_ready(report)
+
+        thread = threading.Thread(target=run, name='api-meta-warmup', daemon=True)
+        thread.start()
+        return thread
+
+
+@click.command()
+@click.option(
+    "--services",
+    type=str,
+    default=None,
+    help="Comma-separated list of services to warm up in addition to those in config.py",
+)
+@click.option(
+    "--cache-dir",
+    type=str,
+    default=None,
+    help="Directory for the persistent API meta cache (default: META_CACHE_DIR)",
+)
+def main(services: str, cache_dir: str):
+    """Preload the API meta cache."""
+    from alibaba_cloud_ops_mcp_server.config import config
+
+    if cache_dir:
+        settings.meta_cache_dir = cache_dir
+    if not settings.meta_cache_dir:
+        click.echo('No cache directory given, the warmed documents only live as long as this process')
+    service_list = [s.strip().lower() for s in services.split(",") if s.strip()] if services else []
+    report = warm_up_meta_cache(service_list, config)
+    click.echo(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ import logging
 from alibaba_cloud_ops_mcp_server.tools.common_api_tools import set_custom_service_list
 from alibaba_cloud_ops_mcp_server.config import config
 from alibaba_cloud_ops_mcp_server.tools import cms_tools, oos_tools, oss_tools, api_tools, common_api_tools, lbs_tools, ecs_tools
+from alibaba_cloud_ops_mcp_server.alibabacloud.warmup import Readiness, warm_up_meta_cache
+from alibaba_cloud_ops_mcp_server.alibabacloud.limits import limited, reset_tool_limiter
 from alibaba_cloud_ops_mcp_server.settings import settings
+from alibaba_cloud_ops_mcp_server.workers import prepare_shared_snapshot, run_workers
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,23 @@ SUPPORTED_SERVICES_MAP = {
 }
 
 
+def register_readiness_routes(mcp: FastMCP, readiness: Readiness):
+    """Liveness and readiness endpoints for load balancers in the HTTP transports."""
+    from starlette.responses import JSONResponse
+
+    @mcp.custom_route("/healthz", methods=["GET"], include_in_schema=False)
+    async def healthz(request):
+        return JSONResponse({"status": "ok"})
+
+    @mcp.custom_route("/ready", methods=["GET"], include_in_schema=False)
+    async def ready(request):
+        if not readiness.is_ready():
+            return JSONResponse({"status": "warming"}, status_code=503)
+        return JSONResponse({"status": "ready", "warmup": readiness.report})
+
+    return healthz, ready
+
+
 @click.command()
 @click.option(
     "--transport",
@@ -61,7 +81,47 @@ SUPPORTED_SERVICES_MAP = {
     default="domestic",
     help="Environment type: 'domestic' for domestic, 'international' for overseas (default: domestic)",
 )
-def main(transport: str, port: int, host: str, services: str, headers_credential_only: bool, env: str):
+@click.option(
+    "--cache-dir",
+    type=str,
+    default=None,
+    help="Directory for the persistent API meta cache (default: disabled)",
+)
+@click.option(
+    "--lazy-tools",
+    type=bool,
+    default=False,
+    help="Whether to declare API tools from the tool schema index and load their API meta on first call",
+)
+@click.option(
+    "--warm-cache",
+    type=bool,
+    default=False,
+    help="Whether to preload the API meta of the services and config.py APIs; HTTP servers report not ready until done",
+)
+@click.option(
+    "--max-concurrency",
+    type=int,
+    default=None,
+    help="Maximum number of tool calls running at once, 0 for no limit (default: 64)",
+)
+@click.option(
+    "--max-concurrency-per-tenant",
+    type=int,
+    default=None,
+    help="Maximum number of tool calls running at once per AccessKey of the request headers, 0 for no limit (default: 16)",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of worker processes serving the HTTP transports on the same port (default: 1)",
+)
+def main(transport: str, port: int, host: str, services: str, headers_credential_only: bool, env: str,
+         cache_dir: str = None, lazy_tools: bool = False, warm_cache: bool = False, max_concurrency: int = None,
+         max_concurrency_per_tenant: int = None, workers: int = 1):
+    if workers > 1 and transport == "stdio":
+        raise click.UsageError("--workers requires the sse or streamable-http transport")
     # Create an MCP server
     mcp = FastMCP(
         name="alibaba-cloud-ops-mcp-server",
@@ -73,28 +133,61 @@ def main(transport: str, port: int, host: str, services: str, headers_credential
         settings.headers_credential_only = headers_credential_only
     if env:
         settings.env = env
+    if cache_dir:
+        settings.meta_cache_dir = cache_dir
+    if lazy_tools:
+        settings.lazy_tools = lazy_tools
+    if max_concurrency is not None:
+        settings.tool_max_concurrency = max_concurrency
+    if max_concurrency_per_tenant is not None:
+        settings.tool_max_concurrency_per_tenant = max_concurrency_per_tenant
+    reset_tool_limiter()
+    service_keys = []
     if services:
         service_keys = [s.strip().lower() for s in services.split(",")]
         service_list = [(key, SUPPORTED_SERVICES_MAP.get(key, key)) for key in service_keys]
         set_custom_service_list(service_list)
         for tool in common_api_tools.tools:
-            mcp.tool(tool)
+            mcp.tool(limited(tool))
+    snapshot_path = None
+    if workers > 1:
+        # 由父进程一次性解析元数据，各 worker 只读映射同一份快照
+        snapshot_path = prepare_shared_snapshot(service_keys, config, cache_dir)
     for tool in oos_tools.tools:
-        mcp.tool(tool)
+        mcp.tool(limited(tool))
     for tool in cms_tools.tools:
-        mcp.tool(tool)
+        mcp.tool(limited(tool))
     for tool in oss_tools.tools:
-        mcp.tool(tool)
+        mcp.tool(limited(tool))
     for tool in lbs_tools.tools:
-        mcp.tool(tool)
+        mcp.tool(limited(tool))
     for tool in ecs_tools.tools:
-        mcp.tool(tool)
-    
-    api_tools.create_api_tools(mcp, config)
+        mcp.tool(limited(tool))
+
+    readiness = Readiness()
+    if transport != "stdio":
+        register_readiness_routes(mcp, readiness)
+    if warm_cache and transport == "stdio":
+        logger.info(f'API meta cache warmup: {warm_up_meta_cache(service_keys, config)}')
+    worker_init = None
+    if warm_cache and transport != "stdio" and workers <= 1:
+        # 工具注册及调用计划预热都在后台完成，完成前 /ready 返回 503
+        readiness.warm_up_in_background(service_keys, config, lambda: api_tools.create_api_tools(mcp, config))
+    else:
+        api_tools.create_api_tools(mcp, config)
+        if workers > 1 and snapshot_path is None:
+            # 共享快照不可用时各 worker 自行预热，预热完成后才报告就绪
+            def worker_init():
+                readiness.warm_up_in_background(service_keys, config)
+        else:
+            readiness.set_ready()
 
     # Initialize and run the server
     logger.debug(f'mcp server is running on {transport} mode.')
-    mcp.run(transport=transport)
+    if workers > 1:
+        run_workers(mcp, transport, host, port, workers, snapshot_path, worker_init)
+    else:
+        mcp.run(transport=transport)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,73 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     headers_credential_only: bool = False
     env: str = "domestic"
+    # In-process cache for documents fetched from the API meta endpoint
+    meta_cache_ttl: int = 3600
+    meta_cache_maxsize: int = 1024
+    # Keep cached documents in a memory-compact form (interned keys, slotted records, lazily decoded API meta)
+    meta_compact: bool = True
+    # Directory of the persistent meta cache, disabled when empty
+    meta_cache_dir: Optional[str] = None
+    # Serve documents contained in the bundled offline snapshot without network access
+    meta_use_snapshot: bool = True
+    # Age in seconds after which the persistent cache and the meta endpoint take precedence over the bundled
+    # snapshot, which is then only served when neither is available (0: always prefer the snapshot)
+    meta_snapshot_max_age: int = 7 * 24 * 3600
+    # Read-only memory-mapped snapshot written by the parent process of the multi-worker mode
+    meta_shared_snapshot: Optional[str] = None
+    # Load the API meta of a whole service with one GetAPIDocs request instead of one GetApiInfo per API
+    meta_use_api_docs: bool = True
+    # Pooled HTTP session used to reach the meta endpoint
+    meta_http_pool_size: int = 10
+    meta_http_connect_timeout: float = 3.0
+    meta_http_read_timeout: float = 10.0
+    meta_http_max_retries: int = 3
+    meta_http_backoff_factor: float = 0.3
+    # Number of threads resolving API meta concurrently before the API tools are registered, 1 disables it
+    meta_warmup_concurrency: int = 16
+    # Temporary credentials of the default credential chain are refreshed credential_refresh_ahead seconds before
+    # they expire; credential_sts_ttl is assumed when the provider does not report an expiry
+    credential_sts_ttl: int = 3600
+    credential_refresh_ahead: int = 300
+    # Pool of SDK clients keyed by endpoint and credential, entries expire after client_pool_idle_ttl idle seconds
+    client_pool_maxsize: int = 256
+    client_pool_idle_ttl: int = 600
+    # Tool calls running at once, in total and per AccessKey of the request headers (0 disables a limit); further
+    # calls wait in a queue of tool_max_queue calls for at most tool_queue_timeout seconds before being rejected
+    tool_max_concurrency: int = 64
+    tool_max_concurrency_per_tenant: int = 16
+    tool_max_queue: int = 256
+    tool_queue_timeout: float = 30.0
+    # Worker threads of the event loop's default executor, which runs synchronous tools and blocking lookups
+    tool_executor_workers: int = 32
+    # Status polls of OOS executions: oos_poll_fast_polls polls oos_poll_initial_interval seconds apart, then
+    # intervals growing by oos_poll_multiplier up to oos_poll_max_interval, each randomized by +/- oos_poll_jitter;
+    # waiting gives up after oos_poll_timeout seconds (0 waits forever)
+    oos_poll_initial_interval: float = 0.5
+    oos_poll_fast_polls: int = 4
+    oos_poll_multiplier: float = 1.5
+    oos_poll_max_interval: float = 15.0
+    oos_poll_jitter: float = 0.2
+    oos_poll_timeout: float = 1800.0
+    # Pages of 100 executions of the same template a batched status poll reads before querying the executions
+    # not found one by one; paging also stops once the pages read plus the executions not found yet reach the
+    # number of pending executions
+    oos_poll_max_pages: int = 5
+    # OOS tools split target resource lists longer than oos_max_targets_per_execution into several executions,
+    # running at most oos_fanout_concurrency of them at once (0 disables the split)
+    oos_max_targets_per_execution: int = 100
+    oos_fanout_concurrency: int = 5
+    # Size budget, in JSON characters, of the compact parameters returned by GetAPIInfo
+    api_info_max_chars: int = 8000
+    # Declare the API tools from the tool schema index and load their API meta on first invocation
+    lazy_tools: bool = False
+    # Number of most used API tools whose API meta is prefetched in the background in lazy mode
+    lazy_tools_prefetch: int = 20
 
 
 settings = Settings()
@@ -1,18 +1,27 @@
+import asyncio
 import os
 from mcp.server.fastmcp import FastMCP, Context
 from pydantic import Field
 import logging
 import json
 
+import atexit
 import inspect
+import threading
+import time
 import types
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import make_dataclass, field
 from alibabacloud_tea_openapi import models as open_api_models
 from alibabacloud_tea_util import models as util_models
 from alibabacloud_tea_openapi.client import Client as OpenApiClient
 from alibabacloud_openapi_util.client import Client as OpenApiUtilClient
 from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.alibabacloud.cache import TTLCache
+from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import cache_index_path, load_schema_index
 from alibaba_cloud_ops_mcp_server.alibabacloud.utils import create_config
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import get_client
+from alibaba_cloud_ops_mcp_server.alibabacloud.limits import limited
 from alibaba_cloud_ops_mcp_server.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -78,14 +87,19 @@ def _get_service_endpoint(service: str, region_id: str):
     return f'{service}.{region_id}.aliyuncs.com'
 
 
-def create_client(service: str, region_id: str) -> OpenApiClient:
-    config = create_config()
+def create_client(service: str, region_id: str, endpoint: str = None) -> OpenApiClient:
     if isinstance(service, str):
         service = service.lower()
-    endpoint = _get_service_endpoint(service, region_id.lower())
-    config.endpoint = endpoint
-    logger.info(f'Service Endpoint: {endpoint}')
-    return OpenApiClient(config)
+    if endpoint is None:
+        endpoint = _get_service_endpoint(service, region_id.lower())
+
+    def new_client():
+        config = create_config()
+        config.endpoint = endpoint
+        logger.info(f'Service Endpoint: {endpoint}')
+        return OpenApiClient(config)
+
+    return get_client('openapi', endpoint, new_client)
 
 
 # JSON array parameter of type String
@@ -97,40 +111,106 @@ ECS_LIST_PARAMETERS = {
 }
 
 
-def _tools_api_call(service: str, api: str, parameters: dict, ctx: Context):
-    service = service.lower()
-    api_meta, _ = ApiMetaClient.get_api_meta(service, api)
-    version = ApiMetaClient.get_service_version(service)
-    method = 'POST' if api_meta.get('methods', [])[0] == 'post' else 'GET'
-    path = api_meta.get('path', '/')
-    style = ApiMetaClient.get_service_style(service)
-    
-    # Handling special parameter formats
-    processed_parameters = parameters.copy()
-    processed_parameters = {k: v for k, v in processed_parameters.items() if v is not None}
-    if service == 'ecs':
+class ApiCallPlan:
+    """
+    Everything derived from API meta that is needed to call one API, compiled once per (service, api).
+    """
+    __slots__ = ('service', 'api', 'version', 'method', 'path', 'style', 'list_parameters', '_endpoints')
+
+    def __init__(self, service, api, version, method, path, style, list_parameters=frozenset()):
+        self.service = service
+        self.api = api
+        self.version = version
+        self.method = method
+        self.path = path
+        self.style = style
+        self.list_parameters = list_parameters
+        self._endpoints = {}
+
+    @classmethod
+    def compile(cls, service: str, api: str):
+        service = service.lower()
+        api_meta, version = ApiMetaClient.get_api_meta(service, api)
+        method = 'POST' if api_meta.get('methods', [])[0] == 'post' else 'GET'
+        path = api_meta.get('path', '/')
+        style = ApiMetaClient.get_service_style(service)
+        list_parameters = frozenset(ECS_LIST_PARAMETERS) if service == 'ecs' else frozenset()
+        return cls(service, api, version, method, path, style, list_parameters)
+
+    def serialize(self, parameters: dict) -> dict:
+        # Handling special parameter formats
+        processed_parameters = {}
         for param_name, param_value in parameters.items():
-            if param_name in ECS_LIST_PARAMETERS and isinstance(param_value, list):
-                processed_parameters[param_name] = json.dumps(param_value)
-    
+            if param_value is None:
+                continue
+            if param_name in self.list_parameters and isinstance(param_value, list):
+                param_value = json.dumps(param_value)
+            processed_parameters[param_name] = param_value
+        return processed_parameters
+
+    def build_params(self) -> open_api_models.Params:
+        return open_api_models.Params(
+            action=self.api,
+            version=self.version,
+            protocol='HTTPS',
+            pathname=self.path,
+            method=self.method,
+            auth_type='AK',
+            style=self.style,
+            req_body_type='formData',
+            body_type='json'
+        )
+
+    def endpoint(self, region_id: str) -> str:
+        key = (region_id.lower(), settings.env)
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = _get_service_endpoint(self.service, key[0])
+        return endpoint
+
+
+_call_plans = TTLCache(maxsize=settings.meta_cache_maxsize, ttl=settings.meta_cache_ttl)
+
+
+def get_call_plan(service: str, api: str) -> ApiCallPlan:
+    key = (service.lower(), api)
+    plan = _call_plans.get(key)
+    if plan is None:
+        plan = ApiCallPlan.compile(service, api)
+        _call_plans.set(key, plan)
+    return plan
+
+
+async def get_call_plan_async(service: str, api: str) -> ApiCallPlan:
+    """get_call_plan for the event loop: compiling a missing plan may fetch API meta, so it runs in a worker thread."""
+    plan = _call_plans.get((service.lower(), api))
+    if plan is not None:
+        return plan
+    return await asyncio.to_thread(get_call_plan, service, api)
+
+
+def clear_call_plans():
+    _call_plans.invalidate()
+
+
+# Tool schema index used by the lazy registration mode, None when the tools were registered eagerly
+_schema_index = None
+
+
+async def _tools_api_call(service: str, api: str, parameters: dict, ctx: Context):
+    if _schema_index is not None:
+        _schema_index.record_call(service, api)
+    plan = await get_call_plan_async(service, api)
+    processed_parameters = plan.serialize(parameters)
     req = open_api_models.OpenApiRequest(
         query=OpenApiUtilClient.query(processed_parameters)
     )
-    params = open_api_models.Params(
-        action=api,
-        version=version,
-        protocol='HTTPS',
-        pathname=path,
-        method=method,
-        auth_type='AK',
-        style=style,
-        req_body_type='formData',
-        body_type='json'
-    )
-    logger.info(f'Call API Request: Service: {service} API: {api} Method: {method} Parameters: {processed_parameters}')
-    client = create_client(service, processed_parameters.get('RegionId', 'cn-hangzhou'))
+    params = plan.build_params()
+    logger.info(f'Call API Request: Service: {plan.service} API: {api} Method: {plan.method} Parameters: {processed_parameters}')
+    region_id = processed_parameters.get('RegionId', 'cn-hangzhou')
+    client = create_client(plan.service, region_id, endpoint=plan.endpoint(region_id))
     runtime = util_models.RuntimeOptions()
-    resp = client.call_api(params, req, runtime)
+    resp = await client.call_api_async(params, req, runtime)
     logger.info(f'Call API Response: {resp}')
     return resp
 
@@ -227,11 +307,11 @@ def _create_tool_function_with_signature(service: str, api: str, fields: dict, d
 
     signature = inspect.Signature(parameters)
     function_name = f'{service.upper()}_{api}'
-    def func_code(*args, **kwargs):
+    async def func_code(*args, **kwargs):
         bound_args = signature.bind(*args, **kwargs)
         bound_args.apply_defaults()
 
-        return _tools_api_call(
+        return await _tools_api_call(
             service=service,
             api=api,
             parameters=bound_args.arguments,
@@ -253,18 +333,134 @@ def _create_tool_function_with_signature(service: str, api: str, fields: dict, d
     return func
 
 
-def _create_and_decorate_tool(mcp: FastMCP, service: str, api: str):
-    """Create a tool function for an AlibabaCloud openapi."""
-    api_meta, _ = ApiMetaClient.get_api_meta(service, api)
+def _create_and_decorate_tool(mcp: FastMCP, service: str, api: str, api_meta: dict = None):
+    """Create a tool function for an AlibabaCloud openapi, declared from ``api_meta`` when it is given."""
+    if api_meta is None:
+        api_meta, _ = ApiMetaClient.get_api_meta(service, api)
     fields = _create_function_schemas(service, api, api_meta).get(api, {})
     description = api_meta.get('summary', '')
     dynamic_lambda = _create_tool_function_with_signature(service, api, fields, description)
     function_name = f'{service.upper()}_{api}'
-    decorated_function = mcp.tool(name=function_name)(dynamic_lambda)
+    decorated_function = mcp.tool(name=function_name)(limited(dynamic_lambda))
 
     return decorated_function
 
+
+def warm_up_call_plans(api_list, concurrency: int = None) -> dict:
+    """
+    Resolve the API meta and call plans of ``api_list`` ((service, api) pairs) concurrently, so that the
+    blocking metadata requests overlap instead of running one after another. Failures are logged and
+    reported, never raised.
+    """
+    if concurrency is None:
+        concurrency = settings.meta_warmup_concurrency
+
+    def warm_up(item):
+        service, api = item
+        start = time.perf_counter()
+        try:
+            get_call_plan(service, api)
+            return item, time.perf_counter() - start, None
+        except Exception as e:
+            return item, time.perf_counter() - start, e
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(api_list) or 1)),
+                            thread_name_prefix='api-meta-warmup') as executor:
+        results = list(executor.map(warm_up, api_list))
+    failed = []
+    for (service, api), _, error in results:
+        if error is not None:
+            logger.warning(f'Failed to warm up API meta of {service} {api}: {error}')
+            failed.append(f'{service}.{api}')
+    slowest = max(results, key=lambda result: result[1], default=None)
+    return {
+        'apis': len(api_list),
+        'failed': failed,
+        'seconds': time.perf_counter() - start,
+        'slowest': {'api': '.'.join(slowest[0]), 'seconds': slowest[1]} if slowest else None,
+    }
+
+
+def _save_schema_index():
+    path = cache_index_path(settings.meta_cache_dir)
+    if path and _schema_index is not None and _schema_index.dirty:
+        try:
+            _schema_index.save(path)
+        except OSError as e:
+            logger.warning(f'Failed to save tool schema index {path}: {e}')
+
+
+def start_prefetch(api_list, limit: int = None):
+    """
+    Load the call plans of the most used APIs of ``api_list`` on a background thread, so that their first
+    invocation does not wait for the meta endpoint.
+    """
+    if limit is None:
+        limit = settings.lazy_tools_prefetch
+    if _schema_index is None:
+        return None
+    prefetch_list = _schema_index.most_used(api_list, limit)
+    if not prefetch_list:
+        return None
+    thread = threading.Thread(
+        target=warm_up_call_plans,
+        args=(prefetch_list, max(1, settings.meta_warmup_concurrency)),
+        name='api-meta-prefetch',
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def create_lazy_api_tools(mcp: FastMCP, api_list) -> dict:
+    """
+    Register the API tools from the tool schema index. Only the APIs missing from the index have their meta
+    fetched now; the others load it on first invocation.
+    """
+    global _schema_index
+    start = time.perf_counter()
+    _schema_index = load_schema_index(settings.meta_cache_dir)
+    missing = []
+    for service_code, api_name in api_list:
+        api_meta = _schema_index.get(service_code, api_name)
+        if api_meta is None:
+            missing.append((service_code, api_name))
+            continue
+        _create_and_decorate_tool(mcp, service_code, api_name, api_meta=api_meta)
+    if missing:
+        logger.info(f'{len(missing)} API tools not found in tool schema index, fetching their API meta')
+        if settings.meta_warmup_concurrency > 1 and len(missing) > 1:
+            warm_up_call_plans(missing)
+        for service_code, api_name in missing:
+            api_meta, _ = ApiMetaClient.get_api_meta(service_code, api_name)
+            _create_and_decorate_tool(mcp, service_code, api_name,
+                                      api_meta=_schema_index.put(service_code, api_name, api_meta))
+    if settings.meta_cache_dir:
+        _save_schema_index()
+        atexit.register(_save_schema_index)
+    report = {
+        'apis': len(api_list),
+        'indexed': len(api_list) - len(missing),
+        'fetched': len(missing),
+        'seconds': time.perf_counter() - start,
+    }
+    logger.info(f'API tools startup (lazy): {report}')
+    start_prefetch(api_list)
+    return report
+
+
 def create_api_tools(mcp: FastMCP, config:dict):
-    for service_code, apis in config.items():
-        for api_name in apis:
-            _create_and_decorate_tool(mcp, service_code, api_name)
+    api_list = [(service_code, api_name) for service_code, apis in config.items() for api_name in apis]
+    if settings.lazy_tools:
+        return create_lazy_api_tools(mcp, api_list)
+    report = None
+    if settings.meta_warmup_concurrency > 1 and len(api_list) > 1:
+        report = warm_up_call_plans(api_list)
+    start = time.perf_counter()
+    for service_code, api_name in api_list:
+        _create_and_decorate_tool(mcp, service_code, api_name)
+    if report is not None:
+        report['register_seconds'] = time.perf_counter() - start
+        logger.info(f'API tools startup: {report}')
+    return report
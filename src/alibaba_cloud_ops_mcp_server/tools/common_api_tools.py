@@ -42,28 +42,40 @@ def PromptUnderstanding() -> str:
 
 @tools.append
 def ListAPIs(
-        service: str = Field(description='AlibabaCloud service code')
+        service: str = Field(description='AlibabaCloud service code'),
+        query: str = Field(description='Keywords describing the wanted API, e.g. "start instance" or "安全组规则". '
+                                       'When given, only the best matching APIs are returned, ranked by relevance',
+                           default=None),
+        limit: int = Field(description='Maximum number of APIs returned when query is given', default=20),
+        offset: int = Field(description='Number of ranked APIs to skip when query is given', default=0),
 ):
     """
-    Use PromptUnderstanding tool first to understand the user's query, Get the corresponding API list information through the service name to prepare for the subsequent selection of the appropriate API to call
+    Use PromptUnderstanding tool first to understand the user's query, Get the corresponding API list information through the service name to prepare for the subsequent selection of the appropriate API to call. Pass query to search the APIs by name, summary, tags and parameter names instead of listing all of them
     """
-    return ApiMetaClient.get_apis_in_service(service)
+    if not isinstance(query, str) or not query.strip():
+        return ApiMetaClient.get_apis_in_service(service)
+    return ApiMetaClient.search_apis(service, query, limit, offset)
 
 
 @tools.append
 def GetAPIInfo(
         service: str = Field(description='AlibabaCloud service code'),
         api: str = Field(description='AlibabaCloud api name'),
+        compact: bool = Field(description='Return only name, type, required, enum, a short description and the '
+                                          'resolved nested fields of each parameter. Recommended',
+                              default=False),
 ):
     """
     Use PromptUnderstanding tool first to understand the user's query, After specifying the service name and API name, get the detailed API META of the corresponding API
     """
+    if compact is True:
+        return ApiMetaClient.get_compact_api_parameters(service, api)
     data, version = ApiMetaClient.get_api_meta(service, api)
     return data.get('parameters')
 
 
 @tools.append
-def CommonAPICaller(
+async def CommonAPICaller(
         service: str = Field(description='AlibabaCloud service code'),
         api: str = Field(description='AlibabaCloud api name'),
         parameters: dict = Field(description='AlibabaCloud ECS instance ID List', default={}),
@@ -71,4 +83,4 @@ def CommonAPICaller(
     """
     Use PromptUnderstanding tool first to understand the user's query, Perform the actual call by specifying the Service, API, and Parameters
     """
-    return _tools_api_call(service, api, parameters, None)
+    return await _tools_api_call(service, api, parameters, None)
@@ -5,16 +5,22 @@ import json
 from alibabacloud_ecs20140526.client import Client as ecs20140526Client
 from alibabacloud_ecs20140526 import models as ecs_20140526_models
 from alibaba_cloud_ops_mcp_server.alibabacloud.utils import create_config
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import get_client
 
 tools = []
 
 def create_client(region_id: str) -> ecs20140526Client:
-    config = create_config()
-    config.endpoint = f'ecs.{region_id}.aliyuncs.com'
-    return ecs20140526Client(config)
+    endpoint = f'ecs.{region_id}.aliyuncs.com'
+
+    def new_client():
+        config = create_config()
+        config.endpoint = endpoint
+        return ecs20140526Client(config)
+
+    return get_client('ecs', endpoint, new_client)
 
 @tools.append
-def ECS_DescribeInstances(
+async def ECS_DescribeInstances(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     instance_ids: Optional[List[str]] = Field(description='实例ID列表，最多100个实例ID，使用JSON数组格式 (The IDs of instances. The value can be a JSON array that consists of up to 100 instance IDs)', default=None),
     instance_name: str = Field(description='实例名称 (The name of the instance)', default=None),
@@ -62,10 +68,10 @@ def ECS_DescribeInstances(
         params['zone_id'] = zone_id
 
     describe_instances_request = ecs_20140526_models.DescribeInstancesRequest(**params)
-    return client.describe_instances(describe_instances_request)
+    return await client.describe_instances_async(describe_instances_request)
 
 @tools.append
-def ECS_DescribeInstanceTypes(
+async def ECS_DescribeInstanceTypes(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     instance_type_family: str = Field(description='实例规格族 (The instance family)', default=None),
     instance_type: str = Field(description='实例规格类型 (The instance type)', default=None),
@@ -83,10 +89,10 @@ def ECS_DescribeInstanceTypes(
         params['cpu_architecture'] = cpu_architecture
 
     describe_instance_types_request = ecs_20140526_models.DescribeInstanceTypesRequest(**params)
-    return client.describe_instance_types(describe_instance_types_request)
+    return await client.describe_instance_types_async(describe_instance_types_request)
 
 @tools.append
-def ECS_DescribeImages(
+async def ECS_DescribeImages(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     image_id: str = Field(description='镜像ID (The ID of the image)', default=None),
     image_name: str = Field(description='镜像名称 (The name of the image)', default=None),
@@ -117,10 +123,10 @@ def ECS_DescribeImages(
         params['image_owner_alias'] = image_owner_alias
 
     describe_images_request = ecs_20140526_models.DescribeImagesRequest(**params)
-    return client.describe_images(describe_images_request)
+    return await client.describe_images_async(describe_images_request)
 
 @tools.append
-def ECS_DescribeInstanceStatus(
+async def ECS_DescribeInstanceStatus(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     zone_id: str = Field(description='可用区ID (The ID of the zone)', default=None),
     instance_id: Optional[List[str]] = Field(description='实例ID列表 (The IDs of instances)', default=None),
@@ -142,10 +148,10 @@ def ECS_DescribeInstanceStatus(
         params['instance_id'] = json.dumps(instance_id)
 
     describe_instance_status_request = ecs_20140526_models.DescribeInstanceStatusRequest(**params)
-    return client.describe_instance_status(describe_instance_status_request)
+    return await client.describe_instance_status_async(describe_instance_status_request)
 
 @tools.append
-def ECS_DescribeInstanceVncUrl(
+async def ECS_DescribeInstanceVncUrl(
     instance_id: str = Field(..., description='实例ID (The ID of the instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
@@ -156,10 +162,10 @@ def ECS_DescribeInstanceVncUrl(
         region_id=region_id,
         instance_id=instance_id
     )
-    return client.describe_instance_vnc_url(describe_instance_vnc_url_request)
+    return await client.describe_instance_vnc_url_async(describe_instance_vnc_url_request)
 
 @tools.append
-def ECS_DescribeInstanceAttribute(
+async def ECS_DescribeInstanceAttribute(
     instance_id: str = Field(..., description='实例ID (The ID of the instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
@@ -169,10 +175,10 @@ def ECS_DescribeInstanceAttribute(
     describe_instance_attribute_request = ecs_20140526_models.DescribeInstanceAttributeRequest(
         instance_id=instance_id
     )
-    return client.describe_instance_attribute(describe_instance_attribute_request)
+    return await client.describe_instance_attribute_async(describe_instance_attribute_request)
 
 @tools.append
-def ECS_DescribeDisks(
+async def ECS_DescribeDisks(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     disk_ids: Optional[List[str]] = Field(description='磁盘ID列表 (The IDs of disks)', default=None),
     instance_id: str = Field(description='实例ID (The ID of the instance)', default=None),
@@ -203,10 +209,10 @@ def ECS_DescribeDisks(
         params['status'] = status
 
     describe_disks_request = ecs_20140526_models.DescribeDisksRequest(**params)
-    return client.describe_disks(describe_disks_request)
+    return await client.describe_disks_async(describe_disks_request)
 
 @tools.append
-def ECS_DescribeSecurityGroups(
+async def ECS_DescribeSecurityGroups(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     security_group_ids: Optional[List[str]] = Field(description='安全组ID列表 (The IDs of security groups)', default=None),
     security_group_name: str = Field(description='安全组名称 (The name of the security group)', default=None),
@@ -231,10 +237,10 @@ def ECS_DescribeSecurityGroups(
         params['vpc_id'] = vpc_id
 
     describe_security_groups_request = ecs_20140526_models.DescribeSecurityGroupsRequest(**params)
-    return client.describe_security_groups(describe_security_groups_request)
+    return await client.describe_security_groups_async(describe_security_groups_request)
 
 @tools.append
-def ECS_DescribeVpcs(
+async def ECS_DescribeVpcs(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     vpc_id: str = Field(description='专有网络VPC ID (The ID of the virtual private cloud)', default=None),
     vpc_name: str = Field(description='专有网络VPC名称 (The name of the virtual private cloud)', default=None),
@@ -256,10 +262,10 @@ def ECS_DescribeVpcs(
         params['vpc_name'] = vpc_name
 
     describe_vpcs_request = ecs_20140526_models.DescribeVpcsRequest(**params)
-    return client.describe_vpcs(describe_vpcs_request)
+    return await client.describe_vpcs_async(describe_vpcs_request)
 
 @tools.append
-def ECS_DescribeVSwitches(
+async def ECS_DescribeVSwitches(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     v_switch_id: str = Field(description='虚拟交换机vSwitch ID (The ID of the vSwitch)', default=None),
     vpc_id: str = Field(description='专有网络VPC ID (The ID of the virtual private cloud)', default=None),
@@ -284,10 +290,10 @@ def ECS_DescribeVSwitches(
         params['zone_id'] = zone_id
 
     describe_v_switches_request = ecs_20140526_models.DescribeVSwitchesRequest(**params)
-    return client.describe_vswitches(describe_v_switches_request)
+    return await client.describe_vswitches_async(describe_v_switches_request)
 
 @tools.append
-def ECS_DescribeRegions(
+async def ECS_DescribeRegions(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default=None)
 ):
     """查询阿里云支持的地域列表 (Queries the regions that are supported by Alibaba Cloud)"""
@@ -298,20 +304,20 @@ def ECS_DescribeRegions(
         params['region_id'] = region_id
 
     describe_regions_request = ecs_20140526_models.DescribeRegionsRequest(**params)
-    return client.describe_regions(describe_regions_request)
+    return await client.describe_regions_async(describe_regions_request)
 
 @tools.append
-def ECS_DescribeZones(
+async def ECS_DescribeZones(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
     """查询指定地域下的可用区列表 (Queries the zones that are available in the specified region)"""
     client = create_client(region_id=region_id)
 
     describe_zones_request = ecs_20140526_models.DescribeZonesRequest(region_id=region_id)
-    return client.describe_zones(describe_zones_request)
+    return await client.describe_zones_async(describe_zones_request)
 
 @tools.append
-def ECS_DescribeKeyPairs(
+async def ECS_DescribeKeyPairs(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     key_pair_name: str = Field(description='密钥对名称 (The name of the key pair)', default=None),
     key_pair_ids: Optional[List[str]] = Field(description='密钥对ID列表 (The IDs of key pairs)', default=None),
@@ -333,10 +339,10 @@ def ECS_DescribeKeyPairs(
         params['key_pair_ids'] = json.dumps(key_pair_ids)
 
     describe_key_pairs_request = ecs_20140526_models.DescribeKeyPairsRequest(**params)
-    return client.describe_key_pairs(describe_key_pairs_request)
+    return await client.describe_key_pairs_async(describe_key_pairs_request)
 
 @tools.append
-def ECS_DescribeSnapshots(
+async def ECS_DescribeSnapshots(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     snapshot_ids: Optional[List[str]] = Field(description='快照ID列表 (The IDs of snapshots)', default=None),
     disk_id: str = Field(description='磁盘ID (The ID of the disk)', default=None),
@@ -367,4 +373,4 @@ def ECS_DescribeSnapshots(
         params['usage'] = usage
 
     describe_snapshots_request = ecs_20140526_models.DescribeSnapshotsRequest(**params)
-    return client.describe_snapshots(describe_snapshots_request)
\ No newline at end of file
+    return await client.describe_snapshots_async(describe_snapshots_request)
\ No newline at end of file
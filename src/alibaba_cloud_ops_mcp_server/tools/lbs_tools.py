@@ -6,16 +6,22 @@ import json
 from alibabacloud_slb20140515.client import Client as slb20140515Client
 from alibabacloud_slb20140515 import models as slb_20140515_models
 from alibaba_cloud_ops_mcp_server.alibabacloud.utils import create_config
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import get_client
 
 tools = []
 
 def create_client(region_id: str) -> slb20140515Client:
-    config = create_config()
-    config.endpoint = f'slb.{region_id}.aliyuncs.com'
-    return slb20140515Client(config)
+    endpoint = f'slb.{region_id}.aliyuncs.com'
+
+    def new_client():
+        config = create_config()
+        config.endpoint = endpoint
+        return slb20140515Client(config)
+
+    return get_client('slb', endpoint, new_client)
 
 @tools.append
-def SLB_DescribeLoadBalancers(
+async def SLB_DescribeLoadBalancers(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     load_balancer_name: str = Field(description='负载均衡器名称 (The name of the load balancer)', default=None),
     address: str = Field(description='负载均衡器服务地址 (The service address of the load balancer)', default=None)
@@ -27,10 +33,10 @@ def SLB_DescribeLoadBalancers(
         load_balancer_name=load_balancer_name,
         address=address
     )
-    return client.describe_load_balancers(describe_load_balancers_request)
+    return await client.describe_load_balancers_async(describe_load_balancers_request)
 
 @tools.append
-def SLB_DescribeLoadBalancerAttribute(
+async def SLB_DescribeLoadBalancerAttribute(
     load_balancer_id: str = Field(..., description='负载均衡器实例ID (The ID of the SLB instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
@@ -40,10 +46,10 @@ def SLB_DescribeLoadBalancerAttribute(
         region_id=region_id,
         load_balancer_id=load_balancer_id
     )
-    return client.describe_load_balancer_attribute(describe_load_balancer_attribute_request)
+    return await client.describe_load_balancer_attribute_async(describe_load_balancer_attribute_request)
 
 @tools.append
-def SLB_DeleteLoadBalancer(
+async def SLB_DeleteLoadBalancer(
     load_balancer_id: str = Field(..., description='负载均衡器实例ID (The ID of the CLB instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
@@ -53,10 +59,10 @@ def SLB_DeleteLoadBalancer(
         region_id=region_id,
         load_balancer_id=load_balancer_id
     )
-    return client.delete_load_balancer(delete_load_balancer_request)
+    return await client.delete_load_balancer_async(delete_load_balancer_request)
 
 @tools.append
-def SLB_DescribeLoadBalancerListeners(
+async def SLB_DescribeLoadBalancerListeners(
     load_balancer_id: str = Field(..., description='负载均衡器实例ID (The ID of the SLB instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     listener_port: int = Field(description='监听端口 (The listener port)', default=None),
@@ -92,10 +98,10 @@ def SLB_DescribeLoadBalancerListeners(
         params['listener_protocol'] = listener_protocol
 
     describe_load_balancer_listeners_request = slb_20140515_models.DescribeLoadBalancerListenersRequest(**params)
-    return client.describe_load_balancer_listeners(describe_load_balancer_listeners_request)
+    return await client.describe_load_balancer_listeners_async(describe_load_balancer_listeners_request)
 
 @tools.append
-def SLB_DescribeBackendServers(
+async def SLB_DescribeBackendServers(
     load_balancer_id: str = Field(..., description='负载均衡器实例ID (The ID of the SLB instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
@@ -106,10 +112,10 @@ def SLB_DescribeBackendServers(
         region_id=region_id,
         load_balancer_id=load_balancer_id
     )
-    return client.describe_load_balancer_attribute(describe_load_balancer_attribute_request)
+    return await client.describe_load_balancer_attribute_async(describe_load_balancer_attribute_request)
 
 @tools.append
-def SLB_DescribeHealthStatus(
+async def SLB_DescribeHealthStatus(
     load_balancer_id: str = Field(..., description='负载均衡器实例ID (The ID of the SLB instance)'),
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     listener_port: int = Field(description='监听端口 (The listener port)', default=None)
@@ -126,10 +132,10 @@ def SLB_DescribeHealthStatus(
         params['listener_port'] = listener_port
 
     describe_health_status_request = slb_20140515_models.DescribeHealthStatusRequest(**params)
-    return client.describe_health_status(describe_health_status_request)
+    return await client.describe_health_status_async(describe_health_status_request)
 
 @tools.append
-def SLB_DescribeServerCertificates(
+async def SLB_DescribeServerCertificates(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     server_certificate_id: str = Field(description='服务器证书ID (The ID of the server certificate)', default=None),
     server_certificate_name: str = Field(description='服务器证书名称 (The name of the server certificate)', default=None),
@@ -151,10 +157,10 @@ def SLB_DescribeServerCertificates(
         params['server_certificate_name'] = server_certificate_name
 
     describe_server_certificates_request = slb_20140515_models.DescribeServerCertificatesRequest(**params)
-    return client.describe_server_certificates(describe_server_certificates_request)
+    return await client.describe_server_certificates_async(describe_server_certificates_request)
 
 @tools.append
-def SLB_DescribeCACertificates(
+async def SLB_DescribeCACertificates(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     ca_certificate_id: str = Field(description='CA证书ID (The ID of the CA certificate)', default=None),
     ca_certificate_name: str = Field(description='CA证书名称 (The name of the CA certificate)', default=None),
@@ -176,10 +182,10 @@ def SLB_DescribeCACertificates(
         params['ca_certificate_name'] = ca_certificate_name
 
     describe_ca_certificates_request = slb_20140515_models.DescribeCACertificatesRequest(**params)
-    return client.describe_ca_certificates(describe_ca_certificates_request)
+    return await client.describe_cacertificates_async(describe_ca_certificates_request)
 
 @tools.append
-def SLB_DescribeVServerGroups(
+async def SLB_DescribeVServerGroups(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     load_balancer_id: str = Field(description='负载均衡器实例ID (The ID of the SLB instance)', default=None),
     v_server_group_id: str = Field(description='虚拟服务器组ID (The ID of the VServer group)', default=None),
@@ -204,10 +210,10 @@ def SLB_DescribeVServerGroups(
         params['v_server_group_name'] = v_server_group_name
 
     describe_v_server_groups_request = slb_20140515_models.DescribeVServerGroupsRequest(**params)
-    return client.describe_v_server_groups(describe_v_server_groups_request)
+    return await client.describe_vserver_groups_async(describe_v_server_groups_request)
 
 @tools.append
-def SLB_DescribeMasterSlaveServerGroups(
+async def SLB_DescribeMasterSlaveServerGroups(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou'),
     load_balancer_id: str = Field(description='负载均衡器实例ID (The ID of the SLB instance)', default=None),
     master_slave_server_group_id: str = Field(description='主备服务器组ID (The ID of the master-slave server group)', default=None),
@@ -232,10 +238,10 @@ def SLB_DescribeMasterSlaveServerGroups(
         params['master_slave_server_group_name'] = master_slave_server_group_name
 
     describe_master_slave_server_groups_request = slb_20140515_models.DescribeMasterSlaveServerGroupsRequest(**params)
-    return client.describe_master_slave_server_groups(describe_master_slave_server_groups_request)
+    return await client.describe_master_slave_server_groups_async(describe_master_slave_server_groups_request)
 
 @tools.append
-def SLB_DescribeRegions(
+async def SLB_DescribeRegions(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default=None)
 ):
     """查询阿里云支持的地域列表 (Queries the regions that are supported by Alibaba Cloud)"""
@@ -246,14 +252,14 @@ def SLB_DescribeRegions(
         params['region_id'] = region_id
 
     describe_regions_request = slb_20140515_models.DescribeRegionsRequest(**params)
-    return client.describe_regions(describe_regions_request)
+    return await client.describe_regions_async(describe_regions_request)
 
 @tools.append
-def SLB_DescribeZones(
+async def SLB_DescribeZones(
     region_id: str = Field(description='阿里云地域ID (AlibabaCloud region ID)', default='cn-hangzhou')
 ):
     """查询指定地域下的可用区列表 (Queries the zones that are available in the specified region)"""
     client = create_client(region_id=region_id)
 
     describe_zones_request = slb_20140515_models.DescribeZonesRequest(region_id=region_id)
-    return client.describe_zones(describe_zones_request)
+    return await client.describe_zones_async(describe_zones_request)
@@ -1,56 +1,287 @@
 from pydantic import Field
 from typing import List
 import os
+import asyncio
+import copy
 import json
+import logging
 import time
+import weakref
+
+from fastmcp import Context
 
 from alibabacloud_oos20190601.client import Client as oos20190601Client
 from alibabacloud_oos20190601 import models as oos_20190601_models
 from alibaba_cloud_ops_mcp_server.alibabacloud.utils import create_config
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import get_client
 from alibaba_cloud_ops_mcp_server.alibabacloud import exception
+from alibaba_cloud_ops_mcp_server.alibabacloud.polling import BatchPoller, PollStrategy
+from alibaba_cloud_ops_mcp_server.settings import settings
+
 
+logger = logging.getLogger(__name__)
 
 END_STATUSES = [SUCCESS, FAILED, CANCELLED] = ['Success', 'Failed', 'Cancelled']
+# 批量查询执行状态时，开始时间条件向前放宽的秒数，容忍本地与服务端的时钟偏差
+START_DATE_MARGIN = 300
+LIST_PAGE_SIZE = 100
 
 
 tools = []
 
 
 def create_client(region_id: str) -> oos20190601Client:
-    config = create_config()
-    config.endpoint = f'oos.{region_id}.aliyuncs.com'
-    return oos20190601Client(config)
+    endpoint = f'oos.{region_id}.aliyuncs.com'
 
+    def new_client():
+        config = create_config()
+        config.endpoint = endpoint
+        return oos20190601Client(config)
 
-def _start_execution_sync(region_id: str, template_name: str, parameters: dict):
-    client = create_client(region_id=region_id)
+    return get_client('oos', endpoint, new_client)
+
+
+async def _start_execution(client: oos20190601Client, region_id: str, template_name: str, parameters: dict) -> str:
     start_execution_request = oos_20190601_models.StartExecutionRequest(
         region_id=region_id,
         template_name=template_name,
         parameters=json.dumps(parameters)
     )
-    start_execution_resp = client.start_execution(start_execution_request)
-    execution_id = start_execution_resp.body.execution.execution_id
+    start_execution_resp = await client.start_execution_async(start_execution_request)
+    return start_execution_resp.body.execution.execution_id
+
 
-    while True:
+async def _list_execution(client: oos20190601Client, region_id: str, execution_id: str):
+    list_executions_request = oos_20190601_models.ListExecutionsRequest(
+        region_id=region_id,
+        execution_id=execution_id
+    )
+    list_executions_resp = await client.list_executions_async(list_executions_request)
+    return list_executions_resp.body
+
+
+def _execution_progress(execution):
+    """(finished tasks, total tasks) from the counters of an execution, total is None when unknown."""
+    counters = {key.lower(): value for key, value in (execution.counters or {}).items()}
+    total = counters.get('total')
+    finished = sum(counters.get(status.lower()) or 0 for status in END_STATUSES)
+    return finished, total
+
+
+async def _report_progress(ctx: Context, execution, polls: int):
+    finished, total = _execution_progress(execution)
+    message = f'Execution {execution.execution_id} is {execution.status}'
+    try:
+        if total:
+            await ctx.report_progress(finished, total, message=f'{message}, {finished}/{total} tasks finished')
+        else:
+            await ctx.report_progress(polls, message=message)
+    except Exception as e:
+        # 进度通知失败不影响执行结果
+        logger.debug(f'Failed to report progress of execution {execution.execution_id}: {e}')
+
+
+async def _list_executions_batch(group, execution_ids, since):
+    """
+    Current state of ``execution_ids`` of one region, client and template, listed together where possible:
+    execution id -> (execution, the ListExecutions response body it was read from).
+    """
+    region_id, client, template_name = group
+    if len(execution_ids) == 1:
+        body = await _list_execution(client, region_id, execution_ids[0])
+        return {execution.execution_id: (execution, body) for execution in body.executions or []}
+    wanted = set(execution_ids)
+    found = {}
+    start_date_after = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(since - START_DATE_MARGIN))
+    next_token = None
+    # ListExecutions 只能按单个 ExecutionId 过滤：按模板和开始时间缩小范围并升序排列，使待查询的执行排在前面。
+    # 已翻页数加上仍未找到的执行数达到逐个查询所需的请求数后停止翻页，最多只比逐个查询多一次请求（首页）
+    for pages in range(1, settings.oos_poll_max_pages + 1):
         list_executions_request = oos_20190601_models.ListExecutionsRequest(
             region_id=region_id,
-            execution_id=execution_id
+            template_name=template_name,
+            start_date_after=start_date_after,
+            sort_field='StartDate',
+            sort_order='Ascending',
+            max_results=LIST_PAGE_SIZE,
+            next_token=next_token
         )
-        list_executions_resp = client.list_executions(list_executions_request)
-        status = list_executions_resp.body.executions[0].status
-        if status == FAILED:
-            status_message = list_executions_resp.body.executions[0].status_message
-            raise exception.OOSExecutionFailed(reason=status_message)
-        elif status in END_STATUSES:
-            return list_executions_resp.body
-        time.sleep(1)
+        list_executions_resp = await client.list_executions_async(list_executions_request)
+        for execution in list_executions_resp.body.executions or []:
+            if execution.execution_id in wanted:
+                found[execution.execution_id] = (execution, list_executions_resp.body)
+        next_token = list_executions_resp.body.next_token
+        if len(found) == len(wanted) or not next_token or pages + len(wanted) - len(found) >= len(wanted):
+            break
+    # 批量查询未覆盖到的执行逐个查询
+    for execution_id in wanted - found.keys():
+        body = await _list_execution(client, region_id, execution_id)
+        for execution in body.executions or []:
+            found[execution.execution_id] = (execution, body)
+    return found
+
+
+def _execution_body(execution, body):
+    """
+    The ListExecutions response body that reported ``execution``, narrowed to that execution when it was read
+    from a page listing other executions too (keeping the RequestId and the other fields of the response).
+    """
+    if list(body.executions or []) == [execution]:
+        return body
+    narrowed = copy.copy(body)
+    narrowed.executions = [execution]
+    narrowed.total_count = 1
+    narrowed.next_token = None
+    return narrowed
+
+
+_pollers = weakref.WeakKeyDictionary()
+
+
+def get_execution_poller() -> BatchPoller:
+    """The poller of the running event loop, shared by all executions waited for on it."""
+    loop = asyncio.get_running_loop()
+    poller = _pollers.get(loop)
+    if poller is None:
+        poller = _pollers[loop] = BatchPoller(
+            _list_executions_batch,
+            is_done=lambda state: state[0].status in END_STATUSES,
+            timeout_error=lambda execution_id, strategy: exception.OOSExecutionTimeout(
+                execution_id=execution_id, timeout=strategy.timeout),
+            strategy_factory=lambda: PollStrategy()
+        )
+    return poller
+
+
+async def _wait_for_execution(client: oos20190601Client, region_id: str, execution_id: str, ctx: Context = None,
+                              template_name: str = None):
+    async def _report(state, polls):
+        await _report_progress(ctx, state[0], polls)
+
+    on_update = _report if ctx is not None else None
+
+    # 同一地域、同一客户端、同一模板的所有执行由共享的轮询器批量查询状态
+    execution, body = await get_execution_poller().wait((region_id, client, template_name), execution_id,
+                                                        on_update)
+    if execution.status == FAILED:
+        raise exception.OOSExecutionFailed(reason=execution.status_message, execution_id=execution.execution_id)
+    return _execution_body(execution, body)
+
+
+async def _start_execution_sync(region_id: str, template_name: str, parameters: dict, ctx: Context = None):
+    client = create_client(region_id=region_id)
+    execution_id = await _start_execution(client, region_id, template_name, parameters)
+    return await _wait_for_execution(client, region_id, execution_id, ctx, template_name)
+
+
+async def _run_single_execution(region_id: str, template_name: str, parameters: dict,
+                                wait_for_completion: bool = True, ctx: Context = None):
+    """Start an execution and wait for it, or only start it and return its id for OOS_GetExecutionStatus."""
+    if wait_for_completion:
+        return await _start_execution_sync(region_id, template_name, parameters, ctx)
+    client = create_client(region_id=region_id)
+    execution_id = await _start_execution(client, region_id, template_name, parameters)
+    return {
+        'ExecutionId': execution_id,
+        'RegionId': region_id,
+        'Status': 'Started',
+        'Message': 'The execution is running in the background, query its status with OOS_GetExecutionStatus.'
+    }
+
+
+def _target_chunks(parameters: dict):
+    """Split the target resources of ``parameters`` into chunks of settings.oos_max_targets_per_execution."""
+    resource_ids = list((parameters.get('targets') or {}).get('ResourceIds') or [])
+    size = settings.oos_max_targets_per_execution
+    if size <= 0 or len(resource_ids) <= size:
+        return None
+    return [resource_ids[i:i + size] for i in range(0, len(resource_ids), size)]
+
+
+async def _run_chunked_execution(region_id: str, template_name: str, parameters: dict, chunks: list,
+                                 wait_for_completion: bool = True, ctx: Context = None):
+    """
+    Run one execution per chunk of target resources, at most settings.oos_fanout_concurrency at once, and merge
+    their outcomes. A failed chunk does not stop the others.
+
+    The outcome is reported per execution, not per resource: the Status of an entry of Executions covers all its
+    ResourceIds together, and FailedInstanceIds / CancelledInstanceIds list the resources of the executions that
+    failed or were cancelled. Which resources of such an execution were actually affected is in its task output
+    (see OOS_GetExecutionStatus). As with a single execution, Cancelled is an end status, not a failure.
+    """
+    semaphore = asyncio.Semaphore(max(settings.oos_fanout_concurrency, 1))
+    finished = 0
+
+    async def run_chunk(resource_ids):
+        nonlocal finished
+        chunk_parameters = copy.deepcopy(parameters)
+        chunk_parameters['targets']['ResourceIds'] = resource_ids
+        report = {'ExecutionId': None, 'ResourceIds': resource_ids}
+        async with semaphore:
+            try:
+                result = await _run_single_execution(region_id, template_name, chunk_parameters,
+                                                     wait_for_completion)
+                if isinstance(result, dict):
+                    report.update(ExecutionId=result['ExecutionId'], Status=result['Status'])
+                else:
+                    execution = result.executions[0]
+                    report.update(ExecutionId=execution.execution_id, Status=execution.status,
+                                  StatusMessage=execution.status_message)
+            except exception.AcsException as e:
+                report.update(Status=FAILED, StatusMessage=e.message, ExecutionId=e.kwargs.get('execution_id'))
+            except Exception as e:
+                report.update(Status=FAILED, StatusMessage=str(e))
+        finished += 1
+        if ctx is not None:
+            try:
+                await ctx.report_progress(finished, len(chunks),
+                                          message=f'{finished}/{len(chunks)} executions of {template_name} finished')
+            except Exception as e:
+                logger.debug(f'Failed to report progress of {template_name}: {e}')
+        return report
+
+    # 分批并发执行，单个批次失败不影响其他批次
+    executions = await asyncio.gather(*(run_chunk(resource_ids) for resource_ids in chunks))
+    total = sum(len(report['ResourceIds']) for report in executions)
+    failed = [resource_id for report in executions if report['Status'] == FAILED
+              for resource_id in report['ResourceIds']]
+    cancelled = [resource_id for report in executions if report['Status'] == CANCELLED
+                 for resource_id in report['ResourceIds']]
+    # 不等待执行结束时，只有启动失败的批次计为失败；取消与单个执行一致，视为结束状态而非失败
+    succeeded, partial = (SUCCESS, 'PartiallyFailed') if wait_for_completion else ('Started', 'PartiallyStarted')
+    if failed:
+        status = partial if len(failed) < total else FAILED
+    elif cancelled:
+        status = 'PartiallyCancelled' if len(cancelled) < total else CANCELLED
+    else:
+        status = succeeded
+    return {
+        'RegionId': region_id,
+        'TemplateName': template_name,
+        'Status': status,
+        'Executions': executions,
+        'FailedInstanceIds': failed,
+        'CancelledInstanceIds': cancelled,
+    }
+
+
+async def _run_execution(region_id: str, template_name: str, parameters: dict, wait_for_completion: bool = True,
+                         ctx: Context = None):
+    """Run the template on the target resources of ``parameters``, split into several executions when too many."""
+    chunks = _target_chunks(parameters)
+    if chunks is None:
+        return await _run_single_execution(region_id, template_name, parameters, wait_for_completion, ctx)
+    return await _run_chunked_execution(region_id, template_name, parameters, chunks, wait_for_completion, ctx)
+
+
 @tools.append
-def OOS_RunCommand(
+async def OOS_RunCommand(
     Command: str = Field(description='Content of the command executed on the ECS instance'),
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
-    CommandType: str = Field(description='The type of command executed on the ECS instance, optional value：RunShellScript，RunPythonScript，RunPerlScript，RunBatScript，RunPowerShellScript', default='RunShellScript')
+    CommandType: str = Field(description='The type of command executed on the ECS instance, optional value：RunShellScript，RunPythonScript，RunPerlScript，RunBatScript，RunPowerShellScript', default='RunShellScript'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量在多台ECS实例上运行云助手命令，适用于需要同时管理多台ECS实例的场景，如应用程序管理和资源标记操作等。"""
     
@@ -69,13 +300,16 @@ def OOS_RunCommand(
         "commandType": CommandType,
         "commandContent": Command
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-BulkyRunCommand', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-BulkyRunCommand', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
     
 
 @tools.append
-def OOS_StartInstances(
+async def OOS_StartInstances(
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量启动ECS实例，适用于需要同时管理和启动多台ECS实例的场景，例如应用部署和高可用性场景。"""
     
@@ -88,14 +322,17 @@ def OOS_StartInstances(
             'Type': 'ResourceIds'
         }
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-BulkyStartInstances', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-BulkyStartInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_StopInstances(
+async def OOS_StopInstances(
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
-    ForeceStop: bool = Field(description='Is forced shutdown required', default=False)
+    ForeceStop: bool = Field(description='Is forced shutdown required', default=False),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量停止ECS实例，适用于需要同时管理和停止多台ECS实例的场景。"""
     
@@ -109,14 +346,17 @@ def OOS_StopInstances(
         },
         'forceStop': ForeceStop
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-BulkyStopInstances', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-BulkyStopInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_RebootInstances(
+async def OOS_RebootInstances(
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
-    ForeceStop: bool = Field(description='Is forced shutdown required', default=False)
+    ForeceStop: bool = Field(description='Is forced shutdown required', default=False),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量重启ECS实例，适用于需要同时管理和重启多台ECS实例的场景。"""
     
@@ -130,18 +370,21 @@ def OOS_RebootInstances(
         },
         'forceStop': ForeceStop
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-BulkyRebootInstances', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-BulkyRebootInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_RunInstances(
+async def OOS_RunInstances(
     ImageId: str = Field(description='Image ID'),
     InstanceType: str = Field(description='Instance Type'),
     SecurityGroupId: str = Field(description='SecurityGroup ID'),
     VSwitchId: str = Field(description='VSwitch ID'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
     Amount: int = Field(description='Number of ECS instances', default=1),
-    InstanceName: str = Field(description='Instance Name', default='')
+    InstanceName: str = Field(description='Instance Name', default=''),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量创建ECS实例，适用于需要同时创建多台ECS实例的场景，例如应用部署和高可用性场景。"""
 
@@ -153,14 +396,17 @@ def OOS_RunInstances(
         'amount': Amount,
         'instanceName': InstanceName
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-RunInstances', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-RunInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_ResetPassword(
+async def OOS_ResetPassword(
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
     Password: str = Field(description='The password of the ECS instance must be 8-30 characters and must contain only the following characters: lowercase letters, uppercase letters, numbers, and special characters only.（）~！@#$%^&*-_+=（40：<>，？/'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量修改ECS实例的密码，请注意，本操作将会重启ECS实例"""
     parameters = {
@@ -173,13 +419,16 @@ def OOS_ResetPassword(
         },
         'password': Password
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-BulkyResetPassword', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-BulkyResetPassword', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 @tools.append
-def OOS_ReplaceSystemDisk(
+async def OOS_ReplaceSystemDisk(
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
     ImageId: str = Field(description='Image ID'),
-    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou')
+    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量替换ECS实例的系统盘，更换操作系统"""
     parameters = {
@@ -192,13 +441,16 @@ def OOS_ReplaceSystemDisk(
         },
         'imageId': ImageId
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-ECS-BulkyReplaceSystemDisk', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-ECS-BulkyReplaceSystemDisk', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_StartRDSInstances(
+async def OOS_StartRDSInstances(
     InstanceIds: List[str] = Field(description='AlibabaCloud ECS instance ID List'),
-    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou')
+    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量启动RDS实例，适用于需要同时管理和启动多台RDS实例的场景，例如应用部署和高可用性场景。"""
 
@@ -211,13 +463,16 @@ def OOS_StartRDSInstances(
             'Type': 'ResourceIds'
         }
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-RDS-BulkyStartInstances', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-RDS-BulkyStartInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_StopRDSInstances(
+async def OOS_StopRDSInstances(
     InstanceIds: List[str] = Field(description='AlibabaCloud RDS instance ID List'),
-    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou')
+    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量停止RDS实例，适用于需要同时管理和停止多台RDS实例的场景。"""
 
@@ -230,13 +485,16 @@ def OOS_StopRDSInstances(
             'Type': 'ResourceIds'
         }
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-RDS-BulkyStopInstances', parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-RDS-BulkyStopInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
 
 
 @tools.append
-def OOS_RebootRDSInstances(
+async def OOS_RebootRDSInstances(
     InstanceIds: List[str] = Field(description='AlibabaCloud RDS instance ID List'),
-    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou')
+    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
+    WaitForCompletion: bool = Field(description='Whether to wait until the execution finishes; when false the execution ID is returned at once and its status can be queried with OOS_GetExecutionStatus', default=True),
+    ctx: Context = None
 ):
     """批量重启RDS实例，适用于需要同时管理和重启多台RDS实例的场景。"""
 
@@ -249,5 +507,15 @@ def OOS_RebootRDSInstances(
             'Type': 'ResourceIds'
         }
     }
-    return _start_execution_sync(region_id=RegionId, template_name='ACS-RDS-BulkyRestartInstances',
-                                 parameters=parameters)
+    return await _run_execution(region_id=RegionId, template_name='ACS-RDS-BulkyRestartInstances', parameters=parameters,
+                                wait_for_completion=WaitForCompletion, ctx=ctx)
+
+
+@tools.append
+async def OOS_GetExecutionStatus(
+    ExecutionId: str = Field(description='ID of the OOS execution returned by an OOS tool called with WaitForCompletion set to false'),
+    RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou')
+):
+    """查询OOS执行的状态、进度与输出，用于跟踪以非阻塞方式启动的批量操作。"""
+    client = create_client(region_id=RegionId)
+    return await _list_execution(client, RegionId, ExecutionId)
@@ -1,63 +1,119 @@
 # oss_tools.py
+import asyncio
+import contextlib
 import os
 import alibabacloud_oss_v2 as oss
-from alibaba_cloud_ops_mcp_server.alibabacloud.utils import get_credentials_from_header
+from alibabacloud_oss_v2.aio import AsyncClient
+from alibaba_cloud_ops_mcp_server.alibabacloud.utils import get_credentials_from_header, get_credential_client
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import get_client, lease_client
 
 from pydantic import Field
 from alibabacloud_oss_v2 import Credentials
 from alibabacloud_oss_v2.credentials import EnvironmentVariableCredentialsProvider
-from alibabacloud_credentials.client import Client as CredClient
+from alibabacloud_oss_v2.exceptions import CredentialsEmptyError
 
 
 tools = []
 
 
 class CredentialsProvider(EnvironmentVariableCredentialsProvider):
+    """
+    The credentials passed in the request headers, or else those of the process-wide credential cache, which
+    refresh() resolves asynchronously before each request so that the SDK never resolves them on the event loop.
+    """
+
     def __init__(self) -> None:
         credentials = get_credentials_from_header()
+        self._from_header = bool(credentials)
         if credentials:
-            access_key_id = credentials.get('AccessKeyId', None)
-            access_key_secret = credentials.get('AccessKeySecret', None)
-            session_token = credentials.get('SecurityToken', None)
+            self._credentials = Credentials(
+                credentials.get('AccessKeyId', None),
+                credentials.get('AccessKeySecret', None),
+                credentials.get('SecurityToken', None))
         else:
-            credentialsClient = CredClient()
-            access_key_id = credentialsClient.get_credential().access_key_id
-            access_key_secret = credentialsClient.get_credential().access_key_secret
-            session_token = credentialsClient.get_credential().security_token
+            self._credentials = None
 
-        self._credentials = Credentials(
-            access_key_id, access_key_secret, session_token)
+    async def refresh(self) -> None:
+        if self._from_header:
+            return
+        # 凭证缓存命中时直接返回，需要解析凭证链时在线程池中进行
+        credential = await get_credential_client().get_credential_async()
+        self._credentials = Credentials(credential.access_key_id, credential.access_key_secret,
+                                        credential.security_token)
 
     def get_credentials(self) -> Credentials:
+        if self._credentials is None:
+            raise CredentialsEmptyError()
         return self._credentials
 
 
-def create_client(region_id: str) -> oss.Client:
-    credentials_provider = CredentialsProvider()
-    cfg = oss.config.load_default()
-    cfg.user_agent = 'alibaba-cloud-ops-mcp-server'
-    cfg.credentials_provider = credentials_provider
-    cfg.region = region_id
-    return oss.Client(cfg)
+_default_credentials_provider = None
+_closing = set()
+
+
+def _close_client(client: AsyncClient) -> None:
+    """Close the HTTP session of a client leaving the pool, on the running event loop when there is one."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(client.close())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    else:
+        asyncio.run(client.close())
+
+
+async def _client_factory(region_id: str):
+    global _default_credentials_provider
+    if get_credentials_from_header():
+        credentials_provider = CredentialsProvider()
+    else:
+        # 使用默认凭证的客户端共用一个凭证提供者，每次请求前刷新
+        if _default_credentials_provider is None:
+            _default_credentials_provider = CredentialsProvider()
+        credentials_provider = _default_credentials_provider
+        await credentials_provider.refresh()
+
+    def new_client():
+        cfg = oss.config.load_default()
+        cfg.user_agent = 'alibaba-cloud-ops-mcp-server'
+        cfg.credentials_provider = credentials_provider
+        cfg.region = region_id
+        return AsyncClient(cfg)
+
+    return new_client
+
+
+async def create_client(region_id: str) -> AsyncClient:
+    return get_client('oss', region_id, await _client_factory(region_id), close=_close_client)
+
+
+@contextlib.asynccontextmanager
+async def oss_client(region_id: str):
+    """The pooled client of ``region_id``, not closed before the block exits even if it leaves the pool meanwhile."""
+    with lease_client('oss', region_id, await _client_factory(region_id), close=_close_client) as client:
+        yield client
 
 
 @tools.append
-def OSS_ListBuckets(
+async def OSS_ListBuckets(
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
     Prefix: str = Field(description='AlibabaCloud OSS Bucket Name prefix', default=None)
 ):
     """列出指定区域的所有OSS存储空间。"""
-    client = create_client(region_id=RegionId)
-    paginator = client.list_buckets_paginator()
-    results = []
-    for page in paginator.iter_page(oss.ListBucketsRequest(prefix=Prefix)):
-        for bucket in page.buckets:
-            results.append(bucket.__str__())
+    async with oss_client(region_id=RegionId) as client:
+        paginator = client.list_buckets_paginator()
+        results = []
+        async for page in paginator.iter_page(oss.ListBucketsRequest(prefix=Prefix)):
+            for bucket in page.buckets:
+                results.append(bucket.__str__())
     return results
 
 
 @tools.append
-def OSS_ListObjects(
+async def OSS_ListObjects(
     BucketName: str = Field(description='AlibabaCloud OSS Bucket Name'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
     Prefix: str = Field(description='AlibabaCloud OSS Bucket Name prefix', default=None)
@@ -65,20 +121,20 @@ def OSS_ListObjects(
     """获取指定OSS存储空间中的所有文件信息。"""
     if not BucketName:
         raise ValueError("Bucket name is required")
-    client = create_client(region_id=RegionId)
-    paginator = client.list_objects_v2_paginator()
-    results = []
-    for page in paginator.iter_page(oss.ListObjectsV2Request(
-            bucket=BucketName,
-            prefix=Prefix
-        )):
-        for object in page.contents:
-            results.append(object.__str__())
+    async with oss_client(region_id=RegionId) as client:
+        paginator = client.list_objects_v2_paginator()
+        results = []
+        async for page in paginator.iter_page(oss.ListObjectsV2Request(
+                bucket=BucketName,
+                prefix=Prefix
+            )):
+            for object in page.contents:
+                results.append(object.__str__())
     return results
 
 
 @tools.append
-def OSS_PutBucket(
+async def OSS_PutBucket(
     BucketName: str = Field(description='AlibabaCloud OSS Bucket Name'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou'),
     StorageClass: str = Field(description='The Storage Type of AlibabaCloud OSS Bucket, The value range is as follows: '
@@ -94,23 +150,23 @@ def OSS_PutBucket(
                                                 'zones in the same region.', default='LRS')
 ):
     """创建一个新的OSS存储空间。"""
-    client = create_client(region_id=RegionId)
-    result = client.put_bucket(oss.PutBucketRequest(
-        bucket=BucketName,
-        create_bucket_configuration=oss.CreateBucketConfiguration(
-            storage_class=StorageClass,
-            data_redundancy_type=DataRedundancyType
-        )
-    ))
+    async with oss_client(region_id=RegionId) as client:
+        result = await client.put_bucket(oss.PutBucketRequest(
+            bucket=BucketName,
+            create_bucket_configuration=oss.CreateBucketConfiguration(
+                storage_class=StorageClass,
+                data_redundancy_type=DataRedundancyType
+            )
+        ))
     return result.__str__()
 
 
 @tools.append
-def OSS_DeleteBucket(
+async def OSS_DeleteBucket(
     BucketName: str = Field(description='AlibabaCloud OSS Bucket Name'),
     RegionId: str = Field(description='AlibabaCloud region ID', default='cn-hangzhou')
 ):
     """删除指定的OSS存储空间。"""
-    client = create_client(region_id=RegionId)
-    result = client.delete_bucket(oss.DeleteBucketRequest(bucket=BucketName))
+    async with oss_client(region_id=RegionId) as client:
+        result = await client.delete_bucket(oss.DeleteBucketRequest(bucket=BucketName))
     return result.__str__()
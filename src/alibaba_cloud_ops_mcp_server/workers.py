@@ -0,0 +1,123 @@
+"""
+Multi-worker mode of the HTTP transports.
+
+The parent process resolves the API meta of the configured services once into a shared snapshot file
+(see alibabacloud/shared_snapshot.py), registers the tools, binds the listening socket and then forks the
+worker processes, which all accept connections on the inherited socket. A worker that dies is restarted.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import tempfile
+import time
+
+import fastmcp
+import uvicorn
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import client_pool
+from alibaba_cloud_ops_mcp_server.alibabacloud.shared_snapshot import build_shared_snapshot
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SUPERVISE_INTERVAL = 0.5
+STOP_TIMEOUT = 10
+
+
+def shared_snapshot_path(directory=None):
+    return os.path.join(directory or tempfile.gettempdir(), f'alibaba-cloud-ops-mcp-meta-{os.getpid()}.bin')
+
+
+def prepare_shared_snapshot(services, apis_by_service, directory=None):
+    """
+    Resolve the API meta into a shared snapshot file that the workers map read-only and return its path, or None
+    when it cannot be built, in which case every worker resolves the API meta on its own.
+    """
+    path = shared_snapshot_path(directory)
+    start = time.perf_counter()
+    try:
+        count = build_shared_snapshot(path, services, apis_by_service)
+    except Exception as e:
+        logger.warning(f'Failed to build shared meta snapshot, workers resolve the API meta on their own: {e}')
+        return None
+    settings.meta_shared_snapshot = path
+    logger.info(f'Shared meta snapshot: {count} documents, {os.path.getsize(path)} bytes, '
+                f'{time.perf_counter() - start:.2f}s, {path}')
+    return path
+
+
+def bind_socket(host, port, backlog=2048):
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(mcp, transport, sock, worker_init=None):
+    # 信号处理函数随 fork 继承自父进程，需恢复默认行为，由 uvicorn 自行处理
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.SIG_DFL)
+    # 不复用父进程中已建立的 HTTP 连接
+    ApiMetaClient.reset_session()
+    client_pool.clear()
+    if worker_init is not None:
+        worker_init()
+    app = mcp.http_app(transport=transport)
+    config = uvicorn.Config(app, lifespan='on', timeout_graceful_shutdown=0,
+                            log_level=fastmcp.settings.log_level.lower())
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def run_workers(mcp, transport, host, port, workers, snapshot_path=None, worker_init=None):
+    """
+    Serve ``mcp`` with ``workers`` forked processes sharing one listening socket, until SIGINT/SIGTERM.
+    ``worker_init`` is called in every worker process before it starts serving.
+    """
+    if snapshot_path:
+        # 工具已在父进程中构建完成，释放解码后的元数据，避免每个 worker 继承一份私有副本
+        ApiMetaClient.invalidate_cache()
+    sock = bind_socket(host, port)
+    context = multiprocessing.get_context('fork')
+    processes = []
+    stopping = []
+
+    def start():
+        process = context.Process(target=_serve, args=(mcp, transport, sock, worker_init), name='mcp-worker')
+        process.start()
+        return process
+
+    def stop(signum, frame):
+        stopping.append(signum)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    logger.info(f'Starting {workers} workers with transport {transport!r} on http://{host}:{port}')
+    try:
+        processes.extend(start() for _ in range(workers))
+        while not stopping:
+            for i, process in enumerate(processes):
+                if not process.is_alive() and not stopping:
+                    logger.warning(f'Worker {process.pid} exited with code {process.exitcode}, restarting')
+                    processes[i] = start()
+            time.sleep(SUPERVISE_INTERVAL)
+    finally:
+        for process in processes:
+            process.join(STOP_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+        sock.close()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        if snapshot_path:
+            try:
+                os.remove(snapshot_path)
+            except OSError:
+                pass
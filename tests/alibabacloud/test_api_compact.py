@@ -0,0 +1,75 @@
+import json
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_compact import compact_parameters, short_description
+
+COMPONENTS = {
+    '#/components/schemas/Tag': {
+        'type': 'object',
+        'required': ['Key'],
+        'properties': {
+            'Key': {'type': 'string', 'description': '标签键。最多20个字符。'},
+            'Value': {'type': 'string', 'description': '标签值'},
+        },
+    },
+}
+
+PARAMETERS = [
+    {'name': 'RegionId', 'in': 'query',
+     'schema': {'type': 'string', 'required': True, 'example': 'cn-hangzhou',
+                'description': '实例所属的<a href="~~25609~~">地域ID</a>。您可以调用 DescribeRegions 查看最新的地域列表。\n\n更多说明……'}},
+    {'name': 'Status', 'in': 'query',
+     'schema': {'type': 'string', 'enum': ['Running', 'Stopped'], 'description': '实例状态。'}},
+    {'name': 'Tag', 'in': 'query',
+     'schema': {'type': 'array', 'description': '标签列表。', 'items': {'$ref': '#/components/schemas/Tag'}}},
+    {'name': 'PageSize', 'in': 'query', 'schema': {'type': 'integer', 'description': '分页大小' * 100}},
+]
+
+
+def resolve(schema):
+    if '$ref' in schema:
+        return COMPONENTS[schema['$ref']]
+    return {key: resolve(value) if isinstance(value, dict) else value for key, value in schema.items()}
+
+
+def test_short_description():
+    assert short_description('实例所属的<a href="x">地域ID</a>。其余说明', 100) == '实例所属的 地域ID 。'
+    assert short_description('Use **bold** [link](http://x). Second sentence.', 100) == 'Use bold link.'
+    assert short_description('abcdefghij', 5) == 'abcd…'
+    assert short_description('abc', 0) == ''
+    assert short_description(None, 10) == ''
+
+
+def test_compact_parameters_projection():
+    compact = compact_parameters(PARAMETERS, resolve, 0)
+    assert compact[0] == {'name': 'RegionId', 'type': 'string', 'required': True, 'description': '实例所属的 地域ID 。'}
+    assert compact[1]['enum'] == ['Running', 'Stopped']
+    assert compact[2]['items'] == [
+        {'name': 'Key', 'type': 'string', 'required': True, 'description': '标签键。'},
+        {'name': 'Value', 'type': 'string', 'description': '标签值'},
+    ]
+    assert len(compact[3]['description']) == 160
+    assert 'example' not in json.dumps(compact)
+
+
+def test_compact_parameters_smaller_than_raw():
+    compact = compact_parameters(PARAMETERS, resolve, 8000)
+    assert len(json.dumps(compact, ensure_ascii=False)) < len(json.dumps(PARAMETERS, ensure_ascii=False))
+
+
+def test_compact_parameters_budget_levels():
+    budget = 200
+    compact = compact_parameters(PARAMETERS, resolve, budget)
+    assert len(json.dumps(compact, ensure_ascii=False, separators=(',', ':'))) <= budget
+    assert [entry['name'] for entry in compact] == ['RegionId', 'Status', 'Tag', 'PageSize']
+
+
+def test_compact_parameters_budget_keeps_names_required_first():
+    compact = compact_parameters(PARAMETERS, resolve, 60)
+    assert compact[0]['name'] == 'RegionId'
+    assert {entry['name'] for entry in compact} == {'RegionId', 'Status', 'Tag', 'PageSize'}
+    assert compact[-1] == {'name': 'PageSize'}
+
+
+def test_compact_parameters_unresolved_cycle():
+    compact = compact_parameters([{'name': 'Node', 'schema': {'$ref': '#/x'}}], lambda schema: schema, 0)
+    assert compact == [{'name': 'Node', 'type': 'object'}]
@@ -1,22 +1,30 @@
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
 from alibaba_cloud_ops_mcp_server.alibabacloud import api_meta_client
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+
+def patch_meta_http():
+    # 元数据服务默认返回 HTTP 200
+    return patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.Session.get',
+                 **{'return_value.status_code': 200})
+
+
+@patch_meta_http()
 def test_get_response_from_pop_api_success(mock_get):
     mock_get.return_value.json.return_value = [{"code": "ecs", "defaultVersion": "2014-05-26", "style": "RPC"}]
     data = api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
     assert isinstance(data, list)
     assert data[0]["code"] == "ecs"
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_response_from_pop_api_exception(mock_get):
     mock_get.side_effect = Exception('fail')
     with pytest.raises(Exception) as e:
         api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
     assert 'Failed to get response' in str(e.value)
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_service_version_and_style(mock_get):
     mock_get.return_value.json.return_value = [{"code": "ecs", "defaultVersion": "2014-05-26", "style": "RPC"}]
     v = api_meta_client.ApiMetaClient.get_service_version('ecs')
@@ -24,7 +32,7 @@ def test_get_service_version_and_style(mock_get):
     assert v == "2014-05-26"
     assert s == "RPC"
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_standard_service_and_api(mock_get):
     # 1st call: GetProductList, 2nd call: GetApiOverview
     mock_get.return_value.json.side_effect = [
@@ -35,7 +43,7 @@ def test_get_standard_service_and_api(mock_get):
     assert service == 'ecs'
     assert api == 'DescribeInstances'
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_api_meta_invalid(mock_get):
     # 1st call: GetProductList returns empty list
     mock_get.return_value.json.return_value = []
@@ -120,7 +128,7 @@ def test_get_api_body_style_none():
         val = api_meta_client.ApiMetaClient.get_api_body_style('ecs', 'DescribeInstances')
         assert val is None
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_apis_in_service(mock_get):
     # 第一次调用 get_service_version 需要 list，第二次 get_response_from_pop_api 需要 dict
     mock_get.return_value.json.side_effect = [
@@ -130,7 +138,21 @@ def test_get_apis_in_service(mock_get):
     apis = api_meta_client.ApiMetaClient.get_apis_in_service('ecs')
     assert set(apis) == {"A", "B"}
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+
+@patch_meta_http()
+def test_get_apis_in_service_uses_canonical_code(mock_get):
+    """overview 按产品列表中的规范 code 和默认版本请求，并与 API 索引共用"""
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "defaultVersion": "2014-05-26"}],
+        {"apis": {"DescribeInstances": {}, "StartInstance": {}}}
+    ]
+    client = api_meta_client.ApiMetaClient
+    assert client.get_apis_in_service('ECS') == ['DescribeInstances', 'StartInstance']
+    assert client.get_standard_service_and_api('ecs', 'startinstance') == ('Ecs', 'StartInstance')
+    assert mock_get.call_count == 2
+    assert '/products/Ecs/versions/2014-05-26/' in mock_get.call_args_list[1].args[0]
+
+@patch_meta_http()
 def test_get_response_from_pop_api_keyerror(mock_get):
     # config 缺 key
     with patch.object(api_meta_client.ApiMetaClient, 'config', {'GetProductList': {}}):
@@ -152,13 +174,14 @@ def test_get_api_parameters_empty():
         params = api_meta_client.ApiMetaClient.get_api_parameters('ecs', 'DescribeInstances')
         assert params == []
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_apis_in_service_no_apis(mock_get):
     mock_get.return_value.json.return_value = {}
-    with pytest.raises(KeyError):
+    with pytest.raises(Exception) as e:
         api_meta_client.ApiMetaClient.get_apis_in_service('ecs')
+    assert 'InvalidServiceName' in str(e.value)
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_api_parameters_schema_not_dict(mock_get):
     # get_api_meta返回的schema不是dict
     api_meta = {
@@ -173,7 +196,7 @@ def test_get_api_parameters_schema_not_dict(mock_get):
         assert 'foo' in params
         assert 'bar' in params
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_apis_in_service_normal(mock_get):
     """测试get_apis_in_service方法正常返回API列表"""
     mock_get.return_value.json.side_effect = [
@@ -220,7 +243,7 @@ def test_get_api_parameters_schema_not_dict_more_cases(mock_get_meta):
     assert 'baz' in params
     assert 'qux' in params
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_apis_in_service_normal(mock_get):
     """测试get_apis_in_service方法正常返回API列表"""
     mock_get.return_value.json.side_effect = [
@@ -301,7 +324,7 @@ def test_get_ref_api_meta_valid_path(mock_pop_api, mock_std):
     }
     assert result == expected
 
-@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.get')
+@patch_meta_http()
 def test_get_all_service_info(mock_get):
     mock_get.return_value.json.return_value = [
         {"code": "ecs", "name": "Elastic Compute Service"},
@@ -318,8 +341,9 @@ def test_get_all_service_info(mock_get):
 @patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.ApiMetaClient.get_service_version', return_value='2014-05-26')
 @patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.ApiMetaClient.get_standard_service_and_api', return_value=('ecs', 'DescribeInstances'))
 @patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.ApiMetaClient.get_response_from_pop_api')
-def test_get_api_meta_success(mock_pop_api, mock_get_std, mock_get_ver):
+def test_get_api_meta_success(mock_pop_api, mock_get_std, mock_get_ver, monkeypatch):
     """测试get_api_meta方法的正常成功路径，覆盖第90-91行"""
+    monkeypatch.setattr(api_meta_client.settings, 'meta_use_api_docs', False)
     # 模拟get_response_from_pop_api返回的API元数据
     mock_api_data = {
         'parameters': [
@@ -353,3 +377,311 @@ def test_get_api_meta_success(mock_pop_api, mock_get_std, mock_get_ver):
         'DescribeInstances', 
         '2014-05-26'
     )
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_cached(mock_get):
+    mock_get.return_value.json.return_value = [
+        {"code": "ecs", "name": "Elastic Compute Service", "defaultVersion": "2014-05-26", "style": "RPC"}
+    ]
+    api_meta_client.ApiMetaClient.get_service_version('ecs')
+    api_meta_client.ApiMetaClient.get_service_style('ecs')
+    api_meta_client.ApiMetaClient.get_all_service_info()
+    assert mock_get.call_count == 1
+    stats = api_meta_client.ApiMetaClient.get_cache_stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+
+def test_single_flight_leader_rechecks_cache():
+    """上一个 leader 刚写入缓存后才成为 leader 的调用直接使用缓存，不再重复获取"""
+    client = api_meta_client.ApiMetaClient
+    cache_key = (client.GET_PRODUCT_LIST, None, None, None)
+    products = [{"code": "Ecs"}]
+    client._cache.set(cache_key, products)
+    with patch.object(client, '_fetch_from_pop_api') as mock_fetch:
+        assert client._inflight.do(cache_key, client._fetch_and_cache, cache_key) is products
+    mock_fetch.assert_not_called()
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_error_not_cached(mock_get):
+    mock_get.side_effect = [Exception('fail'), MagicMock(status_code=200, **{'json.return_value': []})]
+    with pytest.raises(Exception):
+        api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
+    assert api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList') == []
+    assert mock_get.call_count == 2
+
+
+@patch_meta_http()
+def test_invalidate_cache(mock_get):
+    mock_get.return_value.json.return_value = {"apis": {}}
+    client = api_meta_client.ApiMetaClient
+    client.get_response_from_pop_api(client.GET_API_OVERVIEW, service='Ecs', version='2014-05-26')
+    client.get_response_from_pop_api(client.GET_API_OVERVIEW, service='Vpc', version='2016-04-28')
+    assert client.invalidate_cache(client.GET_API_OVERVIEW, service='Ecs') == 1
+    client.get_response_from_pop_api(client.GET_API_OVERVIEW, service='Vpc', version='2016-04-28')
+    assert mock_get.call_count == 2
+    assert client.invalidate_cache() == 1
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_disk_cache(mock_get, tmp_path, monkeypatch):
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_dir', str(tmp_path))
+    response = MagicMock(status_code=200, headers={'ETag': '"v1"'})
+    response.json.return_value = [{"code": "Ecs", "defaultVersion": "2014-05-26"}]
+    mock_get.return_value = response
+    client = api_meta_client.ApiMetaClient
+    assert client.get_response_from_pop_api('GetProductList')[0]['code'] == 'Ecs'
+    assert (tmp_path / 'products.json').exists()
+
+    # 模拟进程重启：内存缓存为空，直接使用磁盘上的文档
+    client.invalidate_cache()
+    assert client.get_response_from_pop_api('GetProductList')[0]['code'] == 'Ecs'
+    assert mock_get.call_count == 1
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_disk_cache_revalidate(mock_get, tmp_path, monkeypatch):
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_dir', str(tmp_path))
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_ttl', 0)
+    store = api_meta_client.MetaDiskStore(str(tmp_path))
+    store.save('products.json', [{"code": "Ecs"}], etag='"v1"')
+    mock_get.return_value = MagicMock(status_code=304, headers={})
+    data = api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
+    assert data == [{"code": "Ecs"}]
+    assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    mock_get.return_value.json.assert_not_called()
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_disk_cache_fallback(mock_get, tmp_path, monkeypatch):
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_dir', str(tmp_path))
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_ttl', 0)
+    api_meta_client.MetaDiskStore(str(tmp_path)).save('products.json', [{"code": "Ecs"}])
+    mock_get.side_effect = Exception('unreachable')
+    data = api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
+    assert data == [{"code": "Ecs"}]
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_error_response_not_cached(mock_get):
+    """限流等错误响应不作为元数据文档返回，也不写入缓存"""
+    throttled = MagicMock(status_code=429, **{'json.return_value': {'code': 'Throttling'}})
+    throttled.raise_for_status.side_effect = requests.HTTPError('429 Client Error: Too Many Requests')
+    mock_get.return_value = throttled
+    with pytest.raises(Exception) as e:
+        api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
+    assert '429' in str(e.value)
+    assert len(api_meta_client.ApiMetaClient._cache) == 0
+    mock_get.return_value = MagicMock(status_code=404, **{'json.return_value': {}})
+    with pytest.raises(Exception) as e:
+        api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
+    assert 'HTTP 404' in str(e.value)
+    assert len(api_meta_client.ApiMetaClient._cache) == 0
+
+
+@patch_meta_http()
+def test_get_response_from_pop_api_error_response_serves_disk_copy(mock_get, tmp_path, monkeypatch):
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_dir', str(tmp_path))
+    monkeypatch.setattr(api_meta_client.settings, 'meta_cache_ttl', 0)
+    store = api_meta_client.MetaDiskStore(str(tmp_path))
+    store.save('products.json', [{"code": "Ecs"}], etag='"v1"')
+    mock_get.return_value = MagicMock(status_code=429, **{'json.return_value': {'code': 'Throttling'}})
+    data = api_meta_client.ApiMetaClient.get_response_from_pop_api('GetProductList')
+    assert data == [{"code": "Ecs"}]
+    # 磁盘上的文档不被错误响应覆盖
+    assert store.load('products.json').body == [{"code": "Ecs"}]
+
+
+def test_get_session_pooled_with_retry():
+    client = api_meta_client.ApiMetaClient
+    client.reset_session()
+    session = client.get_session()
+    assert client.get_session() is session
+    adapter = session.get_adapter(client.BASE_URL)
+    assert adapter._pool_maxsize == api_meta_client.settings.meta_http_pool_size
+    assert adapter.max_retries.total == api_meta_client.settings.meta_http_max_retries
+    assert 503 in adapter.max_retries.status_forcelist
+    client.reset_session()
+    assert client.get_session() is not session
+    client.reset_session()
+
+
+@patch_meta_http()
+def test_http_get_timeout_and_stats(mock_get):
+    mock_get.return_value = MagicMock(status_code=200)
+    client = api_meta_client.ApiMetaClient
+    client.http_get(f'{client.BASE_URL}/products.json')
+    settings = api_meta_client.settings
+    assert mock_get.call_args.kwargs['timeout'] == (settings.meta_http_connect_timeout, settings.meta_http_read_timeout)
+    mock_get.return_value = MagicMock(status_code=503)
+    with pytest.raises(Exception) as e:
+        client.http_get(f'{client.BASE_URL}/products.json')
+    assert 'HTTP 503' in str(e.value)
+    stats = client.get_http_stats()
+    assert stats['count'] == 2
+    assert stats['errors'] == 1
+    assert stats['total_seconds'] >= stats['max_seconds'] >= 0
+
+
+def test_get_response_from_pop_api_single_flight():
+    import threading
+    import time
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(pop_api_name, service=None, api=None, version=None):
+        calls.append(pop_api_name)
+        release.wait(5)
+        return [{"code": "Ecs"}]
+
+    client = api_meta_client.ApiMetaClient
+    with patch.object(client, '_fetch_from_pop_api', side_effect=slow_fetch):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_response_from_pop_api('GetProductList')))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 5
+        while client.get_cache_stats()['coalesced'] < 7 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+    assert len(calls) == 1
+    assert results == [[{"code": "Ecs"}]] * 8
+
+
+@patch_meta_http()
+def test_product_and_api_index(mock_get):
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "defaultVersion": "2014-05-26", "style": "RPC"}, {"name": "no code"}],
+        {"apis": {"DescribeInstances": {}, "RunInstances": {}}}
+    ]
+    client = api_meta_client.ApiMetaClient
+    products = client.get_product_index()
+    assert set(products) == {'ecs'}
+    assert client.get_product_index() is products
+    index = client.get_api_index('ECS')
+    assert index['describeinstances'] == api_meta_client.ApiIndexEntry('DescribeInstances', '2014-05-26', 'RPC')
+    assert client.get_api_index('ecs') is index
+    assert client.get_standard_service_and_api('ECS', 'runinstances') == ('Ecs', 'RunInstances')
+    assert client.get_api_index('notexist') == {}
+    assert mock_get.call_count == 2
+
+
+@patch_meta_http()
+def test_index_rebuilt_after_invalidate(mock_get):
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "defaultVersion": "2014-05-26"}],
+        [{"code": "Ecs", "defaultVersion": "2014-05-26"}, {"code": "Vpc", "defaultVersion": "2016-04-28"}],
+    ]
+    client = api_meta_client.ApiMetaClient
+    assert client.get_service_version('vpc') is None
+    client.invalidate_cache()
+    assert client.get_service_version('vpc') == '2016-04-28'
+    assert client.get_service_style('vpc') is None
+    assert client.get_service_style('rds') == 'RPC'
+
+
+@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.ApiMetaClient.get_api_meta')
+def test_get_api_parameters_ref_resolved_once(mock_get_meta):
+    api_meta = {
+        'parameters': [
+            {'name': 'A', 'in': 'query', 'schema': {'$ref': '#/defs/Tag'}},
+            {'name': 'B', 'in': 'query', 'schema': {'properties': {'tag': {'$ref': '#/defs/Tag'}}}},
+        ]
+    }
+    mock_get_meta.return_value = (api_meta, '2014-05-26')
+    with patch.object(api_meta_client.ApiMetaClient, 'get_ref_api_meta',
+                      return_value={'properties': {'Key': {}, 'Value': {}}}) as mock_ref:
+        params = api_meta_client.ApiMetaClient.get_api_parameters('ecs', 'DescribeInstances')
+        params_again = api_meta_client.ApiMetaClient.get_api_parameters('ecs', 'DescribeInstances')
+    # 同一次调用中 Tag 的字段只列出一次
+    assert params == ['A', 'B', 'Key', 'Value', 'tag']
+    assert params_again == params
+    assert mock_ref.call_count == 1
+    graph = api_meta_client.ApiMetaClient.get_schema_graph('ECS', '2014-05-26')
+    assert graph is api_meta_client.ApiMetaClient.get_schema_graph('ecs', '2014-05-26')
+
+
+@patch_meta_http()
+def test_get_api_meta_from_api_docs(mock_get):
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "defaultVersion": "2014-05-26"}],
+        {"apis": {"DescribeInstances": {}, "DescribeRegions": {}}},
+        {"apis": {"DescribeInstances": {"summary": "A"}, "DescribeRegions": {"summary": "B"}}},
+    ]
+    client = api_meta_client.ApiMetaClient
+    assert client.get_api_meta('ecs', 'describeinstances') == ({"summary": "A"}, '2014-05-26')
+    assert client.get_api_meta('ecs', 'DescribeRegions') == ({"summary": "B"}, '2014-05-26')
+    assert mock_get.call_count == 3
+    assert mock_get.call_args[0][0].endswith('products/Ecs/versions/2014-05-26/api-docs.json')
+
+
+@patch_meta_http()
+def test_get_api_meta_api_docs_unavailable(mock_get):
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "defaultVersion": "2014-05-26"}],
+        {"apis": {"DescribeInstances": {}, "DescribeRegions": {}}},
+        Exception('api-docs not found'),
+        {"summary": "A"},
+        {"summary": "B"},
+    ]
+    client = api_meta_client.ApiMetaClient
+    assert client.get_api_meta('ecs', 'DescribeInstances') == ({"summary": "A"}, '2014-05-26')
+    # 不可用的 GetAPIDocs 不会被重复请求
+    assert client.get_api_meta('ecs', 'DescribeRegions') == ({"summary": "B"}, '2014-05-26')
+    assert mock_get.call_count == 5
+    assert mock_get.call_args[0][0].endswith('apis/DescribeRegions/api.json')
+
+
+@patch_meta_http()
+def test_search_apis(mock_get):
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "defaultVersion": "2014-05-26"}],
+        {"apis": {"DescribeInstances": {"title": "查询实例"}, "StartInstance": {"title": "启动实例"}},
+         "directories": [{"title": "实例", "children": ["DescribeInstances", "StartInstance"]}]},
+        {"apis": {"StartInstance": {"parameters": [{"name": "InstanceId"}]}}},
+    ]
+    client = api_meta_client.ApiMetaClient
+    result = client.search_apis('ECS', 'start', limit=5)
+    assert result['total'] == 1
+    assert result['apis'][0]['name'] == 'StartInstance'
+    assert result['apis'][0]['summary'] == '启动实例'
+    # 索引随 overview 文档缓存复用
+    assert client.get_api_search_index('ecs') is client.get_api_search_index('ecs')
+    assert mock_get.call_count == 3
+    with pytest.raises(Exception, match='InvalidServiceName'):
+        client.search_apis('notexist', 'start')
+
+
+def test_get_compact_api_parameters_cached():
+    client = api_meta_client.ApiMetaClient
+    api_meta = {'parameters': [{'name': 'RegionId', 'schema': {'type': 'string', 'required': True,
+                                                               'description': '地域ID。更多说明'}}]}
+    with patch.object(client, 'get_api_meta', return_value=(api_meta, '2014-05-26')), \
+         patch.object(client, 'get_schema_graph') as mock_graph:
+        mock_graph.return_value.resolve.side_effect = lambda schema: schema
+        compact = client.get_compact_api_parameters('ECS', 'DescribeInstances')
+        assert client.get_compact_api_parameters('ecs', 'describeinstances') is compact
+    assert compact == [{'name': 'RegionId', 'type': 'string', 'required': True, 'description': '地域ID。'}]
+    assert mock_graph.return_value.resolve.call_count == 1
+
+
+@patch_meta_http()
+def test_cached_documents_are_compact(mock_get):
+    from alibaba_cloud_ops_mcp_server.alibabacloud.compact_meta import LazyApiDocs, ProductRecord
+    mock_get.return_value.json.side_effect = [
+        [{"code": "Ecs", "name": "ECS", "defaultVersion": "2014-05-26", "style": "RPC"}],
+        {"apis": {"DescribeInstances": {"title": "查询实例"}}},
+        {"apis": {"DescribeInstances": {"summary": "A", "methods": ["post"]}}},
+    ]
+    client = api_meta_client.ApiMetaClient
+    assert client.get_api_meta('ecs', 'DescribeInstances') == ({"summary": "A", "methods": ["post"]}, '2014-05-26')
+    assert isinstance(client.get_product_index()['ecs'], ProductRecord)
+    assert client.get_service_style('ecs') == 'RPC'
+    api_docs = client.get_response_from_pop_api(client.GET_APIDOCS, service='Ecs', version='2014-05-26')
+    assert isinstance(api_docs['apis'], LazyApiDocs)
+    assert client.get_all_service_info() == [{"code": "Ecs", "name": "ECS"}]
@@ -0,0 +1,83 @@
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_search import ApiSearchIndex, directory_tags, tokenize
+
+APIS = {
+    'DescribeInstances': {'title': '查询实例列表', 'summary': '查询一台或多台ECS实例的详细信息'},
+    'StartInstance': {'title': '启动实例', 'summary': '启动一台实例'},
+    'StopInstance': {'title': '停止实例', 'summary': '停止运行一台实例'},
+    'AuthorizeSecurityGroup': {'title': '增加安全组入方向规则', 'summary': '增加一条安全组入方向规则'},
+    'DescribeSecurityGroups': {'title': '查询安全组', 'summary': '查询安全组基本信息'},
+    'CreateDisk': {'title': '创建云盘', 'summary': '创建一块按量付费数据盘'},
+}
+API_DOCS = {
+    'CreateDisk': {'parameters': [{'name': 'ZoneId'}, {'name': 'SnapshotId'}]},
+}
+DIRECTORIES = [
+    {'title': '块存储', 'children': ['CreateDisk', {'title': '快照', 'children': []}]},
+    {'title': '网络与安全', 'children': [{'title': 'security', 'children': ['AuthorizeSecurityGroup']}]},
+]
+
+
+def _index():
+    return ApiSearchIndex(APIS, API_DOCS, directory_tags(DIRECTORIES))
+
+
+def _names(result):
+    return [item['name'] for item in result['apis']]
+
+
+def test_tokenize():
+    assert tokenize('DescribeInstances') == ['describe', 'instance']
+    assert tokenize('VSwitchId') == ['v', 'switch', 'id']
+    assert tokenize('启动实例') == ['启动', '动实', '实例']
+    assert tokenize('') == []
+
+
+def test_directory_tags():
+    assert directory_tags(DIRECTORIES) == {'CreateDisk': ['块存储'], 'AuthorizeSecurityGroup': ['网络与安全', 'security']}
+
+
+def test_search_ranks_name_matches_first():
+    result = _index().search('start instance')
+    assert _names(result)[0] == 'StartInstance'
+    assert set(_names(result)) >= {'DescribeInstances', 'StopInstance'}
+
+
+def test_search_exact_name():
+    assert _names(_index().search('describesecuritygroups'))[0] == 'DescribeSecurityGroups'
+
+
+def test_search_chinese_summary():
+    assert _names(_index().search('安全组规则'))[0] == 'AuthorizeSecurityGroup'
+
+
+def test_search_parameters_and_tags():
+    assert _names(_index().search('snapshot')) == ['CreateDisk']
+    assert _names(_index().search('块存储')) == ['CreateDisk']
+
+
+def test_search_prefix_and_fuzzy():
+    assert _names(_index().search('secur'))[0].endswith(('SecurityGroup', 'SecurityGroups'))
+    assert set(_names(_index().search('instanse'))) == {'DescribeInstances', 'StartInstance', 'StopInstance'}
+
+
+def test_search_paging():
+    index = _index()
+    full = index.search('instance', limit=10)
+    assert full['total'] == 3
+    page = index.search('instance', limit=1, offset=1)
+    assert page['total'] == 3
+    assert _names(page) == _names(full)[1:2]
+    assert index.search('nothing-matches-here')['total'] == 0
+
+
+def test_index_build_keeps_decoded_api_docs():
+    from alibaba_cloud_ops_mcp_server.alibabacloud.compact_meta import LazyApiDocs
+    api_docs = LazyApiDocs(dict(API_DOCS, **{f'Api{i}': {'parameters': [{'name': f'Param{i}'}]} for i in range(64)}))
+    hot = api_docs['CreateDisk']
+    apis = dict(APIS, **{f'Api{i}': {} for i in range(64)})
+    index = ApiSearchIndex(apis, api_docs)
+    # 构建索引读取全部文档，但不挤掉解码缓存中正在使用的 API
+    assert api_docs['CreateDisk'] is hot
+    assert api_docs._decoded.stats()['size'] == 1
+    assert index.search('Param7')['apis'][0]['name'] == 'Api7'
+    assert index.search('SnapshotId')['apis'][0]['name'] == 'CreateDisk'
@@ -0,0 +1,175 @@
+import threading
+import time
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.cache import TTLCache, SingleFlight
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set_and_stats():
+    cache = TTLCache(maxsize=2, ttl=10)
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['size'] == 1
+
+
+def test_ttl_expiry():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set('a', 1)
+    timer.now = 4.9
+    assert 'a' in cache
+    assert cache.get('a') == 1
+    timer.now = 5
+    assert 'a' not in cache
+    assert cache.get('a', 'default') == 'default'
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=0)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.stats()['evictions'] == 1
+
+
+def test_peek():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=5, timer=timer)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.peek('a') == 1
+    assert cache.peek('missing', 'default') == 'default'
+    # peek 不计入命中统计，也不刷新 LRU 顺序
+    assert cache.stats()['hits'] == 0
+    assert cache.stats()['misses'] == 0
+    cache.set('c', 3)
+    assert 'a' not in cache
+    timer.now = 5
+    assert cache.peek('b') is None
+
+
+def test_disabled_cache():
+    cache = TTLCache(maxsize=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+
+
+def test_invalidate():
+    cache = TTLCache()
+    cache.set(('x', 1), 1)
+    cache.set(('y', 2), 2)
+    assert cache.invalidate(lambda key: key[0] == 'x') == 1
+    assert ('y', 2) in cache
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+
+def test_concurrent_access():
+    cache = TTLCache(maxsize=50, ttl=0)
+
+    def worker(n):
+        for i in range(200):
+            cache.set((n, i % 20), i)
+            cache.get((n, i % 20))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) <= 50
+    assert cache.stats()['hits'] == 8 * 200
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('k', fetch))) for _ in range(5)]
+    for t in followers:
+        t.start()
+    while flight.shared < 5:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader] + followers:
+        t.join()
+    assert results == ['value'] * 6
+    assert len(calls) == 1
+    # 调用结束后不再共享，新的调用会重新执行
+    assert flight.do('k', lambda: 'again') == 'again'
+
+
+def test_single_flight_shares_exception():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError('boom')
+
+    errors = []
+
+    def run():
+        try:
+            flight.do('k', fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run)]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=run))
+    threads[1].start()
+    while flight.shared < 1:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(errors) == 2
+
+
+def test_on_evict():
+    now = [0.0]
+    evicted = []
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0], on_evict=lambda key, value: evicted.append(key))
+    cache.set('a', 1)
+    cache.set('a', 2)
+    # 覆盖写入不算淘汰
+    assert evicted == []
+    cache.set('b', 2)
+    cache.set('c', 3)
+    assert evicted == ['a']
+    now[0] = 20
+    assert cache.get('b') is None
+    assert evicted == ['a', 'b']
+    cache.invalidate()
+    assert evicted == ['a', 'b', 'c']
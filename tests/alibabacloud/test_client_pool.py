@@ -0,0 +1,117 @@
+from unittest.mock import patch, MagicMock
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import client_pool as pool_module
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import ClientPool, credential_fingerprint
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+HEADER_CREDENTIALS = {'AccessKeyId': 'id', 'AccessKeySecret': 'secret', 'SecurityToken': None}
+
+
+def test_credential_fingerprint(monkeypatch):
+    fingerprint = credential_fingerprint(HEADER_CREDENTIALS)
+    assert fingerprint.startswith('header:')
+    assert 'secret' not in fingerprint
+    assert fingerprint == credential_fingerprint(dict(HEADER_CREDENTIALS))
+    assert fingerprint != credential_fingerprint(dict(HEADER_CREDENTIALS, AccessKeySecret='other'))
+    assert credential_fingerprint(None) == 'default'
+    monkeypatch.setattr(settings, 'headers_credential_only', True)
+    assert credential_fingerprint(None) == 'anonymous'
+
+
+def test_pool_reuses_clients_per_endpoint_and_credential():
+    pool = ClientPool(maxsize=8, idle_ttl=60)
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=None):
+        first = pool.get('ecs', 'ecs.cn-hangzhou.aliyuncs.com', factory)
+        assert pool.get('ecs', 'ecs.cn-hangzhou.aliyuncs.com', factory) is first
+        other_region = pool.get('ecs', 'ecs.cn-beijing.aliyuncs.com', factory)
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=HEADER_CREDENTIALS):
+        other_credential = pool.get('ecs', 'ecs.cn-hangzhou.aliyuncs.com', factory)
+    assert len({id(first), id(other_region), id(other_credential)}) == 3
+    assert factory.call_count == 3
+    assert pool.stats()['created'] == 3
+    assert pool.stats()['hits'] == 1
+
+
+def test_pool_lru_and_idle_expiry():
+    now = [0.0]
+    pool = ClientPool(maxsize=2, idle_ttl=10)
+    pool._clients._timer = lambda: now[0]
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=None):
+        a = pool.get('ecs', 'a', factory)
+        pool.get('ecs', 'b', factory)
+        now[0] = 8
+        # 使用过的客户端刷新空闲时间
+        assert pool.get('ecs', 'a', factory) is a
+        now[0] = 15
+        assert pool.get('ecs', 'a', factory) is a
+        assert factory.call_count == 2
+        pool.get('ecs', 'b', factory)
+        assert factory.call_count == 3
+        pool.get('ecs', 'c', factory)
+        assert pool.stats()['evictions'] == 1
+
+
+def test_pool_disabled():
+    pool = ClientPool(maxsize=0, idle_ttl=10)
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=None):
+        assert pool.get('ecs', 'a', factory) is not pool.get('ecs', 'a', factory)
+
+
+def test_pool_closes_clients_leaving_the_pool():
+    pool = ClientPool(maxsize=1, idle_ttl=10)
+    closed = []
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=None):
+        a = pool.get('oss', 'a', factory, close=closed.append)
+        assert pool.get('oss', 'a', factory, close=closed.append) is a
+        assert closed == []
+        b = pool.get('oss', 'b', factory, close=closed.append)
+        pool.get('ecs', 'c', factory)
+    assert closed == [a, b]
+    assert pool.stats()['closed'] == 2
+
+
+def test_leased_client_closed_after_release():
+    pool = ClientPool(maxsize=1, idle_ttl=10)
+    closed = []
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=None):
+        with pool.lease('oss', 'a', factory, close=closed.append) as a:
+            with pool.lease('oss', 'a', factory, close=closed.append) as again:
+                assert again is a
+                # 使用中的客户端被淘汰后，延迟到最后一个使用者归还时关闭
+                b = pool.get('oss', 'b', factory, close=closed.append)
+                assert closed == []
+            assert closed == []
+        assert closed == [a]
+        # 未被淘汰的客户端归还后继续留在池中
+        with pool.lease('oss', 'b', factory, close=closed.append) as leased:
+            assert leased is b
+        assert closed == [a]
+        assert pool.stats()['closed'] == 1
+        pool.clear()
+    assert closed == [a, b]
+
+
+def test_lease_skips_client_closed_before_leasing():
+    pool = ClientPool(maxsize=1, idle_ttl=10)
+    closed = []
+    factory = MagicMock(side_effect=lambda: object())
+    with patch.object(pool_module, 'get_credentials_from_header', return_value=None):
+        a = pool.get('oss', 'a', factory, close=closed.append)
+        original_get = pool.get
+
+        def get_then_evict(*args, **kwargs):
+            client = original_get(*args, **kwargs)
+            if client is a:
+                # 取得客户端后、登记使用前被其他调用淘汰
+                pool.get('oss', 'b', factory, close=closed.append)
+            return client
+
+        with patch.object(pool, 'get', side_effect=get_then_evict):
+            with pool.lease('oss', 'a', factory, close=closed.append) as leased:
+                assert leased is not a
+    assert closed[0] is a
@@ -0,0 +1,81 @@
+import json
+import sys
+
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import compact_meta
+from alibaba_cloud_ops_mcp_server.alibabacloud.compact_meta import (
+    ApiRecord, LazyApiDocs, ProductRecord, compact_api_docs, compact_overview, compact_products, intern_keys
+)
+
+API_META = {'summary': '查询实例', 'parameters': [{'name': 'RegionId', 'schema': {'type': 'string'}}]}
+
+
+def test_intern_keys():
+    data = json.loads('{"schema": {"type": "string", "description": "' + 'x' * 100 + '"}, "list": ["string"]}')
+    compact = intern_keys(data)
+    assert compact == data
+    key = next(iter(compact))
+    assert key is sys.intern('schema')
+    assert compact['schema']['type'] is sys.intern('string')
+    assert compact['list'][0] is sys.intern('string')
+
+
+def test_product_record():
+    product = ProductRecord.of({'code': 'Ecs', 'name': 'ECS', 'defaultVersion': '2014-05-26', 'versions': ['x']})
+    assert product.code == 'Ecs'
+    assert product.get('defaultVersion') == '2014-05-26'
+    assert product.get('style', 'RPC') == 'RPC'
+    assert product['name'] == 'ECS'
+    with pytest.raises(KeyError):
+        product['style']
+    assert product == {'code': 'Ecs', 'name': 'ECS', 'defaultVersion': '2014-05-26'}
+    assert ProductRecord.of(product) is product
+    assert not hasattr(product, '__dict__')
+
+
+def test_compact_products_and_overview():
+    products = compact_products([{'code': 'Ecs'}])
+    assert isinstance(products[0], ProductRecord)
+    overview = compact_overview({'apis': {'DescribeInstances': {'title': '查询', 'methods': ['post']}},
+                                 'components': {'schemas': {'Tag': {'type': 'object'}}}})
+    assert overview['apis']['DescribeInstances'] == ApiRecord(title='查询')
+    assert overview['components'] == {'schemas': {'Tag': {'type': 'object'}}}
+    assert compact_overview({'apis': None}) == {'apis': None}
+
+
+def test_lazy_api_docs(monkeypatch):
+    docs = compact_api_docs({'apis': {'DescribeInstances': API_META, 'DescribeRegions': {'summary': 'B'}},
+                             'version': '1'})
+    apis = docs['apis']
+    assert isinstance(apis, LazyApiDocs)
+    assert docs['version'] == '1'
+    assert len(apis) == 2
+    assert set(apis) == {'DescribeInstances', 'DescribeRegions'}
+    assert 'DescribeInstances' in apis
+    assert apis.get('Missing') is None
+    meta = apis['DescribeInstances']
+    assert meta == API_META
+    # 最近使用的 API 保持解码后的结果
+    assert apis['DescribeInstances'] is meta
+    assert apis.encoded_size() > 0
+
+
+def test_lazy_api_docs_peek_bypasses_lru(monkeypatch):
+    monkeypatch.setattr(compact_meta, 'DECODED_APIS_MAXSIZE', 1)
+    apis = LazyApiDocs({'A': {'summary': 'A'}, 'B': {'summary': 'B'}})
+    hot = apis['A']
+    assert apis.peek('B') == {'summary': 'B'}
+    assert apis.peek('C') is None
+    # peek 不写入解码缓存，正在使用的 API 仍在缓存中
+    assert apis.peek('A') is hot
+    assert apis['A'] is hot
+
+
+def test_lazy_api_docs_decoded_lru(monkeypatch):
+    monkeypatch.setattr(compact_meta, 'DECODED_APIS_MAXSIZE', 1)
+    apis = LazyApiDocs({'A': {'summary': 'A'}, 'B': {'summary': 'B'}})
+    first = apis['A']
+    apis['B']
+    assert apis['A'] == first
+    assert apis['A'] is not first
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import utils
+from alibaba_cloud_ops_mcp_server.alibabacloud.credentials import CachedCredentialsProvider
+from alibabacloud_credentials.provider.refreshable import Credentials
+
+
+def make_credentials(token='token', expiration=None):
+    return Credentials(access_key_id='id', access_key_secret='secret', security_token=token,
+                       expiration=expiration, provider_name='test')
+
+
+def make_provider(now, sts_ttl=100, refresh_ahead=20, side_effect=None):
+    source = MagicMock()
+    source.get_credentials.side_effect = side_effect or (lambda: make_credentials())
+    provider = CachedCredentialsProvider(provider=source, sts_ttl=sts_ttl, refresh_ahead=refresh_ahead,
+                                         timer=lambda: now[0])
+    return provider, source
+
+
+def wait_for_refresh(provider):
+    for thread in threading.enumerate():
+        if thread.name == 'credentials-refresh':
+            thread.join(timeout=5)
+
+
+def test_resolves_once_and_caches():
+    now = [0.0]
+    provider, source = make_provider(now)
+    first = provider.get_credentials()
+    now[0] = 50
+    assert provider.get_credentials() is first
+    assert source.get_credentials.call_count == 1
+    stats = provider.stats()
+    assert stats['count'] == 1
+    assert stats['expires_in'] == 50
+
+
+def test_static_access_key_never_expires():
+    now = [0.0]
+    provider, source = make_provider(now, side_effect=lambda: make_credentials(token=None))
+    provider.get_credentials()
+    now[0] = 10 ** 9
+    provider.get_credentials()
+    assert source.get_credentials.call_count == 1
+    assert provider.stats()['expires_in'] is None
+
+
+def test_uses_reported_expiration():
+    now = [0.0]
+    provider, source = make_provider(now, side_effect=lambda: make_credentials(expiration=1000))
+    provider.get_credentials()
+    now[0] = 900
+    provider.get_credentials()
+    assert source.get_credentials.call_count == 1
+    assert provider.stats()['expires_in'] == 100
+
+
+def test_refreshes_ahead_of_expiry_in_background():
+    now = [0.0]
+    provider, source = make_provider(now)
+    first = provider.get_credentials()
+    now[0] = 85
+    # 处于提前刷新窗口内，立即返回缓存的凭证，后台线程负责刷新
+    assert provider.get_credentials() is first
+    wait_for_refresh(provider)
+    assert source.get_credentials.call_count == 2
+    assert provider.get_credentials() is not first
+    assert provider.background_refreshes == 1
+    assert provider.stats()['expires_in'] == 100
+
+
+def test_failed_background_refresh_keeps_cached_credentials():
+    now = [0.0]
+    cached = make_credentials()
+    provider, source = make_provider(now, side_effect=[cached, Exception('metadata service unavailable')])
+    provider.get_credentials()
+    now[0] = 90
+    assert provider.get_credentials() is cached
+    wait_for_refresh(provider)
+    assert provider.failed_refreshes == 1
+    assert provider.get_credentials() is cached
+
+
+def test_expired_credentials_resolve_synchronously():
+    now = [0.0]
+    provider, source = make_provider(now)
+    first = provider.get_credentials()
+    now[0] = 150
+    assert provider.get_credentials() is not first
+    assert source.get_credentials.call_count == 2
+    assert provider.background_refreshes == 0
+
+
+def test_expired_credentials_failure_is_raised():
+    now = [0.0]
+    provider, source = make_provider(now, side_effect=[make_credentials(), Exception('boom')])
+    provider.get_credentials()
+    now[0] = 150
+    with pytest.raises(Exception, match='boom'):
+        provider.get_credentials()
+
+
+def test_get_credentials_async():
+    now = [0.0]
+    provider, source = make_provider(now)
+    credentials = asyncio.run(provider.get_credentials_async())
+    assert credentials.get_access_key_id() == 'id'
+
+
+def test_invalidate():
+    now = [0.0]
+    provider, source = make_provider(now)
+    provider.get_credentials()
+    provider.invalidate()
+    provider.get_credentials()
+    assert source.get_credentials.call_count == 2
+
+
+def test_credential_client_is_process_wide(monkeypatch):
+    assert utils.get_credential_stats() is None
+    client = utils.get_credential_client()
+    assert utils.get_credential_client() is client
+    assert isinstance(client.cloud_credential.provider, CachedCredentialsProvider)
+    assert utils.get_credential_stats()['count'] == 0
+    utils.reset_credential_client()
+    assert utils.get_credential_client() is not client
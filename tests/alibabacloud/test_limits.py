@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastmcp import FastMCP, Client
+from pydantic import Field
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import limits, utils
+from alibaba_cloud_ops_mcp_server.alibabacloud.exception import ToolConcurrencyLimitExceeded
+from alibaba_cloud_ops_mcp_server.alibabacloud.limits import ConcurrencyLimiter, limited
+
+
+async def run_calls(limiter, tenants, hold):
+    """Run one call per tenant in ``tenants``, each holding its slot until ``hold`` is set."""
+    started = []
+
+    async def call(tenant):
+        await limiter.acquire(tenant)
+        started.append(tenant)
+        try:
+            await hold.wait()
+        finally:
+            limiter.release(tenant)
+
+    return started, [asyncio.ensure_future(call(tenant)) for tenant in tenants]
+
+
+def test_global_limit_queues_calls():
+    async def scenario():
+        limiter = ConcurrencyLimiter(max_concurrency=2, max_per_tenant=0, max_queue=10, queue_timeout=5)
+        hold = asyncio.Event()
+        started, tasks = await run_calls(limiter, ['a', 'b', 'c', 'd'], hold)
+        await asyncio.sleep(0.01)
+        assert started == ['a', 'b']
+        assert limiter.stats()['waiting'] == 2
+        hold.set()
+        await asyncio.gather(*tasks)
+        assert started == ['a', 'b', 'c', 'd']
+        assert limiter.stats() == {'active': 0, 'waiting': 0, 'tenants': 0, 'queued': 2, 'rejected': 0}
+
+    asyncio.run(scenario())
+
+
+def test_tenant_at_its_limit_does_not_block_other_tenants():
+    async def scenario():
+        limiter = ConcurrencyLimiter(max_concurrency=3, max_per_tenant=1, max_queue=10, queue_timeout=5)
+        hold = asyncio.Event()
+        started, tasks = await run_calls(limiter, ['scan', 'scan', 'scan', 'other'], hold)
+        await asyncio.sleep(0.01)
+        # 'scan' 的后续调用在队列中等待，'other' 不受影响
+        assert started == ['scan', 'other']
+        hold.set()
+        await asyncio.gather(*tasks)
+        assert started.count('scan') == 3
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects():
+    async def scenario():
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_per_tenant=0, max_queue=1, queue_timeout=5)
+        hold = asyncio.Event()
+        started, tasks = await run_calls(limiter, ['a', 'a'], hold)
+        await asyncio.sleep(0.01)
+        with pytest.raises(ToolConcurrencyLimitExceeded) as e:
+            await limiter.acquire('b')
+        assert 'Throttling.ConcurrencyLimitExceeded' in str(e.value)
+        hold.set()
+        await asyncio.gather(*tasks)
+        assert limiter.rejected == 1
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_rejects():
+    async def scenario():
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_per_tenant=0, max_queue=10, queue_timeout=0.02)
+        await limiter.acquire('a')
+        with pytest.raises(ToolConcurrencyLimitExceeded):
+            await limiter.acquire('b')
+        assert limiter.stats()['waiting'] == 0
+        limiter.release('a')
+        await limiter.acquire('b')
+        assert limiter.stats()['active'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def scenario():
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_per_tenant=0, max_queue=10, queue_timeout=5)
+        await limiter.acquire('a')
+        waiter = asyncio.ensure_future(limiter.acquire('b'))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats()['waiting'] == 0
+        limiter.release('a')
+        assert limiter.stats()['active'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_limited_runs_sync_tools_on_bounded_executor(monkeypatch):
+    monkeypatch.setattr(limits.settings, 'tool_executor_workers', 2)
+
+    def sync_tool(Name: str = Field(description='name', default='x')):
+        """sync tool"""
+        return threading.current_thread().name
+
+    wrapped = limited(sync_tool)
+    assert wrapped.__name__ == 'sync_tool' and wrapped.__doc__ == 'sync tool'
+    assert list(inspect.signature(wrapped).parameters) == ['Name']
+
+    async def scenario():
+        thread_name = await wrapped(Name='y')
+        executor = limits.install_executor()
+        assert executor._max_workers == 2
+        return thread_name
+
+    assert asyncio.run(scenario()).startswith('tool-executor')
+
+
+def test_limited_uses_tenant_of_request_headers():
+    seen = []
+
+    async def tool():
+        seen.append(dict(limits.tool_limiter._by_tenant))
+        return 'ok'
+
+    with patch.object(limits, 'get_credentials_from_header', return_value={'AccessKeyId': 'ak-1'}):
+        assert asyncio.run(limited(tool)()) == 'ok'
+    assert seen == [{'ak-1': 1}]
+    assert limits.tool_limiter.stats()['active'] == 0
+
+
+def test_limited_parses_request_headers_once():
+    seen = []
+
+    async def tool():
+        seen.append(utils.get_credentials_from_header())
+        seen.append(utils.get_credentials_from_header())
+        return 'ok'
+
+    def sync_tool():
+        return utils.get_credentials_from_header()
+
+    with patch.object(utils, 'get_http_request') as mock_get_request:
+        mock_get_request.return_value.headers = {'x-acs-accesskey-id': 'ak-1', 'x-acs-accesskey-secret': 'sk'}
+        assert asyncio.run(limited(tool)()) == 'ok'
+        assert mock_get_request.call_count == 1
+        # 同步工具在线程池中执行，同样复用本次调用解析的凭证
+        assert asyncio.run(limited(sync_tool)())['AccessKeyId'] == 'ak-1'
+        assert mock_get_request.call_count == 2
+    assert [credentials['AccessKeyId'] for credentials in seen] == ['ak-1', 'ak-1']
+
+
+def test_limited_tool_registered_in_fastmcp():
+    mcp = FastMCP(name='test')
+
+    async def Echo(Text: str = Field(description='text')):
+        """echo"""
+        return Text
+
+    mcp.tool(limited(Echo))
+
+    async def scenario():
+        async with Client(mcp) as client:
+            tools = await client.list_tools()
+            assert tools[0].name == 'Echo'
+            assert 'Text' in tools[0].inputSchema['properties']
+            result = await client.call_tool('Echo', {'Text': 'hi'})
+            return result[0].text
+
+    assert asyncio.run(scenario()) == 'hi'
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.meta_store import MetaDiskStore
+
+
+def test_save_and_load(tmp_path):
+    store = MetaDiskStore(str(tmp_path))
+    store.save('products/Ecs/versions/2014-05-26/overview.json', {'apis': {'A': {}}},
+               etag='"abc"', last_modified='Wed, 21 Oct 2015 07:28:00 GMT')
+    entry = store.load('products/Ecs/versions/2014-05-26/overview.json')
+    assert entry.body == {'apis': {'A': {}}}
+    assert entry.etag == '"abc"'
+    assert entry.age() < 5
+    assert entry.conditional_headers() == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+    }
+    assert os.path.exists(tmp_path / 'products/Ecs/versions/2014-05-26/overview.json')
+
+
+def test_load_missing_and_corrupt(tmp_path):
+    store = MetaDiskStore(str(tmp_path))
+    assert store.load('products.json') is None
+    (tmp_path / 'products.json').write_text('{not json')
+    assert store.load('products.json') is None
+
+
+def test_load_without_sidecar(tmp_path):
+    (tmp_path / 'products.json').write_text(json.dumps([{'code': 'Ecs'}]))
+    entry = MetaDiskStore(str(tmp_path)).load('products.json')
+    assert entry.body == [{'code': 'Ecs'}]
+    assert entry.conditional_headers() == {}
+    assert entry.fetched_at == 0.0
+
+
+def test_touch_updates_fetched_at(tmp_path):
+    store = MetaDiskStore(str(tmp_path))
+    store.save('products.json', [], etag='"v1"')
+    entry = store.load('products.json')
+    entry.fetched_at = 0.0
+    store.touch('products.json', entry)
+    reloaded = store.load('products.json')
+    assert reloaded.fetched_at > 0
+    assert reloaded.etag == '"v1"'
+
+
+def test_path_traversal_rejected(tmp_path):
+    store = MetaDiskStore(str(tmp_path / 'cache'))
+    with pytest.raises(ValueError):
+        store.load('../outside.json')
@@ -0,0 +1,28 @@
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.metrics import LatencyStats
+
+
+def test_record_and_snapshot():
+    stats = LatencyStats()
+    stats.record(0.5)
+    stats.record(1.5, error=True)
+    snapshot = stats.snapshot()
+    assert snapshot['count'] == 2
+    assert snapshot['errors'] == 1
+    assert snapshot['avg_seconds'] == 1.0
+    assert snapshot['max_seconds'] == 1.5
+
+
+def test_time_context_manager():
+    stats = LatencyStats()
+    with stats.time():
+        pass
+    with pytest.raises(ValueError):
+        with stats.time():
+            raise ValueError('boom')
+    assert stats.snapshot()['count'] == 2
+    assert stats.snapshot()['errors'] == 1
+    stats.reset()
+    assert stats.snapshot()['count'] == 0
+    assert stats.snapshot()['avg_seconds'] == 0.0
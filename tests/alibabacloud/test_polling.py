@@ -0,0 +1,153 @@
+import asyncio
+import itertools
+from unittest.mock import patch
+
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.polling import BatchPoller, PollStrategy
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+
+def test_intervals_fast_then_exponential():
+    strategy = PollStrategy(initial_interval=0.5, fast_polls=3, multiplier=2, max_interval=5, jitter=0, timeout=0)
+    assert [strategy.interval(i) for i in range(8)] == [0.5, 0.5, 0.5, 1, 2, 4, 5, 5]
+    assert list(itertools.islice(strategy.delays(), 8)) == [0.5, 0.5, 0.5, 1, 2, 4, 5, 5]
+
+
+def test_jitter_bounds():
+    low = PollStrategy(initial_interval=1, fast_polls=1, jitter=0.2, timeout=0, rand=lambda: 0.0)
+    high = PollStrategy(initial_interval=1, fast_polls=1, jitter=0.2, timeout=0, rand=lambda: 1.0)
+    assert next(low.delays()) == pytest.approx(0.8)
+    assert next(high.delays()) == pytest.approx(1.2)
+
+
+def test_deadline():
+    clock = [0.0]
+    strategy = PollStrategy(initial_interval=1, fast_polls=0, multiplier=2, max_interval=100, jitter=0, timeout=10,
+                            timer=lambda: clock[0])
+    delays = []
+    for delay in strategy.delays():
+        delays.append(delay)
+        clock[0] += delay
+    # 最后一次等待被截断到截止时间
+    assert delays == [2, 4, 4]
+    assert clock[0] == 10
+
+
+def test_defaults_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, 'oos_poll_max_interval', 7.0)
+    monkeypatch.setattr(settings, 'oos_poll_timeout', 0)
+    strategy = PollStrategy()
+    assert strategy.max_interval == 7.0
+    assert strategy.interval(100) == 7.0
+
+
+def make_poller(states, fetched, **kwargs):
+    """states: key -> 按轮次返回的状态列表，最后一个状态保持不变"""
+    async def fetch(group, keys, since):
+        fetched.append((group, sorted(keys)))
+        result = {}
+        for key in keys:
+            history = states[key]
+            result[key] = history.pop(0) if len(history) > 1 else history[0]
+        return result
+
+    kwargs.setdefault('strategy_factory', lambda: PollStrategy(initial_interval=0.001, fast_polls=1, multiplier=1,
+                                                               max_interval=0.001, jitter=0, timeout=0))
+    return BatchPoller(fetch, is_done=lambda state: state == 'done',
+                       timeout_error=lambda key, strategy: TimeoutError(key), **kwargs)
+
+
+def test_batch_poller_one_fetch_per_round():
+    states = {f'k{i}': ['running'] * (i % 3 + 1) + ['done'] for i in range(20)}
+    fetched = []
+    poller = make_poller(states, fetched)
+    updates = []
+
+    async def on_update(state, polls):
+        updates.append(polls)
+
+    async def scenario():
+        return await asyncio.gather(*(poller.wait('region', key, on_update) for key in states))
+
+    assert asyncio.run(scenario()) == ['done'] * 20
+    # 20 个操作共用一个轮询循环，每轮只查询一次
+    assert len(fetched) == poller.rounds <= 5
+    assert fetched[0] == ('region', sorted(states))
+    assert max(updates) == 3
+    assert poller.stats()['groups'] == 0
+
+
+def test_batch_poller_groups_and_timeout():
+    clock = [0.0]
+    states = {'a': ['running'], 'b': ['done']}
+    fetched = []
+    poller = make_poller(states, fetched, strategy_factory=lambda: PollStrategy(
+        initial_interval=1, fast_polls=0, multiplier=1, max_interval=1, jitter=0, timeout=3, timer=lambda: clock[0]))
+
+    async def fake_sleep(delay):
+        clock[0] += delay
+
+    async def scenario():
+        return await asyncio.gather(poller.wait('r1', 'a'), poller.wait('r2', 'b'), return_exceptions=True)
+
+    with patch('asyncio.sleep', fake_sleep):
+        timed_out, done = asyncio.run(scenario())
+    assert isinstance(timed_out, TimeoutError)
+    assert done == 'done'
+    assert {group for group, _ in fetched} == {'r1', 'r2'}
+
+
+def test_batch_poller_new_waiter_keeps_schedules():
+    clock = [0.0]
+    states = {'a': ['running'] * 3 + ['done'], 'b': ['done']}
+    polled_at = []
+
+    async def fetch(group, keys, since):
+        polled_at.append((clock[0], sorted(keys)))
+        return {key: states[key].pop(0) if len(states[key]) > 1 else states[key][0] for key in keys}
+
+    poller = BatchPoller(fetch, is_done=lambda state: state == 'done',
+                         timeout_error=lambda key, strategy: TimeoutError(key),
+                         strategy_factory=lambda: PollStrategy(initial_interval=10, fast_polls=0, multiplier=1,
+                                                               max_interval=10, jitter=0, timeout=0),
+                         timer=lambda: clock[0])
+    real_sleep = asyncio.sleep
+    first_sleep = asyncio.Event()
+
+    async def fake_sleep(delay):
+        if delay and not first_sleep.is_set():
+            # 首次等待在第 4 秒被新操作打断，之后的等待都按时结束
+            first_sleep.set()
+            clock[0] += 4
+            await asyncio.get_running_loop().create_future()
+        clock[0] += delay
+        await real_sleep(0)
+
+    async def scenario():
+        waiting = asyncio.ensure_future(poller.wait('region', 'a'))
+        await first_sleep.wait()
+        await poller.wait('region', 'b')
+        return await waiting
+
+    with patch('asyncio.sleep', fake_sleep):
+        assert asyncio.run(scenario()) == 'done'
+    # b 加入时只查询 b，a 仍按原计划每 10 秒查询一次
+    assert polled_at == [(0, ['a']), (4, ['b']), (10, ['a']), (20, ['a']), (30, ['a'])]
+
+
+def test_batch_poller_fetch_failures():
+    calls = []
+
+    async def fetch(group, keys, since):
+        calls.append(keys)
+        raise RuntimeError('throttled')
+
+    poller = BatchPoller(fetch, is_done=lambda state: True, timeout_error=lambda key, strategy: TimeoutError(key),
+                         strategy_factory=lambda: PollStrategy(initial_interval=0.001, fast_polls=5, jitter=0,
+                                                               timeout=0),
+                         max_failed_rounds=3)
+    with pytest.raises(RuntimeError):
+        asyncio.run(poller.wait('region', 'k'))
+    # 连续失败达到上限后才放弃
+    assert len(calls) == 3
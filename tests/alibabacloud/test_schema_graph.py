@@ -0,0 +1,91 @@
+import threading
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.schema_graph import SchemaGraph
+
+COMPONENTS = {
+    '#/components/schemas/Instance': {
+        'type': 'object',
+        'properties': {
+            'InstanceId': {'type': 'string'},
+            'Disk': {'$ref': '#/components/schemas/Disk'},
+            'Tags': {'type': 'array', 'items': {'$ref': '#/components/schemas/Tag'}},
+        }
+    },
+    '#/components/schemas/Disk': {
+        'type': 'object',
+        'properties': {
+            'DiskId': {'type': 'string'},
+            'Instance': {'$ref': '#/components/schemas/Instance'},
+        }
+    },
+    '#/components/schemas/Tag': {
+        'type': 'object',
+        'properties': {'Key': {'type': 'string'}, 'Value': {'type': 'string'}}
+    },
+}
+
+
+def make_graph():
+    calls = []
+
+    def resolver(ref_path):
+        calls.append(ref_path)
+        return COMPONENTS[ref_path]
+
+    return SchemaGraph(resolver), calls
+
+
+def test_property_names_follow_refs_and_cycles():
+    graph, calls = make_graph()
+    names = graph.property_names({'$ref': '#/components/schemas/Instance'})
+    assert names == ['InstanceId', 'Disk', 'DiskId', 'Instance', 'Tags']
+    # 入口不同，结果也不受首次访问顺序影响
+    assert graph.property_names({'$ref': '#/components/schemas/Disk'}) == \
+        ['DiskId', 'Instance', 'InstanceId', 'Disk', 'Tags']
+    assert graph.property_names('not a dict') == []
+    assert sorted(calls) == ['#/components/schemas/Disk', '#/components/schemas/Instance']
+
+
+def test_property_names_share_visited_refs():
+    graph, calls = make_graph()
+    visited_refs = set()
+    assert graph.property_names({'$ref': '#/components/schemas/Tag'}, visited_refs) == ['Key', 'Value']
+    # 共用 visited_refs 时已展开的组件不再重复列出
+    assert graph.property_names({'properties': {'Tag': {'$ref': '#/components/schemas/Tag'}}}, visited_refs) == \
+        ['Tag']
+    assert visited_refs == {'#/components/schemas/Tag'}
+
+
+def test_resolver_called_without_lock():
+    graph = None
+    nested = []
+
+    def resolver(ref_path):
+        if ref_path == '#/components/schemas/Instance':
+            # 获取组件期间其他线程仍可使用同一个解析图
+            thread = threading.Thread(target=lambda: nested.append(graph.component('#/components/schemas/Tag')))
+            thread.start()
+            thread.join(timeout=5)
+        return COMPONENTS[ref_path]
+
+    graph = SchemaGraph(resolver)
+    assert graph.component('#/components/schemas/Instance') is COMPONENTS['#/components/schemas/Instance']
+    assert nested == [COMPONENTS['#/components/schemas/Tag']]
+
+
+def test_component_resolved_once():
+    graph, calls = make_graph()
+    for _ in range(3):
+        graph.property_names({'properties': {'Tag': {'$ref': '#/components/schemas/Tag'}}})
+    assert calls == ['#/components/schemas/Tag']
+
+
+def test_resolve_inlines_nested_refs():
+    graph, calls = make_graph()
+    resolved = graph.resolve({'$ref': '#/components/schemas/Instance'})
+    assert resolved['properties']['Tags']['items']['properties']['Key'] == {'type': 'string'}
+    disk = resolved['properties']['Disk']
+    assert disk['properties']['DiskId'] == {'type': 'string'}
+    assert disk['properties']['Instance'] == {'$ref': '#/components/schemas/Instance'}
+    assert graph.resolve([{'type': 'string'}, 1]) == [{'type': 'string'}, 1]
+    assert len(calls) == 3
@@ -0,0 +1,89 @@
+import json
+from unittest.mock import patch
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import schema_index
+from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import ToolSchemaIndex, compact_api_meta
+
+API_META = {
+    'summary': '查询实例',
+    'methods': ['post'],
+    'path': '/',
+    'responses': {'200': {'schema': {'type': 'object'}}},
+    'parameters': [
+        {'name': 'RegionId', 'in': 'query',
+         'schema': {'type': 'string', 'required': True, 'description': '地域', 'example': 'cn-hangzhou',
+                    'title': 'ignored'}},
+        {'name': 'Tag.1.Key', 'schema': {'type': 'string'}},
+        {'name': 'PageSize', 'schema': {'type': 'integer'}},
+    ],
+}
+
+
+def test_compact_api_meta():
+    assert compact_api_meta(API_META) == {
+        'summary': '查询实例',
+        'parameters': [
+            {'name': 'RegionId',
+             'schema': {'type': 'string', 'required': True, 'description': '地域', 'example': 'cn-hangzhou'}},
+            {'name': 'PageSize', 'schema': {'type': 'integer'}},
+        ],
+    }
+
+
+def test_put_get_and_contains():
+    index = ToolSchemaIndex()
+    assert index.get('ecs', 'DescribeInstances') is None
+    index.put('ECS', 'DescribeInstances', API_META)
+    assert index.dirty
+    assert ('ecs', 'DescribeInstances') in index
+    assert index.get('Ecs', 'DescribeInstances')['summary'] == '查询实例'
+
+
+def test_most_used():
+    index = ToolSchemaIndex()
+    api_list = [('ecs', 'A'), ('ecs', 'B'), ('vpc', 'C'), ('vpc', 'D')]
+    for _ in range(3):
+        index.record_call('vpc', 'C')
+    index.record_call('ecs', 'B')
+    assert index.most_used(api_list, 5) == [('vpc', 'C'), ('ecs', 'B')]
+    assert index.most_used(api_list, 1) == [('vpc', 'C')]
+    assert index.most_used(api_list, 0) == []
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / 'index' / 'tool_schema_index.json'
+    index = ToolSchemaIndex()
+    index.put('ecs', 'DescribeInstances', API_META)
+    index.record_call('ecs', 'DescribeInstances')
+    index.save(str(path))
+    assert not index.dirty
+    loaded = ToolSchemaIndex.load(str(path))
+    assert loaded.get('ecs', 'DescribeInstances') == compact_api_meta(API_META)
+    assert loaded.most_used([('ecs', 'DescribeInstances')], 1) == [('ecs', 'DescribeInstances')]
+
+
+def test_load_invalid_files(tmp_path):
+    assert len(ToolSchemaIndex.load(str(tmp_path / 'missing.json'))) == 0
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{')
+    assert len(ToolSchemaIndex.load(str(broken))) == 0
+    other_format = tmp_path / 'other.json'
+    other_format.write_text(json.dumps({'format': 99, 'apis': {'ecs/A': {}}}))
+    assert len(ToolSchemaIndex.load(str(other_format))) == 0
+
+
+def test_load_schema_index_overlays_cache_dir(tmp_path):
+    cached = ToolSchemaIndex()
+    cached.put('vpc', 'DescribeVpcs', {'summary': 'vpc'})
+    cached.save(schema_index.cache_index_path(str(tmp_path)))
+    index = schema_index.load_schema_index(str(tmp_path))
+    assert index.get('vpc', 'DescribeVpcs') == {'summary': 'vpc', 'parameters': []}
+    assert not index.dirty
+
+
+def test_load_schema_index_warns_without_bundled_index(tmp_path, caplog):
+    # 未随包构建索引时，懒加载模式启动时需要获取全部 API META，需明确提示
+    with patch.object(schema_index.resources, 'files', return_value=tmp_path):
+        index = schema_index.load_schema_index()
+    assert len(index) == 0
+    assert 'No bundled tool schema index' in caplog.text
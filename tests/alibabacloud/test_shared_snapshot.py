@@ -0,0 +1,110 @@
+import os
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import shared_snapshot
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.alibabacloud.shared_snapshot import (
+    SharedSnapshot, get_shared_documents, write_shared_snapshot
+)
+from alibaba_cloud_ops_mcp_server.settings import settings
+from alibaba_cloud_ops_mcp_server import workers
+
+PRODUCTS = [{"code": "Ecs", "name": "Elastic Compute Service", "defaultVersion": "2014-05-26", "style": "RPC"}]
+DOCUMENTS = {
+    'products.json': PRODUCTS,
+    'products/Ecs/versions/2014-05-26/overview.json': {"apis": {"DescribeInstances": {}}},
+    'products/Ecs/versions/2014-05-26/api-docs.json': {},
+    'products/Ecs/versions/2014-05-26/apis/DescribeInstances/api.json': {"summary": "查询实例", "parameters": []},
+}
+
+
+def test_write_and_read(tmp_path):
+    path = str(tmp_path / 'meta.bin')
+    write_shared_snapshot(path, DOCUMENTS)
+    snapshot = SharedSnapshot(path)
+    try:
+        assert len(snapshot) == 4
+        assert set(snapshot) == set(DOCUMENTS)
+        for relative_path, document in DOCUMENTS.items():
+            assert snapshot[relative_path] == document
+        assert 'missing.json' not in snapshot
+        with pytest.raises(KeyError):
+            snapshot['missing.json']
+        assert snapshot.size() == os.path.getsize(path)
+    finally:
+        snapshot.close()
+    # 原子写入，不残留临时文件
+    assert os.listdir(tmp_path) == ['meta.bin']
+
+
+def test_bad_magic(tmp_path):
+    path = tmp_path / 'meta.bin'
+    path.write_bytes(b'not a snapshot at all')
+    with pytest.raises(ValueError):
+        SharedSnapshot(str(path))
+
+
+def test_get_shared_documents(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', None)
+    assert get_shared_documents() is None
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', str(tmp_path / 'missing.bin'))
+    assert get_shared_documents() is None
+    path = write_shared_snapshot(str(tmp_path / 'meta.bin'), DOCUMENTS)
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', path)
+    shared = get_shared_documents()
+    assert shared['products.json'] == PRODUCTS
+    assert get_shared_documents() is shared
+
+
+@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.Session.get')
+def test_api_meta_served_from_shared_snapshot(mock_get, tmp_path, monkeypatch):
+    path = write_shared_snapshot(str(tmp_path / 'meta.bin'), DOCUMENTS)
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', path)
+    data, version = ApiMetaClient.get_api_meta('ecs', 'DescribeInstances')
+    assert version == '2014-05-26'
+    assert data['summary'] == '查询实例'
+    mock_get.assert_not_called()
+    # 共享快照中的文档不复制到进程私有的缓存
+    assert len(ApiMetaClient._cache) == 0
+    assert ApiMetaClient.get_api_meta('ecs', 'DescribeInstances')[0] is data
+    assert ApiMetaClient.get_product_index() is ApiMetaClient.get_product_index()
+
+
+def test_get_shared_documents_failure_remembered(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', str(tmp_path / 'missing.bin'))
+    with patch.object(shared_snapshot, 'SharedSnapshot', side_effect=OSError('missing')) as mock_snapshot, \
+         patch.object(shared_snapshot.logger, 'warning') as mock_warning:
+        assert get_shared_documents() is None
+        assert get_shared_documents() is None
+    mock_snapshot.assert_called_once()
+    mock_warning.assert_called_once()
+    # 换一个快照路径后重新尝试映射
+    path = write_shared_snapshot(str(tmp_path / 'meta.bin'), DOCUMENTS)
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', path)
+    assert get_shared_documents() is not None
+
+
+def test_run_workers_clears_parent_meta_cache(monkeypatch):
+    ApiMetaClient._cache.set(('GetProductList', None, None, None), PRODUCTS)
+    monkeypatch.setattr(workers, 'bind_socket', lambda host, port: MagicMock())
+    monkeypatch.setattr(workers.multiprocessing, 'get_context', MagicMock(side_effect=RuntimeError('stop')))
+    with pytest.raises(RuntimeError):
+        workers.run_workers(MagicMock(), 'sse', '127.0.0.1', 0, 2, '/tmp/not-created.bin')
+    assert len(ApiMetaClient._cache) == 0
+
+
+def test_prepare_shared_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', None)
+    with patch.object(shared_snapshot._ApiMetaSource, 'get', side_effect=lambda p: DOCUMENTS[p]):
+        path = workers.prepare_shared_snapshot([], {'ecs': ['DescribeInstances']}, str(tmp_path))
+    assert path == settings.meta_shared_snapshot
+    assert set(SharedSnapshot(path)) == set(DOCUMENTS)
+
+
+def test_prepare_shared_snapshot_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', None)
+    with patch.object(shared_snapshot._ApiMetaSource, 'get', side_effect=Exception('unavailable')):
+        assert workers.prepare_shared_snapshot(['ecs'], {}, str(tmp_path)) is None
+    assert settings.meta_shared_snapshot is None
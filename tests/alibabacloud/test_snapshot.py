@@ -0,0 +1,154 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import snapshot
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+PRODUCTS = [
+    {"code": "Ecs", "name": "Elastic Compute Service", "defaultVersion": "2014-05-26", "style": "RPC"},
+    {"code": "Vpc", "name": "Virtual Private Cloud", "defaultVersion": "2016-04-28", "style": "RPC"},
+]
+ECS_OVERVIEW = {"apis": {"DescribeInstances": {}, "DescribeRegions": {}}}
+DESCRIBE_INSTANCES = {"summary": "查询实例", "methods": ["post"], "path": "/", "parameters": []}
+VPC_OVERVIEW = {"apis": {"DescribeVpcs": {}}}
+VPC_API_DOCS = {"apis": {"DescribeVpcs": {"summary": "查询VPC", "methods": ["post"], "path": "/", "parameters": []}}}
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    root = tmp_path / 'mirror'
+    _write(root / 'products.json', PRODUCTS)
+    _write(root / 'products/Ecs/versions/2014-05-26/overview.json', ECS_OVERVIEW)
+    _write(root / 'products/Ecs/versions/2014-05-26/apis/DescribeInstances/api.json', DESCRIBE_INSTANCES)
+    _write(root / 'products/Vpc/versions/2016-04-28/overview.json', VPC_OVERVIEW)
+    _write(root / 'products/Vpc/versions/2016-04-28/api-docs.json', VPC_API_DOCS)
+    return root
+
+
+def test_build_snapshot_documents_from_mirror(mirror):
+    source = snapshot._MetaSource(str(mirror))
+    documents = snapshot.build_snapshot_documents(['ecs', 'vpc', 'notexist'],
+                                                  {'ecs': ['describeinstances', 'Missing'], 'Vpc': ['DescribeVpcs']},
+                                                  source)
+    assert set(documents) == {
+        'products.json',
+        'products/Ecs/versions/2014-05-26/overview.json',
+        'products/Ecs/versions/2014-05-26/apis/DescribeInstances/api.json',
+        'products/Ecs/versions/2014-05-26/api-docs.json',
+        'products/Vpc/versions/2016-04-28/overview.json',
+        'products/Vpc/versions/2016-04-28/api-docs.json',
+    }
+
+
+def test_write_and_read_snapshot(tmp_path):
+    path = tmp_path / 'snapshot.json.gz'
+    snapshot.write_snapshot(str(path), {'products.json': PRODUCTS})
+    assert snapshot.read_snapshot(str(path)) == {'products.json': PRODUCTS}
+
+
+def test_cli_builds_snapshot(mirror, tmp_path):
+    output = tmp_path / 'out' / 'snapshot.json.gz'
+    with patch('alibaba_cloud_ops_mcp_server.config.config', {'ecs': ['DescribeInstances']}):
+        result = CliRunner().invoke(snapshot.main, ['--output', str(output), '--source', str(mirror),
+                                                    '--services', 'ecs'])
+    assert result.exit_code == 0, result.output
+    assert 'Wrote 4 documents' in result.output
+    assert len(snapshot.read_snapshot(str(output))) == 4
+
+
+def test_get_bundled_documents_missing_file(tmp_path):
+    snapshot.reset_bundled_documents()
+    with patch.object(snapshot, '_bundled_snapshot_path', return_value=tmp_path / 'missing.json.gz'):
+        assert snapshot.get_bundled_documents() == {}
+    snapshot.reset_bundled_documents()
+
+
+@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.Session.get')
+def test_api_meta_served_from_snapshot(mock_get, monkeypatch, mirror):
+    documents = snapshot.build_snapshot_documents(
+        ['ecs'], {'ecs': ['DescribeInstances']}, snapshot._MetaSource(str(mirror)))
+    monkeypatch.setattr(settings, 'meta_use_snapshot', True)
+    with patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.get_bundled_documents',
+               return_value=documents):
+        data, version = ApiMetaClient.get_api_meta('ecs', 'DescribeInstances')
+    assert data == DESCRIBE_INSTANCES
+    assert version == '2014-05-26'
+    mock_get.assert_not_called()
+
+
+@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.Session.get')
+def test_api_docs_served_from_snapshot(mock_get, monkeypatch, mirror):
+    documents = snapshot.build_snapshot_documents(['vpc'], {}, snapshot._MetaSource(str(mirror)))
+    monkeypatch.setattr(settings, 'meta_use_snapshot', True)
+    with patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.get_bundled_documents',
+               return_value=documents):
+        data, version = ApiMetaClient.get_api_meta('vpc', 'DescribeVpcs')
+    assert data == VPC_API_DOCS['apis']['DescribeVpcs']
+    assert version == '2016-04-28'
+    mock_get.assert_not_called()
+
+
+@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.Session.get')
+def test_build_schema_index_from_documents(mock_get, monkeypatch, mirror):
+    documents = snapshot.build_snapshot_documents(
+        ['ecs', 'vpc'], {'ecs': ['DescribeInstances'], 'vpc': ['DescribeVpcs']}, snapshot._MetaSource(str(mirror)))
+    monkeypatch.setattr(settings, 'meta_use_snapshot', True)
+    index = snapshot.build_schema_index({'ecs': ['DescribeInstances'], 'vpc': ['DescribeVpcs']}, documents)
+    assert len(index) == 2
+    assert index.get('ecs', 'DescribeInstances') == {'summary': '查询实例', 'parameters': []}
+    assert index.get('vpc', 'DescribeVpcs') == {'summary': '查询VPC', 'parameters': []}
+    mock_get.assert_not_called()
+
+
+def test_cli_builds_schema_index(mirror, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'meta_use_snapshot', True)
+    output = tmp_path / 'out' / 'snapshot.json.gz'
+    index_path = tmp_path / 'out' / 'tool_schema_index.json'
+    with patch('alibaba_cloud_ops_mcp_server.config.config', {'ecs': ['DescribeInstances'], 'vpc': ['DescribeVpcs']}):
+        result = CliRunner().invoke(snapshot.main, ['--output', str(output), '--source', str(mirror),
+                                                    '--services', 'ecs', '--schema-index', str(index_path)])
+    assert result.exit_code == 0, result.output
+    assert 'Wrote 1 tool schemas' in result.output
+    assert json.loads(index_path.read_text())['apis'] == {
+        'ecs/DescribeInstances': {'summary': '查询实例', 'parameters': []}}
+
+
+def test_bundled_snapshot_expired(tmp_path):
+    path = tmp_path / 'meta_snapshot.json.gz'
+    snapshot.write_snapshot(str(path), {'products.json': PRODUCTS})
+    snapshot.reset_bundled_documents()
+    try:
+        with patch.object(snapshot, '_bundled_snapshot_path', return_value=path):
+            assert snapshot.get_bundled_documents() == {'products.json': PRODUCTS}
+            assert not snapshot.bundled_snapshot_expired(3600)
+            assert not snapshot.bundled_snapshot_expired(0)
+            with patch.object(snapshot.time, 'time', return_value=snapshot._bundled_created_at + 3600):
+                assert snapshot.bundled_snapshot_expired(3600)
+    finally:
+        snapshot.reset_bundled_documents()
+
+
+@patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.requests.Session.get')
+def test_expired_snapshot_refreshed_from_meta_endpoint(mock_get, monkeypatch, mirror):
+    """快照过期后优先使用元数据服务的最新文档，元数据服务不可用时仍使用快照"""
+    documents = snapshot.build_snapshot_documents(['ecs'], {}, snapshot._MetaSource(str(mirror)))
+    monkeypatch.setattr(settings, 'meta_use_snapshot', True)
+    fresh = PRODUCTS + [{"code": "Rds", "name": "RDS", "defaultVersion": "2014-08-15", "style": "RPC"}]
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = fresh
+    with patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.get_bundled_documents',
+               return_value=documents), \
+         patch('alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client.bundled_snapshot_expired',
+               return_value=True):
+        assert ApiMetaClient.fetch_document('products.json') == fresh
+        mock_get.side_effect = Exception('unreachable')
+        assert ApiMetaClient.fetch_document('products.json') == PRODUCTS
@@ -53,6 +53,26 @@ def test_get_credentials_from_header_exception():
         assert result is None
         mock_logger.info.assert_called_once_with('get_credentials_from_header error: test error')
 
+def test_get_credentials_from_header_without_request():
+    """没有 HTTP 请求（stdio 模式）时直接返回 None，不记录错误"""
+    with patch('alibaba_cloud_ops_mcp_server.alibabacloud.utils.get_http_request') as mock_get_request, \
+         patch('alibaba_cloud_ops_mcp_server.alibabacloud.utils.logger') as mock_logger:
+        mock_get_request.side_effect = RuntimeError('No active HTTP request found.')
+        assert utils.get_credentials_from_header() is None
+        mock_logger.info.assert_not_called()
+
+def test_request_credentials_reused():
+    """同一次调用中复用已解析的请求头凭证"""
+    credentials = {'AccessKeyId': 'ak', 'AccessKeySecret': 'sk', 'SecurityToken': None}
+    with patch('alibaba_cloud_ops_mcp_server.alibabacloud.utils.get_http_request') as mock_get_request:
+        with utils.request_credentials(credentials):
+            assert utils.get_credentials_from_header() is credentials
+            assert utils.get_credentials_from_header() is credentials
+        mock_get_request.assert_not_called()
+        mock_get_request.return_value.headers = {}
+        assert utils.get_credentials_from_header() is None
+        mock_get_request.assert_called_once()
+
 def test_create_config_with_credentials():
     """测试使用header中的凭证创建config的情况"""
     with patch('alibaba_cloud_ops_mcp_server.alibabacloud.utils.get_credentials_from_header') as mock_get_creds, \
@@ -0,0 +1,104 @@
+from unittest.mock import patch, MagicMock
+
+from click.testing import CliRunner
+
+from alibaba_cloud_ops_mcp_server.alibabacloud import warmup
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.settings import settings
+
+PRODUCT_INDEX = {'ecs': {'code': 'Ecs'}, 'vpc': {'code': 'Vpc'}}
+
+
+def test_warm_up_meta_cache():
+    def get_api_meta(service, api):
+        if api == 'Broken':
+            raise Exception('meta-fail')
+        return {}, '2014-05-26'
+
+    with patch.object(ApiMetaClient, 'get_product_index', return_value=PRODUCT_INDEX), \
+         patch.object(ApiMetaClient, 'get_api_index', return_value={}) as mock_overview, \
+         patch.object(ApiMetaClient, 'get_api_meta', side_effect=get_api_meta) as mock_meta:
+        report = warmup.warm_up_meta_cache(['ecs', 'notexist'], {'ECS': ['DescribeInstances', 'Broken'],
+                                                                 'vpc': ['DescribeVpcs']}, concurrency=4)
+    assert sorted(call.args[0] for call in mock_overview.call_args_list) == ['ecs', 'vpc']
+    assert mock_meta.call_count == 3
+    assert report['services'] == 2
+    assert report['apis'] == 3
+    assert sorted(report['failed']) == ['ECS.Broken', 'notexist']
+    assert report['seconds'] >= report['apis_seconds']
+
+
+def test_warm_up_meta_cache_uses_canonical_service_code(monkeypatch):
+    """预热写入的 overview 缓存键与运行时 get_api_meta 使用的规范 service code 一致"""
+    monkeypatch.setattr(settings, 'meta_use_api_docs', False)
+    requested = []
+
+    def fetch(pop_api_name, service=None, api=None, version=None):
+        requested.append((pop_api_name, service, version, api))
+        if pop_api_name == ApiMetaClient.GET_PRODUCT_LIST:
+            return [{'code': 'Ecs', 'defaultVersion': '2014-05-26'}]
+        if pop_api_name == ApiMetaClient.GET_API_OVERVIEW:
+            return {'apis': {'DescribeInstances': {}}}
+        return {}
+
+    with patch.object(ApiMetaClient, '_fetch_from_pop_api', side_effect=fetch):
+        report = warmup.warm_up_meta_cache(['ECS'], {'ecs': ['DescribeInstances']})
+        warmed = len(requested)
+        ApiMetaClient.get_api_meta('ecs', 'DescribeInstances')
+    assert report['failed'] == []
+    assert (ApiMetaClient.GET_API_OVERVIEW, 'Ecs', '2014-05-26', None) in requested
+    assert all(service in (None, 'Ecs') for _, service, _, _ in requested)
+    # 运行时不再发起任何请求
+    assert len(requested) == warmed
+
+
+def test_warm_up_meta_cache_products_unavailable():
+    with patch.object(ApiMetaClient, 'get_product_index', side_effect=Exception('down')), \
+         patch.object(ApiMetaClient, 'get_api_meta') as mock_meta:
+        report = warmup.warm_up_meta_cache([], {'ecs': ['DescribeInstances']})
+    mock_meta.assert_not_called()
+    assert report['failed'] == ['products', 'ecs']
+
+
+def test_readiness_warm_up_in_background():
+    readiness = warmup.Readiness()
+    assert not readiness.is_ready()
+    with patch.object(warmup, 'warm_up_meta_cache', return_value={'apis': 1}):
+        readiness.warm_up_in_background(['ecs'], {}).join(5)
+    assert readiness.is_ready()
+    assert readiness.report == {'apis': 1}
+
+
+def test_readiness_builds_tools_before_ready():
+    readiness = warmup.Readiness()
+    build_tools = MagicMock(side_effect=lambda: readiness.is_ready() or {'apis': 2})
+    with patch.object(warmup, 'warm_up_meta_cache', return_value={'apis': 1}):
+        readiness.warm_up_in_background(['ecs'], {}, build_tools).join(5)
+    build_tools.assert_called_once()
+    assert readiness.is_ready()
+    assert readiness.report == {'apis': 1, 'tools': {'apis': 2}}
+
+
+def test_readiness_not_ready_when_building_tools_fails():
+    readiness = warmup.Readiness()
+    with patch.object(warmup, 'warm_up_meta_cache', return_value={'apis': 1}):
+        readiness.warm_up_in_background(['ecs'], {}, MagicMock(side_effect=Exception('boom'))).join(5)
+    assert not readiness.is_ready()
+
+
+def test_readiness_set_ready_when_warmup_fails():
+    readiness = warmup.Readiness()
+    with patch.object(warmup, 'warm_up_meta_cache', side_effect=Exception('boom')):
+        readiness.warm_up_in_background(['ecs'], {}).join(5)
+    assert readiness.wait(0)
+    assert readiness.report is None
+
+
+def test_cli_warm_cache(monkeypatch, tmp_path):
+    with patch.object(warmup, 'warm_up_meta_cache', return_value={'apis': 2}) as mock_warm_up, \
+         patch('alibaba_cloud_ops_mcp_server.config.config', {'ecs': ['DescribeInstances']}):
+        result = CliRunner().invoke(warmup.main, ['--services', 'ECS, vpc', '--cache-dir', str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert '"apis": 2' in result.output
+    mock_warm_up.assert_called_once_with(['ecs', 'vpc'], {'ecs': ['DescribeInstances']})
+    assert settings.meta_cache_dir == str(tmp_path)
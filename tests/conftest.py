@@ -0,0 +1,37 @@
+import pytest
+
+from alibaba_cloud_ops_mcp_server.alibabacloud.api_meta_client import ApiMetaClient
+from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import client_pool
+from alibaba_cloud_ops_mcp_server.alibabacloud.limits import reset_tool_limiter
+from alibaba_cloud_ops_mcp_server.alibabacloud.shared_snapshot import reset_shared_documents
+from alibaba_cloud_ops_mcp_server.alibabacloud.utils import reset_credential_client
+from alibaba_cloud_ops_mcp_server.settings import settings
+from alibaba_cloud_ops_mcp_server.tools import api_tools, oss_tools
+
+
+@pytest.fixture(autouse=True)
+def reset_meta_cache(monkeypatch):
+    # 元数据缓存是进程级的，避免测试之间相互影响
+    monkeypatch.setattr(settings, 'meta_cache_dir', None)
+    monkeypatch.setattr(settings, 'meta_use_snapshot', False)
+    # 测试中不发起真实的元数据预热请求
+    monkeypatch.setattr(settings, 'meta_warmup_concurrency', 1)
+    monkeypatch.setattr(settings, 'lazy_tools', False)
+    monkeypatch.setattr(settings, 'meta_shared_snapshot', None)
+    monkeypatch.setattr(api_tools, '_schema_index', None)
+    monkeypatch.setattr(oss_tools, '_default_credentials_provider', None)
+    ApiMetaClient.invalidate_cache()
+    ApiMetaClient._cache.reset_stats()
+    ApiMetaClient._http_stats.reset()
+    ApiMetaClient._inflight.shared = 0
+    api_tools.clear_call_plans()
+    client_pool.clear()
+    reset_credential_client()
+    reset_tool_limiter()
+    reset_shared_documents()
+    yield
+    ApiMetaClient.invalidate_cache()
+    api_tools.clear_call_plans()
+    client_pool.clear()
+    reset_credential_client()
+    reset_shared_documents()
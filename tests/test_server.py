@@ -1,3 +1,4 @@
+import inspect
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -106,3 +107,119 @@ def test_main_run_with_logging(mock_logger, mock_create_api_tools, mock_FastMCP)
                              headers_credential_only=None, env='domestic')
         # 验证日志被调用
         mock_logger.debug.assert_called_once_with('mcp server is running on streamable-http mode.')
+
+
+def test_readiness_routes():
+    from starlette.testclient import TestClient
+    from alibaba_cloud_ops_mcp_server import server
+    from alibaba_cloud_ops_mcp_server.alibabacloud.warmup import Readiness
+    mcp = server.FastMCP(name='test')
+    readiness = Readiness()
+    server.register_readiness_routes(mcp, readiness)
+    client = TestClient(mcp.http_app(transport='streamable-http'))
+    assert client.get('/healthz').status_code == 200
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.json() == {'status': 'warming'}
+    readiness.set_ready({'apis': 1})
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json() == {'status': 'ready', 'warmup': {'apis': 1}}
+
+
+@patch('alibaba_cloud_ops_mcp_server.server.FastMCP')
+@patch('alibaba_cloud_ops_mcp_server.server.api_tools.create_api_tools')
+@patch('alibaba_cloud_ops_mcp_server.server.Readiness')
+def test_main_warm_cache_http_in_background(mock_readiness, mock_create_api_tools, mock_FastMCP):
+    from alibaba_cloud_ops_mcp_server import server
+    with patch.object(server, 'register_readiness_routes') as mock_routes, \
+         patch.object(server, 'warm_up_meta_cache') as mock_warm_up:
+        server.main.callback(transport='streamable-http', port=8000, host='127.0.0.1', services='ecs,vpc',
+                             headers_credential_only=None, env='domestic', warm_cache=True)
+    readiness = mock_readiness.return_value
+    mock_routes.assert_called_once_with(mock_FastMCP.return_value, readiness)
+    mock_warm_up.assert_not_called()
+    readiness.warm_up_in_background.assert_called_once()
+    services, apis_by_service, build_tools = readiness.warm_up_in_background.call_args.args
+    assert (services, apis_by_service) == (['ecs', 'vpc'], server.config)
+    # 工具注册及调用计划预热在后台的就绪门控阶段中进行，不阻塞启动
+    mock_create_api_tools.assert_not_called()
+    build_tools()
+    mock_create_api_tools.assert_called_once_with(mock_FastMCP.return_value, server.config)
+    readiness.set_ready.assert_not_called()
+
+
+@patch('alibaba_cloud_ops_mcp_server.server.FastMCP')
+@patch('alibaba_cloud_ops_mcp_server.server.api_tools.create_api_tools')
+def test_main_warm_cache_stdio_before_registration(mock_create_api_tools, mock_FastMCP):
+    from alibaba_cloud_ops_mcp_server import server
+    calls = []
+    mock_create_api_tools.side_effect = lambda *args: calls.append('register')
+    with patch.object(server, 'warm_up_meta_cache', side_effect=lambda *args: calls.append('warm')) as mock_warm_up:
+        server.main.callback(transport='stdio', port=8000, host='127.0.0.1', services=None,
+                             headers_credential_only=None, env='domestic', warm_cache=True)
+    mock_warm_up.assert_called_once_with([], server.config)
+    assert calls == ['warm', 'register']
+
+
+@patch('alibaba_cloud_ops_mcp_server.server.FastMCP')
+@patch('alibaba_cloud_ops_mcp_server.server.api_tools.create_api_tools')
+def test_main_concurrency_limits(mock_create_api_tools, mock_FastMCP, monkeypatch):
+    from alibaba_cloud_ops_mcp_server import server
+    from alibaba_cloud_ops_mcp_server.alibabacloud import limits
+    monkeypatch.setattr(server.settings, 'tool_max_concurrency', server.settings.tool_max_concurrency)
+    monkeypatch.setattr(server.settings, 'tool_max_concurrency_per_tenant',
+                        server.settings.tool_max_concurrency_per_tenant)
+    with patch('alibaba_cloud_ops_mcp_server.server.oss_tools.tools', [lambda: None]):
+        server.main.callback(transport='streamable-http', port=8000, host='127.0.0.1', services=None,
+                             headers_credential_only=None, env='domestic', max_concurrency=8,
+                             max_concurrency_per_tenant=2)
+    assert limits.tool_limiter.max_concurrency == 8
+    assert limits.tool_limiter.max_per_tenant == 2
+    # 注册的是经过限流包装的协程函数
+    registered = mock_FastMCP.return_value.tool.call_args_list[0][0][0]
+    assert inspect.iscoroutinefunction(registered)
+
+
+def test_main_workers_require_http_transport():
+    import click
+    from alibaba_cloud_ops_mcp_server import server
+    with pytest.raises(click.UsageError):
+        server.main.callback(transport='stdio', port=8000, host='127.0.0.1', services=None,
+                             headers_credential_only=None, env='domestic', workers=2)
+
+
+@patch('alibaba_cloud_ops_mcp_server.server.FastMCP')
+@patch('alibaba_cloud_ops_mcp_server.server.api_tools.create_api_tools')
+def test_main_workers(mock_create_api_tools, mock_FastMCP):
+    from alibaba_cloud_ops_mcp_server import server
+    calls = []
+    mock_create_api_tools.side_effect = lambda *args: calls.append('register')
+    with patch.object(server, 'prepare_shared_snapshot', side_effect=lambda *args: calls.append('snapshot') or '/tmp/meta.bin') as mock_prepare, \
+         patch.object(server, 'run_workers') as mock_run_workers:
+        server.main.callback(transport='streamable-http', port=8000, host='127.0.0.1', services='ecs',
+                             headers_credential_only=None, env='domestic', cache_dir='/tmp', workers=4)
+    mock_prepare.assert_called_once_with(['ecs'], server.config, '/tmp')
+    # 共享快照在注册工具之前生成，父进程注册工具时即可使用
+    assert calls == ['snapshot', 'register']
+    mock_run_workers.assert_called_once_with(mock_FastMCP.return_value, 'streamable-http', '127.0.0.1', 8000, 4,
+                                             '/tmp/meta.bin', None)
+    mock_FastMCP.return_value.run.assert_not_called()
+
+
+@patch('alibaba_cloud_ops_mcp_server.server.FastMCP')
+@patch('alibaba_cloud_ops_mcp_server.server.api_tools.create_api_tools')
+@patch('alibaba_cloud_ops_mcp_server.server.Readiness')
+def test_main_workers_without_snapshot_warm_up_before_ready(mock_readiness, mock_create_api_tools, mock_FastMCP):
+    from alibaba_cloud_ops_mcp_server import server
+    with patch.object(server, 'prepare_shared_snapshot', return_value=None), \
+         patch.object(server, 'register_readiness_routes'), \
+         patch.object(server, 'run_workers') as mock_run_workers:
+        server.main.callback(transport='streamable-http', port=8000, host='127.0.0.1', services='ecs',
+                             headers_credential_only=None, env='domestic', workers=2)
+    readiness = mock_readiness.return_value
+    # 共享快照不可用时不立即报告就绪，由每个 worker 预热完成后报告
+    readiness.set_ready.assert_not_called()
+    worker_init = mock_run_workers.call_args.args[6]
+    worker_init()
+    readiness.warm_up_in_background.assert_called_once_with(['ecs'], server.config)
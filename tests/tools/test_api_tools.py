@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from alibaba_cloud_ops_mcp_server.tools import api_tools
 import json
 from alibaba_cloud_ops_mcp_server.tools import common_api_tools
@@ -75,11 +76,11 @@ def test_tools_api_call_post():
         mock_ApiMetaClient.get_service_style.return_value = 'RPC'
         mock_open_api_models.OpenApiRequest.return_value = MagicMock()
         mock_open_api_models.Params.return_value = MagicMock()
-        mock_create_client.return_value.call_api.return_value = {'result': 'ok'}
+        mock_create_client.return_value.call_api_async = AsyncMock(return_value={'result': 'ok'})
         mock_OpenApiUtilClient.query.return_value = {}
         mock_util_models.RuntimeOptions.return_value = MagicMock()
         params = {'InstanceId': 'i-123', 'RegionId': 'cn-hangzhou'}
-        result = api_tools._tools_api_call('ecs', 'DescribeInstances', params, None)
+        result = asyncio.run(api_tools._tools_api_call('ecs', 'DescribeInstances', params, None))
         assert result == {'result': 'ok'}
 
 def test_create_and_decorate_tool_no_summary():
@@ -170,7 +171,7 @@ def test_tools_api_call_ecs_list_parameters():
         mock_ApiMetaClient.get_service_style.return_value = 'RPC'
         mock_open_api_models.OpenApiRequest.return_value = MagicMock()
         mock_open_api_models.Params.return_value = MagicMock()
-        mock_create_client.return_value.call_api.return_value = {'result': 'ok'}
+        mock_create_client.return_value.call_api_async = AsyncMock(return_value={'result': 'ok'})
         mock_OpenApiUtilClient.query.return_value = {}
         mock_util_models.RuntimeOptions.return_value = MagicMock()
 
@@ -183,7 +184,7 @@ def test_tools_api_call_ecs_list_parameters():
         }
         
         # 测试ECS服务
-        result = api_tools._tools_api_call('ecs', 'DescribeInstances', params, None)
+        result = asyncio.run(api_tools._tools_api_call('ecs', 'DescribeInstances', params, None))
         # 验证传入query方法的参数
         query_args = mock_OpenApiUtilClient.query.call_args[0][0]
         assert isinstance(query_args['InstanceIds'], str)
@@ -196,7 +197,7 @@ def test_tools_api_call_ecs_list_parameters():
         mock_OpenApiUtilClient.query.reset_mock()
         
         # 测试非ECS服务
-        result = api_tools._tools_api_call('rds', 'DescribeInstances', params, None)
+        result = asyncio.run(api_tools._tools_api_call('rds', 'DescribeInstances', params, None))
         # 验证传入query方法的参数
         query_args = mock_OpenApiUtilClient.query.call_args[0][0]
         assert isinstance(query_args['InstanceIds'], list)
@@ -216,7 +217,7 @@ def test_tools_api_call_ecs_list_parameters_non_list():
         mock_ApiMetaClient.get_service_style.return_value = 'RPC'
         mock_open_api_models.OpenApiRequest.return_value = MagicMock()
         mock_open_api_models.Params.return_value = MagicMock()
-        mock_create_client.return_value.call_api.return_value = {'result': 'ok'}
+        mock_create_client.return_value.call_api_async = AsyncMock(return_value={'result': 'ok'})
         mock_OpenApiUtilClient.query.return_value = {}
         mock_util_models.RuntimeOptions.return_value = MagicMock()
 
@@ -228,7 +229,7 @@ def test_tools_api_call_ecs_list_parameters_non_list():
         }
         
         # 测试ECS服务
-        result = api_tools._tools_api_call('ecs', 'DescribeInstances', params, None)
+        result = asyncio.run(api_tools._tools_api_call('ecs', 'DescribeInstances', params, None))
         # 验证传入query方法的参数
         query_args = mock_OpenApiUtilClient.query.call_args[0][0]
         assert query_args['InstanceIds'] == 'i-123'
@@ -250,11 +251,11 @@ def test_create_tool_function_with_signature_bind_and_apply_defaults():
     func = api_tools._create_tool_function_with_signature('test', 'TestApi', fields, 'Test function')
     
     # 测试函数调用，确保执行到signature.bind和apply_defaults
-    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools._tools_api_call') as mock_call:
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools._tools_api_call', new_callable=AsyncMock) as mock_call:
         mock_call.return_value = {'result': 'success'}
         
         # 调用函数，传入部分参数，让apply_defaults生效
-        result = func(param2=123)  # 只传入required参数，让param1使用默认值
+        result = asyncio.run(func(param2=123))  # 只传入required参数，让param1使用默认值
         
         # 验证_tools_api_call被调用
         mock_call.assert_called_once()
@@ -281,11 +282,11 @@ def test_create_tool_function_with_signature_bind_with_all_args():
     func = api_tools._create_tool_function_with_signature('test', 'TestApi', fields, 'Test function')
     
     # 测试传入所有参数
-    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools._tools_api_call') as mock_call:
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools._tools_api_call', new_callable=AsyncMock) as mock_call:
         mock_call.return_value = {'result': 'success'}
         
         # 传入所有参数
-        result = func(param1='value1', param2=456)
+        result = asyncio.run(func(param1='value1', param2=456))
         
         # 验证_tools_api_call被调用
         mock_call.assert_called_once()
@@ -312,11 +313,11 @@ def test_create_tool_function_with_signature_bind_with_positional_args():
     func = api_tools._create_tool_function_with_signature('test', 'TestApi', fields, 'Test function')
     
     # 测试使用位置参数
-    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools._tools_api_call') as mock_call:
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools._tools_api_call', new_callable=AsyncMock) as mock_call:
         mock_call.return_value = {'result': 'success'}
         
         # 使用位置参数调用
-        result = func('value1', 789)
+        result = asyncio.run(func('value1', 789))
         
         # 验证_tools_api_call被调用
         mock_call.assert_called_once()
@@ -359,12 +360,12 @@ def test_get_api_info(mock_get):
     result = fn('ecs', 'DescribeInstances')
     assert result == [{'name': 'foo'}]
 
-@patch('alibaba_cloud_ops_mcp_server.tools.common_api_tools._tools_api_call')
+@patch('alibaba_cloud_ops_mcp_server.tools.common_api_tools._tools_api_call', new_callable=AsyncMock)
 def test_common_api_caller(mock_call):
     import alibaba_cloud_ops_mcp_server.tools.common_api_tools as ca
     fn = ca.tools[3]  # CommonAPICaller
     mock_call.return_value = {'result': 'ok'}
-    result = fn('ecs', 'DescribeInstances', {'foo': 'bar'})
+    result = asyncio.run(fn('ecs', 'DescribeInstances', {'foo': 'bar'}))
     assert result == {'result': 'ok'}
 
 @patch('alibaba_cloud_ops_mcp_server.tools.api_tools.create_config')
@@ -386,3 +387,157 @@ def test_get_service_endpoint_all_branches():
     assert _get_service_endpoint('cbn', 'cn-hangzhou') == 'cbn.aliyuncs.com'
     # 其它分支
     assert _get_service_endpoint('unknown', 'cn-test') == 'unknown.cn-test.aliyuncs.com'
+
+def test_call_plan_compiled_once():
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools.ApiMetaClient') as mock_ApiMetaClient, \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools.create_client') as mock_create_client, \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools.OpenApiUtilClient') as mock_OpenApiUtilClient:
+        mock_ApiMetaClient.get_api_meta.return_value = fake_api_meta(post=True)
+        mock_ApiMetaClient.get_service_style.return_value = 'RPC'
+        mock_create_client.return_value.call_api_async = AsyncMock(return_value={'result': 'ok'})
+        mock_OpenApiUtilClient.query.return_value = {}
+        for _ in range(3):
+            asyncio.run(api_tools._tools_api_call('ECS', 'DescribeInstances', {'RegionId': 'cn-beijing'}, None))
+        assert mock_ApiMetaClient.get_api_meta.call_count == 1
+        assert mock_ApiMetaClient.get_service_style.call_count == 1
+        mock_create_client.assert_called_with('ecs', 'cn-beijing', endpoint='ecs.cn-beijing.aliyuncs.com')
+        params = mock_create_client.return_value.call_api_async.call_args[0][0]
+        assert params.action == 'DescribeInstances'
+        assert params.version == '2023-01-01'
+        assert params.method == 'POST'
+        assert params.pathname == '/test'
+        assert params.style == 'RPC'
+
+def test_call_plan_serialize_and_endpoint():
+    plan = api_tools.ApiCallPlan('ecs', 'DescribeInstances', '2014-05-26', 'GET', '/', 'RPC',
+                                 frozenset(api_tools.ECS_LIST_PARAMETERS))
+    assert plan.serialize({'InstanceIds': ['i-1'], 'PageSize': 10, 'Tag': None}) == {
+        'InstanceIds': '["i-1"]', 'PageSize': 10
+    }
+    assert plan.endpoint('CN-Hangzhou') == 'ecs.cn-hangzhou.aliyuncs.com'
+    with patch.object(api_tools.settings, 'env', 'international'):
+        bss = api_tools.ApiCallPlan('bssopenapi', 'QueryBill', '2017-12-14', 'POST', '/', 'RPC')
+        assert bss.endpoint('cn-hangzhou') == 'business.ap-southeast-1.aliyuncs.com'
+
+def test_create_client_with_endpoint():
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools.OpenApiClient'), \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools.create_config') as mock_cfg:
+        mock_cfg.return_value = MagicMock()
+        api_tools.create_client('ecs', 'cn-test', endpoint='ecs-vpc.cn-test.aliyuncs.com')
+        assert mock_cfg.return_value.endpoint == 'ecs-vpc.cn-test.aliyuncs.com'
+
+def test_warm_up_call_plans_concurrent():
+    import threading
+    import time
+    barrier = threading.Barrier(3, timeout=5)
+
+    def slow_compile(service, api):
+        if api == 'Broken':
+            raise Exception('meta-fail')
+        barrier.wait()
+        time.sleep(0.01)
+        return MagicMock()
+
+    with patch.object(api_tools.ApiCallPlan, 'compile', side_effect=slow_compile) as mock_compile:
+        report = api_tools.warm_up_call_plans(
+            [('ecs', 'DescribeInstances'), ('ecs', 'DescribeRegions'), ('vpc', 'DescribeVpcs'), ('ecs', 'Broken')],
+            concurrency=4)
+    # 三个请求需同时进行才能通过 barrier
+    assert mock_compile.call_count == 4
+    assert report['apis'] == 4
+    assert report['failed'] == ['ecs.Broken']
+    assert report['slowest']['seconds'] >= 0.01
+    assert api_tools.get_call_plan('ecs', 'DescribeInstances') is not None
+    assert mock_compile.call_count == 4
+
+def test_create_api_tools_with_warmup(monkeypatch):
+    monkeypatch.setattr(api_tools.settings, 'meta_warmup_concurrency', 4)
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools.warm_up_call_plans',
+               return_value={'apis': 2, 'failed': []}) as mock_warm_up, \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools._create_and_decorate_tool') as mock_create:
+        report = api_tools.create_api_tools(DummyMCP(), {'ecs': ['DescribeInstances'], 'vpc': ['DescribeVpcs']})
+    mock_warm_up.assert_called_once_with([('ecs', 'DescribeInstances'), ('vpc', 'DescribeVpcs')])
+    assert mock_create.call_count == 2
+    assert 'register_seconds' in report
+
+class RecordingMCP:
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self, name):
+        def decorator(fn):
+            self.tools[name] = fn
+            return fn
+        return decorator
+
+def test_create_lazy_api_tools_from_index(monkeypatch, tmp_path):
+    import inspect
+    from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import ToolSchemaIndex
+    index = ToolSchemaIndex()
+    index.put('ecs', 'DescribeInstances', {'summary': '查询实例', 'parameters': [
+        {'name': 'InstanceIds', 'schema': {'type': 'string', 'required': False}}]})
+    monkeypatch.setattr(api_tools.settings, 'lazy_tools', True)
+    monkeypatch.setattr(api_tools.settings, 'meta_cache_dir', str(tmp_path))
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools.load_schema_index', return_value=index), \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools.atexit.register'), \
+         patch.object(api_tools.ApiMetaClient, 'get_api_meta',
+                      return_value=({'summary': 'vpc', 'parameters': []}, '2016-04-28')) as mock_meta:
+        mcp = RecordingMCP()
+        report = api_tools.create_api_tools(mcp, {'ecs': ['DescribeInstances'], 'vpc': ['DescribeVpcs']})
+    # 索引中已有的 API 不请求元数据，缺失的 API 补充到缓存目录中的索引
+    mock_meta.assert_called_once_with('vpc', 'DescribeVpcs')
+    assert report['indexed'] == 1 and report['fetched'] == 1
+    assert set(mcp.tools) == {'ECS_DescribeInstances', 'VPC_DescribeVpcs'}
+    assert 'InstanceIds' in inspect.signature(mcp.tools['ECS_DescribeInstances']).parameters
+    saved = json.loads((tmp_path / 'tool_schema_index.json').read_text())
+    assert set(saved['apis']) == {'ecs/DescribeInstances', 'vpc/DescribeVpcs'}
+
+def test_lazy_tool_loads_plan_on_first_call_and_records_usage(monkeypatch):
+    from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import ToolSchemaIndex
+    index = ToolSchemaIndex()
+    monkeypatch.setattr(api_tools, '_schema_index', index)
+    with patch.object(api_tools, 'get_call_plan') as mock_plan, \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools.create_client') as mock_client:
+        mock_plan.return_value.serialize.return_value = {}
+        mock_plan.return_value.endpoint.return_value = 'ecs.aliyuncs.com'
+        mock_client.return_value.call_api_async = AsyncMock(return_value={'ok': True})
+        asyncio.run(api_tools._tools_api_call('ecs', 'DescribeInstances', {}, None))
+    mock_plan.assert_called_once_with('ecs', 'DescribeInstances')
+    assert index.most_used([('ecs', 'DescribeInstances')], 1) == [('ecs', 'DescribeInstances')]
+
+def test_start_prefetch_warms_most_used(monkeypatch):
+    from alibaba_cloud_ops_mcp_server.alibabacloud.schema_index import ToolSchemaIndex
+    index = ToolSchemaIndex()
+    index.record_call('vpc', 'DescribeVpcs')
+    monkeypatch.setattr(api_tools, '_schema_index', index)
+    with patch.object(api_tools, 'warm_up_call_plans') as mock_warm_up:
+        thread = api_tools.start_prefetch([('ecs', 'DescribeInstances'), ('vpc', 'DescribeVpcs')], limit=5)
+        thread.join(5)
+    mock_warm_up.assert_called_once_with([('vpc', 'DescribeVpcs')], 1)
+    assert api_tools.start_prefetch([('ecs', 'DescribeInstances')], limit=5) is None
+
+@patch('alibaba_cloud_ops_mcp_server.tools.common_api_tools.ApiMetaClient.search_apis')
+def test_list_apis_with_query(mock_search):
+    import alibaba_cloud_ops_mcp_server.tools.common_api_tools as ca
+    mock_search.return_value = {'total': 1, 'apis': [{'name': 'StartInstance', 'summary': '启动实例', 'score': 3.0}]}
+    fn = ca.tools[1]  # ListAPIs
+    result = fn('ecs', 'start instance', 5, 0)
+    mock_search.assert_called_once_with('ecs', 'start instance', 5, 0)
+    assert result['apis'][0]['name'] == 'StartInstance'
+
+@patch('alibaba_cloud_ops_mcp_server.tools.common_api_tools.ApiMetaClient.get_compact_api_parameters')
+def test_get_api_info_compact(mock_compact):
+    import alibaba_cloud_ops_mcp_server.tools.common_api_tools as ca
+    fn = ca.tools[2]  # GetAPIInfo
+    mock_compact.return_value = [{'name': 'foo', 'type': 'string'}]
+    assert fn('ecs', 'DescribeInstances', True) == [{'name': 'foo', 'type': 'string'}]
+    mock_compact.assert_called_once_with('ecs', 'DescribeInstances')
+
+def test_create_client_pooled():
+    with patch('alibaba_cloud_ops_mcp_server.tools.api_tools.OpenApiClient') as mock_client, \
+         patch('alibaba_cloud_ops_mcp_server.tools.api_tools.create_config') as mock_cfg:
+        mock_client.side_effect = lambda config: MagicMock()
+        first = api_tools.create_client(service='ecs', region_id='cn-test')
+        assert api_tools.create_client(service='ECS', region_id='cn-test') is first
+        assert api_tools.create_client(service='ecs', region_id='cn-other') is not first
+        assert mock_cfg.call_count == 2
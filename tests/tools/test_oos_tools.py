@@ -1,6 +1,10 @@
+import json
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+from alibabacloud_oos20190601 import models as oos_20190601_models
 from alibaba_cloud_ops_mcp_server.tools import oos_tools
+from alibaba_cloud_ops_mcp_server.alibabacloud.polling import PollStrategy
 
 def get_tool_func(name):
     return [f for f in oos_tools.tools if f.__name__ == name][0]
@@ -21,70 +25,70 @@ def fake_client(*args, **kwargs):
             execution = Execution()
         body = Body()
     class FakeClient:
-        def start_execution(self, req):
+        async def start_execution_async(self, req):
             return FakeStartResp()
-        def list_executions(self, req):
+        async def list_executions_async(self, req):
             return FakeListResp()
     return FakeClient()
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_RunCommand():
     func = get_tool_func("OOS_RunCommand")
-    result = func(RegionId='cn-test', InstanceIds=['i-1'], CommandType='RunShellScript', Command='echo hello')
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1'], CommandType='RunShellScript', Command='echo hello'))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_StartInstances():
     func = get_tool_func("OOS_StartInstances")
-    result = func(RegionId='cn-test', InstanceIds=['i-1'])
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1']))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_StopInstances():
     func = get_tool_func("OOS_StopInstances")
-    result = func(RegionId='cn-test', InstanceIds=['i-1'], ForeceStop=True)
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1'], ForeceStop=True))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_RebootInstances():
     func = get_tool_func("OOS_RebootInstances")
-    result = func(RegionId='cn-test', InstanceIds=['i-1'], ForeceStop=True)
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1'], ForeceStop=True))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_RunInstances():
     func = get_tool_func("OOS_RunInstances")
-    result = func(RegionId='cn-test', ImageId='img', InstanceType='ecs.t1', SecurityGroupId='sg', VSwitchId='vsw', Amount=1, InstanceName='test')
+    result = asyncio.run(func(RegionId='cn-test', ImageId='img', InstanceType='ecs.t1', SecurityGroupId='sg', VSwitchId='vsw', Amount=1, InstanceName='test'))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_ResetPassword():
     func = get_tool_func("OOS_ResetPassword")
-    result = func(RegionId='cn-test', InstanceIds=['i-1'], Password='Abcd1234!')
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1'], Password='Abcd1234!'))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_ReplaceSystemDisk():
     func = get_tool_func("OOS_ReplaceSystemDisk")
-    result = func(RegionId='cn-test', InstanceIds=['i-1'], ImageId='img')
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1'], ImageId='img'))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_StartRDSInstances():
     func = get_tool_func("OOS_StartRDSInstances")
-    result = func(RegionId='cn-test', InstanceIds=['rds-1'])
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['rds-1']))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_StopRDSInstances():
     func = get_tool_func("OOS_StopRDSInstances")
-    result = func(RegionId='cn-test', InstanceIds=['rds-1'])
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['rds-1']))
     assert hasattr(result, 'executions')
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', fake_client)
 def test_OOS_RebootRDSInstances():
     func = get_tool_func("OOS_RebootRDSInstances")
-    result = func(RegionId='cn-test', InstanceIds=['rds-1'])
+    result = asyncio.run(func(RegionId='cn-test', InstanceIds=['rds-1']))
     assert hasattr(result, 'executions')
 
 def test_create_client_exception():
@@ -110,17 +114,17 @@ def test_start_execution_sync_failed():
             execution = Execution()
         body = Body()
     class FakeClient:
-        def start_execution(self, req):
+        async def start_execution_async(self, req):
             return FakeStartResp()
-        def list_executions(self, req):
+        async def list_executions_async(self, req):
             return FakeListResp()
     with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=FakeClient()):
         with pytest.raises(Exception) as e:
-            oos_tools._start_execution_sync('cn-test', 'tpl', {})
+            asyncio.run(oos_tools._start_execution_sync('cn-test', 'tpl', {}))
         assert 'fail-reason' in str(e.value)
 
 def test_start_execution_sync_loop():
-    # status 既不是 FAILED 也不是 END_STATUSES，触发 time.sleep(1)
+    # status 既不是 FAILED 也不是 END_STATUSES，按轮询策略等待后重试
     class FakeExecution:
         execution_id = 'exec-1'
         status = 'Running'
@@ -138,9 +142,9 @@ def test_start_execution_sync_loop():
     class FakeClient:
         def __init__(self):
             self.calls = 0
-        def start_execution(self, req):
+        async def start_execution_async(self, req):
             return FakeStartResp()
-        def list_executions(self, req):
+        async def list_executions_async(self, req):
             # 前两次返回 Running，第三次返回 Success
             self.calls += 1
             if self.calls < 3:
@@ -156,11 +160,51 @@ def test_start_execution_sync_loop():
                     body = DoneBody()
                 return DoneListResp()
     with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=FakeClient()), \
-         patch('time.sleep', return_value=None) as mock_sleep:
-        result = oos_tools._start_execution_sync('cn-test', 'tpl', {})
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+        result = asyncio.run(oos_tools._start_execution_sync('cn-test', 'tpl', {}))
         assert hasattr(result, 'executions')
         assert mock_sleep.call_count >= 1
 
+def test_start_execution_sync_timeout():
+    # 执行一直处于 Running，超过轮询总时长后抛出超时异常
+    clock = [0.0]
+
+    async def fake_sleep(delay):
+        clock[0] += delay
+
+    class FakeExecution:
+        execution_id = 'exec-1'
+        status = 'Running'
+        status_message = 'running'
+    class FakeBody:
+        executions = [FakeExecution()]
+    class FakeListResp:
+        body = FakeBody()
+    class FakeStartResp:
+        class Body:
+            class Execution:
+                execution_id = 'exec-1'
+            execution = Execution()
+        body = Body()
+    class FakeClient:
+        def __init__(self):
+            self.calls = 0
+        async def start_execution_async(self, req):
+            return FakeStartResp()
+        async def list_executions_async(self, req):
+            self.calls += 1
+            return FakeListResp()
+    client = FakeClient()
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.PollStrategy',
+               lambda: PollStrategy(timeout=5.0, timer=lambda: clock[0])), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', fake_sleep):
+        with pytest.raises(oos_tools.exception.OOSExecutionTimeout) as e:
+            asyncio.run(oos_tools._start_execution_sync('cn-test', 'tpl', {}))
+    assert 'exec-1' in str(e.value)
+    assert clock[0] == pytest.approx(5.0)
+    assert client.calls < 10
+
 def test_create_client():
     """测试create_client函数的基本功能"""
     with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_config') as mock_create_config, \
@@ -219,3 +263,281 @@ def test_create_client_different_regions():
             # 验证客户端被创建
             mock_client.assert_called_once_with(mock_config)
             assert result == mock_client_instance
+
+
+def running_client(counters_by_poll):
+    """FakeClient 的执行在 counters_by_poll 用完之前处于 Running，每次查询返回对应的任务计数"""
+    class FakeStartResp:
+        class Body:
+            class Execution:
+                execution_id = 'exec-1'
+            execution = Execution()
+        body = Body()
+    class FakeClient:
+        def __init__(self):
+            self.started = 0
+            self.listed = 0
+        async def start_execution_async(self, req):
+            self.started += 1
+            return FakeStartResp()
+        async def list_executions_async(self, req):
+            self.listed += 1
+            execution = MagicMock(execution_id='exec-1', status_message='ok')
+            if self.listed <= len(counters_by_poll):
+                execution.status = 'Running'
+                execution.counters = counters_by_poll[self.listed - 1]
+            else:
+                execution.status = 'Success'
+                execution.counters = {'Total': 4, 'Success': 4}
+            resp = MagicMock()
+            resp.body.executions = [execution]
+            return resp
+    return FakeClient()
+
+def test_run_execution_without_waiting():
+    client = running_client([{}])
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client):
+        func = get_tool_func('OOS_StartInstances')
+        result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1'], WaitForCompletion=False))
+    assert result['ExecutionId'] == 'exec-1'
+    assert result['RegionId'] == 'cn-test'
+    assert client.started == 1
+    assert client.listed == 0
+
+def test_OOS_GetExecutionStatus():
+    client = running_client([{'Total': 4, 'Success': 1}])
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client):
+        func = get_tool_func('OOS_GetExecutionStatus')
+        body = asyncio.run(func(ExecutionId='exec-1', RegionId='cn-test'))
+    assert body.executions[0].status == 'Running'
+    assert client.started == 0
+
+def test_execution_progress():
+    execution = MagicMock(counters={'Total': 5, 'Success': 2, 'Failed': 1, 'Running': 2})
+    assert oos_tools._execution_progress(execution) == (3, 5)
+    assert oos_tools._execution_progress(MagicMock(counters=None)) == (0, None)
+
+def test_progress_notifications():
+    # 通过 MCP 客户端调用，等待期间收到进度通知
+    from fastmcp import FastMCP, Client
+    from alibaba_cloud_ops_mcp_server.alibabacloud.limits import limited
+    mcp = FastMCP('test')
+    mcp.tool(limited(get_tool_func('OOS_StartInstances')))
+    client = running_client([{'Total': 4, 'Success': 1}, {'Total': 4, 'Success': 2, 'Failed': 1}, {}])
+    progress = []
+
+    async def on_progress(value, total, message):
+        progress.append((value, total, message))
+
+    async def scenario():
+        async with Client(mcp) as mcp_client:
+            return await mcp_client.call_tool('OOS_StartInstances', {'RegionId': 'cn-test', 'InstanceIds': ['i-1']},
+                                              progress_handler=on_progress)
+
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', new_callable=AsyncMock):
+        asyncio.run(scenario())
+    assert [(value, total) for value, total, _ in progress] == [(1, 4), (3, 4), (3, None)]
+    assert progress[0][2] == 'Execution exec-1 is Running, 1/4 tasks finished'
+
+def test_concurrent_executions_batched():
+    # 同一地域的多个执行共用一次批量查询，而不是每个执行单独查询
+    class FakeClient:
+        def __init__(self):
+            self.started = 0
+            self.requests = []
+        async def start_execution_async(self, req):
+            self.started += 1
+            resp = MagicMock()
+            resp.body.execution.execution_id = f'exec-{self.started}'
+            return resp
+        async def list_executions_async(self, req):
+            self.requests.append(req)
+            executions = []
+            for i in range(1, self.started + 1):
+                execution = MagicMock(execution_id=f'exec-{i}', status_message='ok', counters={})
+                execution.status = 'Success' if len(self.requests) >= 2 else 'Running'
+                executions.append(execution)
+            resp = MagicMock()
+            resp.body.executions = [e for e in executions if req.execution_id in (None, e.execution_id)]
+            resp.body.next_token = None
+            return resp
+    client = FakeClient()
+
+    async def scenario():
+        return await asyncio.gather(*(oos_tools._start_execution_sync('cn-test', 'tpl', {}) for _ in range(30)))
+
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', new_callable=AsyncMock):
+        results = asyncio.run(scenario())
+    assert sorted(result.executions[0].execution_id for result in results) == sorted(f'exec-{i}' for i in range(1, 31))
+    assert len(client.requests) <= 3
+    assert client.requests[-1].execution_id is None
+    assert client.requests[-1].start_date_after is not None
+    assert client.requests[-1].template_name == 'tpl'
+    assert client.requests[-1].sort_order == 'Ascending'
+
+def test_batched_listing_pages_bounded_by_pending():
+    # 地域内其他执行很多时，首页未找到待查询的执行即停止翻页，其余逐个查询，最多比逐个查询多一次请求
+    class FakeClient:
+        def __init__(self):
+            self.requests = []
+        async def list_executions_async(self, req):
+            self.requests.append(req)
+            resp = MagicMock()
+            if req.execution_id is None:
+                resp.body.executions = [MagicMock(execution_id=f'other-{len(self.requests)}-{i}') for i in range(100)]
+                resp.body.next_token = 'next'
+            else:
+                resp.body.executions = [MagicMock(execution_id=req.execution_id, status='Running')]
+                resp.body.next_token = None
+            return resp
+    client = FakeClient()
+    found = asyncio.run(oos_tools._list_executions_batch(('cn-test', client, 'tpl'), ['exec-1', 'exec-2'], 0))
+    assert set(found) == {'exec-1', 'exec-2'}
+    listed = [req for req in client.requests if req.execution_id is None]
+    assert len(listed) == 1
+    assert all(req.template_name == 'tpl' for req in listed)
+    assert len(client.requests) == 3
+
+def test_batched_listing_keeps_paging_while_cheaper():
+    # 每页都找到足够多待查询的执行时继续翻页，总请求数少于逐个查询
+    pages = [[f'exec-{i}' for i in range(1, 4)], [f'exec-{i}' for i in range(4, 7)]]
+    class FakeClient:
+        def __init__(self):
+            self.requests = []
+        async def list_executions_async(self, req):
+            self.requests.append(req)
+            resp = MagicMock()
+            resp.body.executions = [MagicMock(execution_id=execution_id) for execution_id in pages[len(self.requests) - 1]]
+            resp.body.next_token = 'next' if len(self.requests) < len(pages) else None
+            return resp
+    client = FakeClient()
+    execution_ids = [f'exec-{i}' for i in range(1, 7)]
+    found = asyncio.run(oos_tools._list_executions_batch(('cn-test', client, 'tpl'), execution_ids, 0))
+    assert set(found) == set(execution_ids)
+    assert len(client.requests) == 2
+
+def test_wait_returns_listing_body():
+    # 返回查询到终态的 ListExecutions 响应，保留 RequestId；批量查询的分页响应只保留该执行
+    class FakeClient:
+        def __init__(self):
+            self.started = 0
+        async def start_execution_async(self, req):
+            self.started += 1
+            resp = MagicMock()
+            resp.body.execution.execution_id = f'exec-{self.started}'
+            return resp
+        async def list_executions_async(self, req):
+            executions = [oos_20190601_models.ListExecutionsResponseBodyExecutions(
+                execution_id=f'exec-{i}', status='Success') for i in range(1, self.started + 1)
+                if req.execution_id in (None, f'exec-{i}')]
+            resp = MagicMock()
+            resp.body = oos_20190601_models.ListExecutionsResponseBody(
+                executions=executions, request_id=f'req-{req.execution_id}', total_count=len(executions))
+            return resp
+
+    async def scenario(count):
+        return await asyncio.gather(*(oos_tools._start_execution_sync('cn-test', 'tpl', {}) for _ in range(count)))
+
+    for count, request_id in ((1, 'req-exec-1'), (3, 'req-None')):
+        with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=FakeClient()), \
+             patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', new_callable=AsyncMock):
+            results = asyncio.run(scenario(count))
+        assert [result.request_id for result in results] == [request_id] * count
+        assert sorted(result.executions[0].execution_id for result in results) == \
+            [f'exec-{i}' for i in range(1, count + 1)]
+        assert all(len(result.executions) == result.total_count == 1 for result in results)
+
+def fanout_client(failed_instance=None):
+    """每个执行按 ResourceIds 记录目标实例，包含 failed_instance 的执行失败"""
+    class FakeClient:
+        def __init__(self):
+            self.targets = {}
+            self.running = 0
+            self.max_running = 0
+        async def start_execution_async(self, req):
+            execution_id = f'exec-{len(self.targets) + 1}'
+            self.targets[execution_id] = json.loads(req.parameters)['targets']['ResourceIds']
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            resp = MagicMock()
+            resp.body.execution.execution_id = execution_id
+            return resp
+        async def list_executions_async(self, req):
+            executions = []
+            for execution_id, resource_ids in self.targets.items():
+                if req.execution_id not in (None, execution_id):
+                    continue
+                failed = failed_instance in resource_ids
+                executions.append(MagicMock(execution_id=execution_id, status='Failed' if failed else 'Success',
+                                            status_message='boom' if failed else 'ok', counters={}))
+            self.running = 0
+            resp = MagicMock()
+            resp.body.executions = executions
+            resp.body.next_token = None
+            return resp
+    return FakeClient()
+
+def test_target_chunks(monkeypatch):
+    monkeypatch.setattr(oos_tools.settings, 'oos_max_targets_per_execution', 2)
+    assert oos_tools._target_chunks({'targets': {'ResourceIds': ['i-1', 'i-2']}}) is None
+    assert oos_tools._target_chunks({'imageId': 'img'}) is None
+    assert oos_tools._target_chunks({'targets': {'ResourceIds': ['i-1', 'i-2', 'i-3']}}) == [['i-1', 'i-2'], ['i-3']]
+    monkeypatch.setattr(oos_tools.settings, 'oos_max_targets_per_execution', 0)
+    assert oos_tools._target_chunks({'targets': {'ResourceIds': ['i-1', 'i-2', 'i-3']}}) is None
+
+def test_fanout_partial_failure(monkeypatch):
+    monkeypatch.setattr(oos_tools.settings, 'oos_max_targets_per_execution', 2)
+    monkeypatch.setattr(oos_tools.settings, 'oos_fanout_concurrency', 2)
+    client = fanout_client(failed_instance='i-3')
+    instance_ids = [f'i-{i}' for i in range(1, 8)]
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', new_callable=AsyncMock):
+        func = get_tool_func('OOS_StopInstances')
+        result = asyncio.run(func(RegionId='cn-test', InstanceIds=instance_ids, ForeceStop=False))
+    assert sorted(client.targets.values()) == [['i-1', 'i-2'], ['i-3', 'i-4'], ['i-5', 'i-6'], ['i-7']]
+    assert client.max_running <= 2
+    assert result['Status'] == 'PartiallyFailed'
+    assert result['FailedInstanceIds'] == ['i-3', 'i-4']
+    assert result['CancelledInstanceIds'] == []
+    # 结果按执行汇报，每个执行的状态覆盖其全部实例
+    reports = {tuple(report['ResourceIds']): report for report in result['Executions']}
+    assert sorted(resource_id for ids in reports for resource_id in ids) == sorted(instance_ids)
+    assert reports[('i-3', 'i-4')]['StatusMessage'] == oos_tools.exception.OOSExecutionFailed(reason='boom').message
+    assert reports[('i-3', 'i-4')]['ExecutionId'] is not None
+    assert reports[('i-7',)]['Status'] == 'Success'
+    assert len(result['Executions']) == 4
+
+def test_fanout_cancelled_is_not_failure(monkeypatch):
+    # 与单个执行一致，取消的执行不计为失败
+    monkeypatch.setattr(oos_tools.settings, 'oos_max_targets_per_execution', 2)
+    client = fanout_client()
+    original = client.list_executions_async
+
+    async def list_executions_async(req):
+        resp = await original(req)
+        for execution in resp.body.executions:
+            if 'i-1' in client.targets[execution.execution_id]:
+                execution.status = 'Cancelled'
+        return resp
+
+    client.list_executions_async = list_executions_async
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.asyncio.sleep', new_callable=AsyncMock):
+        func = get_tool_func('OOS_StopInstances')
+        result = asyncio.run(func(RegionId='cn-test', InstanceIds=['i-1', 'i-2', 'i-3'], ForeceStop=False))
+    assert result['Status'] == 'PartiallyCancelled'
+    assert result['FailedInstanceIds'] == []
+    assert result['CancelledInstanceIds'] == ['i-1', 'i-2']
+
+def test_fanout_without_waiting(monkeypatch):
+    monkeypatch.setattr(oos_tools.settings, 'oos_max_targets_per_execution', 3)
+    client = fanout_client()
+    with patch('alibaba_cloud_ops_mcp_server.tools.oos_tools.create_client', return_value=client):
+        func = get_tool_func('OOS_RunCommand')
+        result = asyncio.run(func(RegionId='cn-test', InstanceIds=[f'i-{i}' for i in range(5)], Command='uptime',
+                                  CommandType='RunShellScript', WaitForCompletion=False))
+    assert result['Status'] == 'Started'
+    assert [execution['ExecutionId'] for execution in result['Executions']] == ['exec-1', 'exec-2']
+    assert result['FailedInstanceIds'] == []
@@ -1,13 +1,16 @@
+import asyncio
+import contextlib
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from alibaba_cloud_ops_mcp_server.tools import oss_tools
 
 def get_tool_func(name):
     return [f for f in oss_tools.tools if f.__name__ == name][0]
 
-def fake_client(*args, **kwargs):
+@contextlib.asynccontextmanager
+async def fake_client(*args, **kwargs):
     class FakePaginator:
-        def iter_page(self, req):
+        async def iter_page(self, req):
             class Page:
                 buckets = [MagicMock(__str__=lambda self: 'bucket1')]
                 contents = [MagicMock(__str__=lambda self: 'obj1')]
@@ -17,56 +20,62 @@ def fake_client(*args, **kwargs):
             return FakePaginator()
         def list_objects_v2_paginator(self):
             return FakePaginator()
-        def put_bucket(self, req):
+        async def put_bucket(self, req):
             return MagicMock(__str__=lambda self: 'put_bucket')
-        def delete_bucket(self, req):
+        async def delete_bucket(self, req):
             return MagicMock(__str__=lambda self: 'delete_bucket')
-    return FakeClient()
+    yield FakeClient()
 
-@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.create_client', fake_client)
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss_client', fake_client)
 def test_OSS_ListBuckets():
     func = get_tool_func("OSS_ListBuckets")
-    result = func(RegionId='cn-test', Prefix='prefix')
+    result = asyncio.run(func(RegionId='cn-test', Prefix='prefix'))
     assert result == ['bucket1']
 
-@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.create_client', fake_client)
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss_client', fake_client)
 def test_OSS_ListObjects():
     func = get_tool_func("OSS_ListObjects")
-    result = func(RegionId='cn-test', BucketName='bucket', Prefix='prefix')
+    result = asyncio.run(func(RegionId='cn-test', BucketName='bucket', Prefix='prefix'))
     assert result == ['obj1']
 
-@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.create_client', fake_client)
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss_client', fake_client)
 def test_OSS_ListObjects_no_bucket():
     func = get_tool_func("OSS_ListObjects")
     with pytest.raises(ValueError):
-        func(RegionId='cn-test', BucketName='', Prefix='prefix')
+        asyncio.run(func(RegionId='cn-test', BucketName='', Prefix='prefix'))
 
-@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.create_client', fake_client)
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss_client', fake_client)
 def test_OSS_PutBucket():
     func = get_tool_func("OSS_PutBucket")
-    result = func(RegionId='cn-test', BucketName='bucket')
+    result = asyncio.run(func(RegionId='cn-test', BucketName='bucket'))
     assert result == 'put_bucket'
 
-@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.create_client', fake_client)
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss_client', fake_client)
 def test_OSS_DeleteBucket():
     func = get_tool_func("OSS_DeleteBucket")
-    result = func(RegionId='cn-test', BucketName='bucket')
+    result = asyncio.run(func(RegionId='cn-test', BucketName='bucket'))
     assert result == 'delete_bucket'
 
 # 新增底层构造相关测试
-@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.CredClient')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.get_credential_client')
 def test_CredentialsProvider_and_get_credentials(mock_cred_client):
     # mock credentials client返回的credential对象
     cred = MagicMock()
     cred.access_key_id = 'id'
     cred.access_key_secret = 'secret'
     cred.security_token = 'token'
-    mock_cred_client.return_value.get_credential.return_value = cred
+    mock_cred_client.return_value.get_credential_async = AsyncMock(return_value=cred)
     provider = oss_tools.CredentialsProvider()
+    # 未刷新前不会在事件循环中同步解析凭证链
+    with pytest.raises(oss_tools.CredentialsEmptyError):
+        provider.get_credentials()
+    asyncio.run(provider.refresh())
     credentials = provider.get_credentials()
     assert credentials.access_key_id == 'id'
     assert credentials.access_key_secret == 'secret'
     assert credentials.security_token == 'token'
+    mock_cred_client.return_value.get_credential_async.assert_awaited_once()
+    mock_cred_client.return_value.get_credential.assert_not_called()
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.get_credentials_from_header')
 def test_CredentialsProvider_with_header_credentials(mock_get_creds):
@@ -77,22 +86,98 @@ def test_CredentialsProvider_with_header_credentials(mock_get_creds):
         'SecurityToken': 'header_token'
     }
     provider = oss_tools.CredentialsProvider()
+    asyncio.run(provider.refresh())
     credentials = provider.get_credentials()
     assert credentials.access_key_id == 'header_id'
     assert credentials.access_key_secret == 'header_secret'
     assert credentials.security_token == 'header_token'
 
 @patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.CredentialsProvider')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.AsyncClient')
 @patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss')
-def test_create_client(mock_oss, mock_provider):
+def test_create_client(mock_oss, mock_async_client, mock_provider):
     # mock config和Client
     mock_cfg = MagicMock()
     mock_oss.config.load_default.return_value = mock_cfg
     mock_client = MagicMock()
-    mock_oss.Client.return_value = mock_client
-    mock_provider.return_value = MagicMock()
-    client = oss_tools.create_client('cn-test')
+    mock_async_client.return_value = mock_client
+    mock_provider.return_value = MagicMock(refresh=AsyncMock())
+    client = asyncio.run(oss_tools.create_client('cn-test'))
     assert client is mock_client
     assert mock_cfg.user_agent == 'alibaba-cloud-ops-mcp-server'
     assert mock_cfg.region == 'cn-test'
-    assert mock_cfg.credentials_provider == mock_provider.return_value 
\ No newline at end of file
+    assert mock_cfg.credentials_provider == mock_provider.return_value
+    mock_provider.return_value.refresh.assert_awaited_once()
+
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.get_credential_client')
+def test_CredentialsProvider_reads_refreshed_credentials(mock_cred_client):
+    """池化的客户端每次请求前都刷新为最新的凭证"""
+    first, second = MagicMock(access_key_id='id1'), MagicMock(access_key_id='id2')
+    mock_cred_client.return_value.get_credential_async = AsyncMock(side_effect=[first, second])
+    provider = oss_tools.CredentialsProvider()
+    asyncio.run(provider.refresh())
+    assert provider.get_credentials().access_key_id == 'id1'
+    asyncio.run(provider.refresh())
+    assert provider.get_credentials().access_key_id == 'id2'
+
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.CredentialsProvider')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.AsyncClient')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss')
+def test_create_client_pooled(mock_oss, mock_async_client, mock_provider):
+    mock_provider.return_value = MagicMock(refresh=AsyncMock())
+    mock_async_client.side_effect = lambda cfg: MagicMock()
+    first = asyncio.run(oss_tools.create_client('cn-test'))
+    assert asyncio.run(oss_tools.create_client('cn-test')) is first
+    assert asyncio.run(oss_tools.create_client('cn-other')) is not first
+    assert mock_async_client.call_count == 2
+    with patch('alibaba_cloud_ops_mcp_server.alibabacloud.client_pool.get_credentials_from_header',
+               return_value={'AccessKeyId': 'id', 'AccessKeySecret': 'secret'}), \
+         patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.get_credentials_from_header',
+               return_value={'AccessKeyId': 'id', 'AccessKeySecret': 'secret'}):
+        assert asyncio.run(oss_tools.create_client('cn-test')) is not first
+    assert mock_async_client.call_count == 3
+
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.CredentialsProvider')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.AsyncClient')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss')
+def test_evicted_clients_closed(mock_oss, mock_async_client, mock_provider, monkeypatch):
+    """被淘汰出客户端池的 AsyncClient 会被关闭"""
+    from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import client_pool
+    monkeypatch.setattr(client_pool._clients, 'maxsize', 1)
+    mock_provider.return_value = MagicMock(refresh=AsyncMock())
+    mock_async_client.side_effect = lambda cfg: MagicMock(close=AsyncMock())
+
+    async def scenario():
+        first = await oss_tools.create_client('cn-test')
+        second = await oss_tools.create_client('cn-other')
+        await asyncio.sleep(0)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    first.close.assert_awaited_once()
+    second.close.assert_not_called()
+    client_pool.clear()
+    second.close.assert_awaited_once()
+
+
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.CredentialsProvider')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.AsyncClient')
+@patch('alibaba_cloud_ops_mcp_server.tools.oss_tools.oss')
+def test_leased_client_not_closed_while_in_use(mock_oss, mock_async_client, mock_provider, monkeypatch):
+    """请求进行中被淘汰出客户端池的 AsyncClient 在请求结束后才关闭"""
+    from alibaba_cloud_ops_mcp_server.alibabacloud.client_pool import client_pool
+    monkeypatch.setattr(client_pool._clients, 'maxsize', 1)
+    mock_provider.return_value = MagicMock(refresh=AsyncMock())
+    mock_async_client.side_effect = lambda cfg: MagicMock(close=AsyncMock())
+
+    async def scenario():
+        async with oss_tools.oss_client('cn-test') as first:
+            await oss_tools.create_client('cn-other')
+            await asyncio.sleep(0)
+            first.close.assert_not_called()
+        await asyncio.sleep(0)
+        return first
+
+    first = asyncio.run(scenario())
+    first.close.assert_awaited_once()
+    client_pool.clear()